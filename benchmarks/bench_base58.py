@@ -0,0 +1,50 @@
+"""Shows how Base58 encoding and decoding scale with the length of the
+payload. Run with ``python -m benchmarks.bench_base58``.
+"""
+import random
+
+from bitcash.base58 import b58decode, b58encode
+
+from benchmarks.utils import measure, print_scaling
+
+# Payload lengths in bytes: a legacy address, a WIF, and beyond.
+SIZES = (25, 38, 100, 1000, 5000)
+
+
+def make_payload(size, seed=0):
+    rng = random.Random(seed)
+    return bytes(rng.getrandbits(8) for _ in range(size))
+
+
+def _number(size):
+    # Enough calls per run for short payloads to be timed accurately.
+    return max(1, 10000 // size)
+
+
+def bench_b58encode(sizes=SIZES):
+    results = []
+
+    for size in sizes:
+        payload = make_payload(size)
+        results.append((size, measure(lambda: b58encode(payload), number=_number(size))))
+
+    return results
+
+
+def bench_b58decode(sizes=SIZES):
+    results = []
+
+    for size in sizes:
+        string = b58encode(make_payload(size))
+        results.append((size, measure(lambda: b58decode(string), number=_number(size))))
+
+    return results
+
+
+def main():
+    print_scaling('b58encode', bench_b58encode(), 'byte')
+    print_scaling('b58decode', bench_b58decode(), 'byte')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Shows how key and address conversions scale with the number of keys.
+Run with ``python -m benchmarks.bench_format``.
+"""
+import random
+
+from bitcash.crypto import ECPrivateKey
+from bitcash.format import (
+    address_to_public_key_hash, bytes_to_wif, decode_address, encode_address,
+    public_key_to_address, wif_to_bytes
+)
+
+from benchmarks.utils import measure, print_scaling
+
+SIZES = (100, 1000, 10000)
+
+
+def make_secrets(size, seed=0):
+    rng = random.Random(seed)
+    return [rng.getrandbits(256).to_bytes(32, 'big') for _ in range(size)]
+
+
+def make_public_keys(size):
+    return [ECPrivateKey(secret).public_key.format(compressed=True) for secret in make_secrets(size)]
+
+
+def bench_wif_to_bytes(sizes=SIZES):
+    results = []
+
+    for size in sizes:
+        wifs = [bytes_to_wif(secret, compressed=True) for secret in make_secrets(size)]
+        results.append((size, measure(lambda: [wif_to_bytes(wif) for wif in wifs])))
+
+    return results
+
+
+def bench_public_key_to_address(sizes=SIZES, cached=False):
+    results = []
+    setup = 'pass' if cached else encode_address.cache_clear
+
+    for size in sizes:
+        public_keys = make_public_keys(size)
+        results.append((size, measure(
+            lambda: [public_key_to_address(public_key) for public_key in public_keys], setup=setup
+        )))
+
+    return results
+
+
+def bench_address_to_public_key_hash(sizes=SIZES, cached=False):
+    results = []
+    setup = 'pass' if cached else decode_address.cache_clear
+
+    for size in sizes:
+        addresses = [public_key_to_address(public_key) for public_key in make_public_keys(size)]
+        results.append((size, measure(
+            lambda: [address_to_public_key_hash(address) for address in addresses], setup=setup
+        )))
+
+    return results
+
+
+def main():
+    print_scaling('wif_to_bytes', bench_wif_to_bytes(), 'key')
+    print_scaling('public_key_to_address', bench_public_key_to_address(), 'key')
+    print_scaling('address_to_public_key_hash', bench_address_to_public_key_hash(), 'address')
+
+
+if __name__ == '__main__':
+    main()
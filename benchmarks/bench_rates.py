@@ -0,0 +1,48 @@
+"""Shows the cost of converting amounts with cached exchange rates. Fiat
+rates are fixed instead of fetched, so this runs offline. Run with
+``python -m benchmarks.bench_rates``.
+"""
+from contextlib import contextmanager
+
+from bitcash.network import rates
+from bitcash.network.rates import currency_to_satoshi_cached
+
+from benchmarks.utils import measure, print_scaling
+
+SIZES = (1000, 10000, 100000)
+
+# Satoshi per US dollar, in place of a live rate.
+USD_RATE = 300000
+
+
+@contextmanager
+def fixed_rate(currency, satoshis):
+    original = rates.EXCHANGE_RATES[currency]
+    rates.EXCHANGE_RATES[currency] = lambda: satoshis
+    try:
+        yield
+    finally:
+        rates.EXCHANGE_RATES[currency] = original
+
+
+def bench_currency_to_satoshi_cached(currency, sizes=SIZES):
+    results = []
+
+    with fixed_rate('usd', USD_RATE):
+        for size in sizes:
+            amounts = ['{}.{:02}'.format(i % 1000, i % 100) for i in range(size)]
+            results.append((size, measure(
+                lambda: [currency_to_satoshi_cached(amount, currency) for amount in amounts]
+            )))
+
+    return results
+
+
+def main():
+    for currency in ('bch', 'usd'):
+        print_scaling('currency_to_satoshi_cached, currency={}'.format(currency),
+                      bench_currency_to_satoshi_cached(currency), 'amount')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Shows how fee estimation and coin selection scale with the number of
+UTXOs. Run with ``python -m benchmarks.bench_selection``.
+"""
+import random
+
+from bitcash.network.meta import Unspent
+from bitcash.transaction import estimate_tx_fee, sanitize_tx_data
+
+from benchmarks.utils import measure, print_scaling
+
+ADDRESS = 'bitcoincash:qzfyvx77v2pmgc0vulwlfkl3uzjgh5gnmqk5hhyaa6'
+SIZES = (10, 100, 1000, 10000, 100000)
+STRATEGIES = ('smallest', 'largest', 'bnb', 'random')
+
+
+def make_unspents(size, seed=0):
+    rng = random.Random(seed)
+    return [Unspent(rng.randint(1000, 1000000), 1, '', '', i) for i in range(size)]
+
+
+def bench_estimate_tx_fee(sizes=SIZES):
+    return [(size, measure(lambda: estimate_tx_fee(size, 2, 1, True), number=1000))
+            for size in sizes]
+
+
+def bench_sanitize_tx_data(strategy, sizes=SIZES):
+    results = []
+
+    for size in sizes:
+        unspents = make_unspents(size)
+        # Spend half of the balance so that many UTXOs are needed.
+        amount = sum(unspent.amount for unspent in unspents) // 2
+        outputs = [(ADDRESS, amount, 'satoshi')]
+
+        results.append((size, measure(lambda: sanitize_tx_data(
+            unspents, outputs, 1, ADDRESS, combine=False, strategy=strategy
+        ))))
+
+    return results
+
+
+def main():
+    print_scaling('estimate_tx_fee', bench_estimate_tx_fee(), 'utxo')
+    for strategy in STRATEGIES:
+        print_scaling('sanitize_tx_data, strategy={}'.format(strategy),
+                      bench_sanitize_tx_data(strategy), 'utxo')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Shows that serialization and signing time grow linearly with the number
+of inputs and outputs. Run with ``python -m benchmarks.bench_transaction``.
+"""
+import os
+
+from bitcash.network.meta import Unspent
+from bitcash.transaction import (
+    TxIn, construct_input_block, construct_output_block, create_p2pkh_transaction
+)
+from bitcash.utils import bytes_to_hex
+from bitcash.wallet import PrivateKey
+
+from benchmarks.utils import measure, print_scaling
+
+ADDRESS = 'bitcoincash:qzfyvx77v2pmgc0vulwlfkl3uzjgh5gnmqk5hhyaa6'
+SIZES = (10, 100, 1000, 10000, 50000)
+SIGNING_SIZES = (1, 10, 100, 1000, 5000)
+
+
+def bench_construct_output_block(sizes=SIZES):
+    results = []
+
+    for size in sizes:
+        outputs = [(ADDRESS, 1000 + i) for i in range(size)]
+        results.append((size, measure(lambda: construct_output_block(outputs))))
+
+    return results
+
+
+def bench_construct_input_block(sizes=SIZES):
+    results = []
+
+    for size in sizes:
+        inputs = [
+            TxIn(os.urandom(106), b'\x6a', os.urandom(32), b'\x00\x00\x00\x00', 0)
+            for _ in range(size)
+        ]
+        results.append((size, measure(lambda: construct_input_block(inputs))))
+
+    return results
+
+
+def make_unspents(private_key, size):
+    script = bytes_to_hex(private_key.scriptcode)
+    return [Unspent(100000, 1, script, bytes_to_hex(os.urandom(32)), 0) for _ in range(size)]
+
+
+def bench_create_p2pkh_transaction_inputs(sizes=SIGNING_SIZES):
+    private_key = PrivateKey()
+    results = []
+
+    for size in sizes:
+        unspents = make_unspents(private_key, size)
+        outputs = [(ADDRESS, 1000), (private_key.address, 1000)]
+        results.append((size, measure(lambda: create_p2pkh_transaction(private_key, unspents, outputs))))
+
+    return results
+
+
+def bench_create_p2pkh_transaction_outputs(sizes=SIGNING_SIZES):
+    private_key = PrivateKey()
+    results = []
+
+    for size in sizes:
+        unspents = make_unspents(private_key, 1)
+        outputs = [(ADDRESS, 1000 + i) for i in range(size)]
+        results.append((size, measure(lambda: create_p2pkh_transaction(private_key, unspents, outputs))))
+
+    return results
+
+
+def main():
+    print_scaling('construct_output_block', bench_construct_output_block(), 'output')
+    print_scaling('construct_input_block', bench_construct_input_block(), 'input')
+    print_scaling('create_p2pkh_transaction', bench_create_p2pkh_transaction_inputs(), 'input')
+    print_scaling('create_p2pkh_transaction', bench_create_p2pkh_transaction_outputs(), 'output')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Runs every benchmark and writes the results as JSON, so that runs of
+different versions can be compared. Run with ``python -m benchmarks``.
+"""
+import argparse
+import json
+import platform
+import sys
+from collections import namedtuple
+from datetime import datetime, timezone
+from functools import partial
+
+import bitcash
+
+from benchmarks import bench_base58, bench_format, bench_rates, bench_selection, bench_transaction
+from benchmarks.utils import print_scaling
+
+# Version of the layout of the JSON output.
+SCHEMA_VERSION = 1
+
+Benchmark = namedtuple('Benchmark', ('name', 'unit', 'func', 'sizes'))
+
+BENCHMARKS = [
+    Benchmark('b58encode', 'byte', bench_base58.bench_b58encode, bench_base58.SIZES),
+    Benchmark('b58decode', 'byte', bench_base58.bench_b58decode, bench_base58.SIZES),
+    Benchmark('wif_to_bytes', 'key', bench_format.bench_wif_to_bytes, bench_format.SIZES),
+    Benchmark('public_key_to_address', 'key',
+              bench_format.bench_public_key_to_address, bench_format.SIZES),
+    Benchmark('public_key_to_address[cached]', 'key',
+              partial(bench_format.bench_public_key_to_address, cached=True), bench_format.SIZES),
+    Benchmark('address_to_public_key_hash', 'address',
+              bench_format.bench_address_to_public_key_hash, bench_format.SIZES),
+    Benchmark('address_to_public_key_hash[cached]', 'address',
+              partial(bench_format.bench_address_to_public_key_hash, cached=True), bench_format.SIZES),
+    Benchmark('estimate_tx_fee', 'utxo', bench_selection.bench_estimate_tx_fee, bench_selection.SIZES),
+] + [
+    Benchmark('sanitize_tx_data[{}]'.format(strategy), 'utxo',
+              partial(bench_selection.bench_sanitize_tx_data, strategy), bench_selection.SIZES)
+    for strategy in bench_selection.STRATEGIES
+] + [
+    Benchmark('construct_output_block', 'output',
+              bench_transaction.bench_construct_output_block, bench_transaction.SIZES),
+    Benchmark('construct_input_block', 'input',
+              bench_transaction.bench_construct_input_block, bench_transaction.SIZES),
+    Benchmark('create_p2pkh_transaction[inputs]', 'input',
+              bench_transaction.bench_create_p2pkh_transaction_inputs, bench_transaction.SIGNING_SIZES),
+    Benchmark('create_p2pkh_transaction[outputs]', 'output',
+              bench_transaction.bench_create_p2pkh_transaction_outputs, bench_transaction.SIGNING_SIZES),
+] + [
+    Benchmark('currency_to_satoshi_cached[{}]'.format(currency), 'amount',
+              partial(bench_rates.bench_currency_to_satoshi_cached, currency), bench_rates.SIZES)
+    for currency in ('bch', 'usd')
+]
+
+
+def run(benchmarks=BENCHMARKS, quick=False, log=None):
+    """Runs ``benchmarks``, only at their two smallest sizes if ``quick``,
+    and printing each result to ``log`` if given.
+
+    :returns: The results in the layout written as JSON.
+    :rtype: ``dict``
+    """
+    results = []
+
+    for benchmark in benchmarks:
+        sizes = benchmark.sizes[:2] if quick else benchmark.sizes
+        timings = benchmark.func(sizes=sizes)
+
+        if log is not None:
+            print_scaling(benchmark.name, timings, benchmark.unit, file=log)
+
+        results.append({
+            'name': benchmark.name,
+            'unit': benchmark.unit,
+            'results': [{'size': size, 'seconds': seconds} for size, seconds in timings],
+        })
+
+    return {
+        'schema': SCHEMA_VERSION,
+        'bitcash': bitcash.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'time': datetime.now(timezone.utc).isoformat(),
+        'quick': quick,
+        'benchmarks': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    parser.add_argument('-o', '--output', help='file to write the JSON to instead of stdout')
+    parser.add_argument('-k', '--select', action='append', default=[], metavar='SUBSTRING',
+                        help='only run benchmarks whose name contains SUBSTRING')
+    parser.add_argument('--quick', action='store_true', help='only run the two smallest sizes')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    args = parser.parse_args(argv)
+
+    benchmarks = [
+        benchmark for benchmark in BENCHMARKS
+        if not args.select or any(part in benchmark.name for part in args.select)
+    ]
+
+    if args.list:
+        for benchmark in benchmarks:
+            print(benchmark.name)
+        return
+
+    report = json.dumps(run(benchmarks, quick=args.quick, log=sys.stderr), indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
@@ -0,0 +1,18 @@
+import sys
+import timeit
+
+
+def measure(func, repeat=3, number=1, setup='pass'):
+    """Returns the best time of ``repeat`` runs of ``number`` calls to
+    ``func``, in seconds per call. ``setup`` runs before each run, e.g. to
+    clear a cache.
+    """
+    timer = timeit.Timer(func, setup=setup)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def print_scaling(title, results, unit, file=sys.stdout):
+    print(title, file=file)
+    for size, seconds in results:
+        print('  {:>8} {}: {:>10.4f} s  {:>8.3f} us per {}'.format(
+            size, unit + ('es' if unit.endswith('s') else 's'), seconds, seconds / size * 10 ** 6, unit), file=file)
@@ -1,4 +1,5 @@
 from bitcash.format import verify_sig
+from bitcash.network.cache import set_network_cache
 from bitcash.network.rates import SUPPORTED_CURRENCIES, set_rate_cache_time
 from bitcash.network.services import set_service_timeout
 from bitcash.wallet import Key, PrivateKey, PrivateKeyTestnet, wif_to_key
@@ -1,5 +1,3 @@
-from collections import deque
-
 from bitcash.crypto import double_sha256_checksum
 from bitcash.utils import int_to_unknown_bytes
 
@@ -7,29 +5,46 @@ BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
 BASE58_ALPHABET_LIST = list(BASE58_ALPHABET)
 BASE58_ALPHABET_INDEX = {char: index for index, char in enumerate(BASE58_ALPHABET)}
 
+# Every pair of digits in order of value, so that a limb is converted with
+# a few small divisions instead of one per digit.
+BASE58_PAIRS = [high + low for high in BASE58_ALPHABET for low in BASE58_ALPHABET]
+PAIR_BASE = 58 ** 2
 
-def b58encode(bytestr):
+# Maps ASCII codes to the value of their digit, or to INVALID_DIGIT.
+INVALID_DIGIT = b'\xff'
+BASE58_DIGITS = bytes(BASE58_ALPHABET_INDEX.get(chr(code), INVALID_DIGIT[0]) for code in range(256))
+
+# Digits converted per big integer division or multiplication. A limb of
+# 58 ** 10 still fits in 64 bits, so it is cheap to split or combine.
+CHUNK_DIGITS = 10
+CHUNK_BASE = 58 ** CHUNK_DIGITS
 
-    alphabet = BASE58_ALPHABET_LIST
 
-    encoded = deque()
-    append = encoded.appendleft
+def b58encode(bytestr):
+
+    pairs = BASE58_PAIRS
     _divmod = divmod
 
+    bytestr = bytes(bytestr)
     num = int.from_bytes(bytestr, 'big')
 
+    limbs = []
     while num > 0:
-        num, rem = _divmod(num, 58)
-        append(alphabet[rem])
+        num, limb = _divmod(num, CHUNK_BASE)
+        limbs.append(limb)
 
-    encoded = ''.join(encoded)
+    chunks = []
+    for limb in reversed(limbs):
+        limb, e = _divmod(limb, PAIR_BASE)
+        limb, d = _divmod(limb, PAIR_BASE)
+        limb, c = _divmod(limb, PAIR_BASE)
+        a, b = _divmod(limb, PAIR_BASE)
+        chunks.append(pairs[a] + pairs[b] + pairs[c] + pairs[d] + pairs[e])
 
-    pad = 0
-    for byte in bytestr:
-        if byte == 0:
-            pad += 1
-        else:
-            break
+    # The most significant limb is padded with zero digits.
+    encoded = ''.join(chunks).lstrip('1')
+
+    pad = len(bytestr) - len(bytestr.lstrip(b'\x00'))
 
     return '1' * pad + encoded
 
@@ -40,31 +55,46 @@ def b58encode_check(bytestr):
 
 def b58decode(string):
 
-    alphabet_index = BASE58_ALPHABET_INDEX
+    try:
+        digits = string.encode('ascii').translate(BASE58_DIGITS)
+    except UnicodeEncodeError:
+        digits = INVALID_DIGIT
+
+    if INVALID_DIGIT in digits:
+        char = next(char for char in string if char not in BASE58_ALPHABET_INDEX)
+        raise ValueError('"{}" is an invalid base58 encoded '
+                         'character.'.format(char))
 
     num = 0
 
-    try:
-        for char in string:
-            num *= 58
-            num += alphabet_index[char]
-    except KeyError:
-        raise ValueError('"{}" is an invalid base58 encoded '
-                         'character.'.format(char)) from None
+    # The leading digits that do not fill a chunk.
+    head = len(digits) % CHUNK_DIGITS
+    for digit in digits[:head]:
+        num = num * 58 + digit
+
+    chunks = iter(digits[head:])
+    for d0, d1, d2, d3, d4, d5, d6, d7, d8, d9 in zip(*[chunks] * CHUNK_DIGITS):
+        num = num * CHUNK_BASE + (((((((((
+            d0 * 58 + d1) * 58 + d2) * 58 + d3) * 58 + d4) * 58 + d5) * 58 + d6) * 58 + d7) * 58 + d8) * 58 + d9)
 
     bytestr = int_to_unknown_bytes(num)
 
-    pad = 0
-    for char in string:
-        if char == '1':
-            pad += 1
-        else:
-            break
+    pad = len(string) - len(string.lstrip('1'))
 
     return b'\x00' * pad + bytestr
 
 
 def b58decode_check(string):
+    """Decodes a Base58Check string, such as a WIF or legacy address, and
+    verifies its checksum. Nothing is cached, so decoded private keys do not
+    outlive the caller's references to them.
+
+    :param string: The string to decode.
+    :type string: ``str``
+    :raises ValueError: If the string is malformed or its checksum is wrong.
+    :returns: The payload without the checksum.
+    :rtype: ``bytes``
+    """
 
     decoded = b58decode(string)
     shortened = decoded[:-4]
@@ -76,3 +106,30 @@ def b58decode_check(string):
                          'checksum {}.'.format(decoded_checksum, string, hash_checksum))
 
     return shortened
+
+
+def b58encode_many(payloads, check=False):
+    """Encodes many payloads, e.g. for an export of keys.
+
+    :type payloads: iterable of ``bytes``
+    :param check: Whether to append checksums like
+                  :func:`~bitcash.base58.b58encode_check`.
+    :type check: ``bool``
+    :rtype: ``list`` of ``str``
+    """
+    encode = b58encode_check if check else b58encode
+    return [encode(payload) for payload in payloads]
+
+
+def b58decode_many(strings, check=False):
+    """Decodes many strings, e.g. for an import of keys.
+
+    :type strings: iterable of ``str``
+    :param check: Whether to verify and remove checksums like
+                  :func:`~bitcash.base58.b58decode_check`.
+    :type check: ``bool``
+    :raises ValueError: If any string is malformed.
+    :rtype: ``list`` of ``bytes``
+    """
+    decode = b58decode_check if check else b58decode
+    return [decode(string) for string in strings]
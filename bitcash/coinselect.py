@@ -0,0 +1,150 @@
+import random
+from operator import attrgetter
+
+from bitcash.exceptions import InsufficientFunds
+
+SMALLEST_FIRST = 'smallest'
+LARGEST_FIRST = 'largest'
+BRANCH_AND_BOUND = 'bnb'
+SINGLE_RANDOM_DRAW = 'random'
+
+BNB_MAX_TRIES = 100000
+
+# Each strategy is called with the unspents to choose from, the total
+# amount of the outputs in satoshi and a function returning the fee for
+# a number of inputs, with or without a change output. It returns the
+# chosen unspents and whether the transaction needs a change output.
+
+
+def _accumulate(ordered, target, fee_for):
+    total_in = 0
+
+    for n_in, unspent in enumerate(ordered, 1):
+        total_in += unspent.amount
+
+        if total_in >= target + fee_for(n_in, True):
+            return ordered[:n_in], True
+
+    raise InsufficientFunds('Balance {} is less than {} (including '
+                            'fee).'.format(total_in, target + fee_for(len(ordered), True)))
+
+
+def smallest_first(unspents, target, fee_for):
+    """Spends the smallest unspents first, consolidating dust."""
+    return _accumulate(sorted(unspents, key=attrgetter('amount')), target, fee_for)
+
+
+def largest_first(unspents, target, fee_for):
+    """Spends the largest unspents first, using as few inputs as possible."""
+    return _accumulate(sorted(unspents, key=attrgetter('amount'), reverse=True), target, fee_for)
+
+
+def single_random_draw(unspents, target, fee_for, rng=random):
+    """Spends unspents in random order, which makes it harder to link
+    transactions to each other.
+    """
+    shuffled = list(unspents)
+    rng.shuffle(shuffled)
+    return _accumulate(shuffled, target, fee_for)
+
+
+def branch_and_bound(unspents, target, fee_for, max_tries=BNB_MAX_TRIES):
+    """Searches for a set of unspents that pays for the outputs exactly, so
+    that no change output is needed. Any excess smaller than the cost of a
+    change output goes to miners. Falls back to
+    :func:`~bitcash.coinselect.largest_first` if there is no such set.
+    """
+    # The unspents are read twice when falling back.
+    unspents = list(unspents)
+    no_change_fee = fee_for(0, False)
+    input_cost = fee_for(1, False) - no_change_fee
+    change_cost = fee_for(0, True) - no_change_fee
+
+    # Only unspents worth more than the cost of spending them can help.
+    pool = sorted((unspent for unspent in unspents if unspent.amount > input_cost),
+                  key=attrgetter('amount'), reverse=True)
+    values = [unspent.amount - input_cost for unspent in pool]
+
+    # remaining[i] is the total value of the unspents from i onwards.
+    remaining = [0] * (len(values) + 1)
+    for i in range(len(values) - 1, -1, -1):
+        remaining[i] = remaining[i + 1] + values[i]
+
+    lower = target + no_change_fee
+    upper = lower + change_cost
+
+    selection = []
+    current = 0
+    depth = 0
+    best = None
+    best_waste = None
+
+    for _ in range(max_tries):
+        if current + remaining[depth] < lower or current > upper:
+            backtrack = True
+        elif current >= lower:
+            waste = current - lower
+            if best is None or waste < best_waste:
+                best, best_waste = list(selection), waste
+                if waste == 0:
+                    break
+            backtrack = True
+        else:
+            backtrack = False
+
+        if backtrack:
+            if not selection:
+                break
+            # Exclude the most recently included unspent instead.
+            index = selection.pop()
+            current -= values[index]
+            depth = index + 1
+        else:
+            selection.append(depth)
+            current += values[depth]
+            depth += 1
+
+    if best is not None:
+        selected = [pool[i] for i in best]
+        if sum(unspent.amount for unspent in selected) >= target + fee_for(len(selected), False):
+            return selected, False
+
+    return largest_first(unspents, target, fee_for)
+
+
+STRATEGIES = {
+    SMALLEST_FIRST: smallest_first,
+    LARGEST_FIRST: largest_first,
+    BRANCH_AND_BOUND: branch_and_bound,
+    SINGLE_RANDOM_DRAW: single_random_draw,
+}
+
+
+def select_coins(unspents, target, fee_for, strategy=SMALLEST_FIRST):
+    """Chooses the unspents that pay for a transaction.
+
+    :param unspents: The unspents to choose from, e.g. a generator from
+                     :func:`~bitcash.network.NetworkAPI.iter_unspent`.
+    :type unspents: iterable of :class:`~bitcash.network.meta.Unspent`
+    :param target: The total amount of the outputs in satoshi.
+    :type target: ``int``
+    :param fee_for: Returns the fee in satoshi for a number of inputs, with
+                    or without a change output.
+    :type fee_for: ``callable``
+    :param strategy: One of ``'smallest'``, ``'largest'``, ``'bnb'`` or
+                     ``'random'``, or a function with the same signature
+                     as the built-in strategies.
+    :raises InsufficientFunds: If ``unspents`` cannot pay for the outputs.
+    :returns: The chosen unspents and whether a change output is needed.
+    :rtype: ``tuple``
+    """
+    if not callable(strategy):
+        try:
+            strategy = STRATEGIES[strategy]
+        except KeyError:
+            raise ValueError('{} is not a coin selection strategy.'.format(strategy)) from None
+
+    # Strategies may read the unspents more than once.
+    unspents = list(unspents)
+
+    return strategy(unspents, target, fee_for)
@@ -0,0 +1,228 @@
+from bitcash.crypto import double_sha256
+from bitcash.format import encode_address
+from bitcash.utils import bytes_to_hex, hex_to_bytes
+
+P2PKH_SCRIPT_PREFIX = b'\x76\xa9\x14'
+P2PKH_SCRIPT_SUFFIX = b'\x88\xac'
+OP_RETURN = 0x6a
+
+
+def read_varint(buf, offset):
+    """Reads a var_int from ``buf`` at ``offset``.
+
+    :returns: The value and the offset just past it.
+    :rtype: ``tuple`` of ``int``
+    """
+    try:
+        prefix = buf[offset]
+    except IndexError:
+        raise ValueError('Unexpected end of data at offset {}.'.format(offset)) from None
+
+    if prefix < 0xfd:
+        return prefix, offset + 1
+
+    size = 2 if prefix == 0xfd else 4 if prefix == 0xfe else 8
+    end = offset + 1 + size
+    _check_bounds(buf, end)
+    return int.from_bytes(buf[offset + 1:end], 'little'), end
+
+
+def _check_bounds(buf, end):
+    if end > len(buf):
+        raise ValueError('Unexpected end of data at offset {}.'.format(len(buf)))
+
+
+class TxInView:
+    """A transaction input backed by the raw transaction. Fields are decoded
+    when accessed.
+    """
+    __slots__ = ('_buf', '_offset', '_script_offset', '_script_len')
+
+    def __init__(self, buf, offset, script_offset, script_len):
+        self._buf = buf
+        self._offset = offset
+        self._script_offset = script_offset
+        self._script_len = script_len
+
+    @property
+    def txid(self):
+        """The ID of the transaction being spent, as hex."""
+        return bytes_to_hex(self._buf[self._offset:self._offset + 32].tobytes()[::-1])
+
+    @property
+    def txindex(self):
+        """The index of the output being spent."""
+        return int.from_bytes(self._buf[self._offset + 32:self._offset + 36], 'little')
+
+    @property
+    def script(self):
+        """The unlocking script, as a ``memoryview``."""
+        return self._buf[self._script_offset:self._script_offset + self._script_len]
+
+    @property
+    def sequence(self):
+        end = self._script_offset + self._script_len
+        return int.from_bytes(self._buf[end:end + 4], 'little')
+
+    def __repr__(self):
+        return 'TxInView(txid={}, txindex={})'.format(repr(self.txid), repr(self.txindex))
+
+
+class TxOutView:
+    """A transaction output backed by the raw transaction. Fields are decoded
+    when accessed.
+    """
+    __slots__ = ('_buf', '_offset', '_script_offset', '_script_len')
+
+    def __init__(self, buf, offset, script_offset, script_len):
+        self._buf = buf
+        self._offset = offset
+        self._script_offset = script_offset
+        self._script_len = script_len
+
+    @property
+    def amount(self):
+        """The value of the output in satoshi."""
+        return int.from_bytes(self._buf[self._offset:self._offset + 8], 'little')
+
+    @property
+    def script(self):
+        """The locking script, as a ``memoryview``."""
+        return self._buf[self._script_offset:self._script_offset + self._script_len]
+
+    @property
+    def public_key_hash(self):
+        """The hash160 paid to if this is a P2PKH output, otherwise ``None``."""
+        script = self.script
+        if (len(script) == 25 and script[:3] == P2PKH_SCRIPT_PREFIX and
+                script[23:] == P2PKH_SCRIPT_SUFFIX):
+            return script[3:23].tobytes()
+        return None
+
+    @property
+    def op_return(self):
+        """The data following ``OP_RETURN``, or ``None`` for other outputs."""
+        script = self.script
+        if script and script[0] == OP_RETURN:
+            return script[1:].tobytes()
+        return None
+
+    def address(self, version='main'):
+        """The cash address paid to if this is a P2PKH output, otherwise
+        ``None``.
+
+        :param version: ``'main'`` or ``'test'``.
+        :type version: ``str``
+        :rtype: ``str``
+        """
+        public_key_hash = self.public_key_hash
+        if public_key_hash is None:
+            return None
+
+        return encode_address(public_key_hash, version)
+
+    def __repr__(self):
+        return 'TxOutView(amount={}, script={})'.format(
+            repr(self.amount), repr(bytes_to_hex(self.script.tobytes())))
+
+
+class TxView:
+    """A raw transaction parsed without copying. Inputs and outputs are views
+    over the same buffer, which must not change while the view is used.
+    """
+    __slots__ = ('_buf', '_start', '_end', 'inputs', 'outputs')
+
+    def __init__(self, buf, start, end, inputs, outputs):
+        self._buf = buf
+        self._start = start
+        self._end = end
+        self.inputs = inputs
+        self.outputs = outputs
+
+    @property
+    def raw(self):
+        """The serialized transaction, as a ``memoryview``."""
+        return self._buf[self._start:self._end]
+
+    @property
+    def size(self):
+        return self._end - self._start
+
+    @property
+    def version(self):
+        return int.from_bytes(self._buf[self._start:self._start + 4], 'little')
+
+    @property
+    def lock_time(self):
+        return int.from_bytes(self._buf[self._end - 4:self._end], 'little')
+
+    @property
+    def txid(self):
+        return bytes_to_hex(double_sha256(self.raw)[::-1])
+
+    def __repr__(self):
+        return 'TxView(txid={}, inputs={}, outputs={})'.format(
+            repr(self.txid), len(self.inputs), len(self.outputs))
+
+
+def _parse_transaction(buf, start):
+    offset = start + 4
+
+    n_in, offset = read_varint(buf, offset)
+    inputs = []
+    for _ in range(n_in):
+        txin_offset = offset
+        script_len, offset = read_varint(buf, offset + 36)
+        inputs.append(TxInView(buf, txin_offset, offset, script_len))
+        offset += script_len + 4
+
+    n_out, offset = read_varint(buf, offset)
+    outputs = []
+    for _ in range(n_out):
+        txout_offset = offset
+        script_len, offset = read_varint(buf, offset + 8)
+        outputs.append(TxOutView(buf, txout_offset, offset, script_len))
+        offset += script_len
+
+    offset += 4
+    _check_bounds(buf, offset)
+
+    return TxView(buf, start, offset, inputs, outputs)
+
+
+def deserialize_transaction(raw):
+    """Parses a raw transaction. No field is copied out of ``raw``.
+
+    :param raw: The serialized transaction, or its hex.
+    :type raw: bytes-like or ``str``
+    :raises ValueError: If the data is truncated or has trailing bytes.
+    :rtype: :class:`~bitcash.deserialize.TxView`
+    """
+    if isinstance(raw, str):
+        raw = hex_to_bytes(raw)
+
+    buf = memoryview(raw)
+    tx = _parse_transaction(buf, 0)
+
+    if tx.size != len(buf):
+        raise ValueError('{} unexpected bytes after the transaction.'.format(len(buf) - tx.size))
+
+    return tx
+
+
+def iter_transactions(data):
+    """Parses transactions serialized back to back, e.g. from an archive
+    opened with :mod:`mmap`. Each transaction is a view over ``data``.
+
+    :param data: The concatenated transactions.
+    :type data: bytes-like
+    :raises ValueError: If the last transaction is truncated.
+    :rtype: generator of :class:`~bitcash.deserialize.TxView`
+    """
+    buf = memoryview(data)
+    offset = 0
+
+    while offset < len(buf):
+        tx = _parse_transaction(buf, offset)
+        offset += tx.size
+        yield tx
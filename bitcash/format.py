@@ -1,10 +1,18 @@
-from cashaddress import convert as cashaddress
+from collections import namedtuple
+from functools import lru_cache
+
+from cashaddress.convert import InvalidAddress
 from coincurve import verify_signature as _vs
 
-from bitcash.base58 import b58decode_check, b58encode_check
-from bitcash.crypto import ripemd160_sha256
+from bitcash.base58 import BASE58_ALPHABET, b58decode_check, b58encode_check
+from bitcash.crypto import double_sha256, ripemd160_sha256
 from bitcash.curve import x_to_y
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
 MAIN_PUBKEY_HASH = b'\x00'
 MAIN_SCRIPT_HASH = b'\x05'
 MAIN_PRIVATE_KEY = b'\x80'
@@ -20,6 +28,26 @@ PUBLIC_KEY_COMPRESSED_EVEN_Y = b'\x02'
 PUBLIC_KEY_COMPRESSED_ODD_Y = b'\x03'
 PRIVATE_KEY_COMPRESSED_PUBKEY = b'\x01'
 
+MAIN_CASHADDR_PREFIX = 'bitcoincash'
+TEST_CASHADDR_PREFIX = 'bchtest'
+CASHADDR_CHARSET = 'qpzry9x8gf2tvdw0s3jn54khce6mua7l'
+CASHADDR_CHARSET_INDEX = {char: index for index, char in enumerate(CASHADDR_CHARSET)}
+CASHADDR_GENERATORS = (0x98f2bc8e61, 0x79b76d99e2, 0xf33e5fb3c4, 0xae2eabe2a8, 0x1e4f43e470)
+CASHADDR_TYPES = {0: 'P2PKH', 8: 'P2SH'}
+CASHADDR_TYPE_BYTES = {'P2PKH': 0, 'P2SH': 8}
+
+LEGACY_VERSIONS = {
+    MAIN_PUBKEY_HASH: ('main', 'P2PKH'),
+    MAIN_SCRIPT_HASH: ('main', 'P2SH'),
+    TEST_PUBKEY_HASH: ('test', 'P2PKH'),
+    TEST_SCRIPT_HASH: ('test', 'P2SH'),
+}
+
+# Number of distinct addresses remembered by the address codec.
+ADDRESS_CACHE_SIZE = 65536
+
+DecodedAddress = namedtuple('DecodedAddress', ('version', 'type', 'hash'))
+
 
 def verify_sig(signature, data, public_key):
     """Verifies some data was signed by the owner of a public key.
@@ -35,25 +63,354 @@ def verify_sig(signature, data, public_key):
     return _vs(signature, data, public_key)
 
 
+def cashaddr_polymod(values):
+    checksum = 1
+
+    for value in values:
+        top = checksum >> 35
+        checksum = ((checksum & 0x07ffffffff) << 5) ^ value
+        for i, generator in enumerate(CASHADDR_GENERATORS):
+            if (top >> i) & 1:
+                checksum ^= generator
+
+    return checksum ^ 1
+
+
+def _prefix_values(prefix):
+    return [ord(char) & 0x1f for char in prefix] + [0]
+
+
+def _convert_bits(data, from_bits, to_bits, pad=True):
+    acc = 0
+    bits = 0
+    converted = []
+    max_value = (1 << to_bits) - 1
+
+    for value in data:
+        acc = (acc << from_bits) | value
+        bits += from_bits
+        while bits >= to_bits:
+            bits -= to_bits
+            converted.append((acc >> bits) & max_value)
+
+    if pad:
+        if bits:
+            converted.append((acc << (to_bits - bits)) & max_value)
+    elif bits >= from_bits or (acc << (to_bits - bits)) & max_value:
+        return None
+
+    return converted
+
+
+def _decode_cash_address(address):
+    if address.upper() != address and address.lower() != address:
+        raise InvalidAddress('Cash address contains uppercase and lowercase characters')
+
+    prefix, _, payload = address.lower().rpartition(':')
+    prefix = prefix or MAIN_CASHADDR_PREFIX
+
+    if prefix == MAIN_CASHADDR_PREFIX:
+        version = 'main'
+    elif prefix == TEST_CASHADDR_PREFIX:
+        version = 'test'
+    else:
+        raise InvalidAddress('Unknown cash address prefix {}'.format(prefix))
+
+    try:
+        values = [CASHADDR_CHARSET_INDEX[char] for char in payload]
+    except KeyError:
+        raise InvalidAddress('Cash address contains invalid characters') from None
+
+    if len(values) < 8 or cashaddr_polymod(_prefix_values(prefix) + values) != 0:
+        raise InvalidAddress('Bad cash address checksum')
+
+    data = _convert_bits(values[:-8], 5, 8, pad=False)
+
+    if data is None or len(data) != 21 or data[0] not in CASHADDR_TYPES:
+        raise InvalidAddress('Could not determine address version')
+
+    return DecodedAddress(version, CASHADDR_TYPES[data[0]], bytes(data[1:]))
+
+
+def _decode_legacy_address(address):
+    try:
+        decoded = b58decode_check(address)
+    except ValueError:
+        raise InvalidAddress('Could not decode legacy address') from None
+
+    if len(decoded) != 21 or decoded[:1] not in LEGACY_VERSIONS:
+        raise InvalidAddress('Could not determine address version')
+
+    version, address_type = LEGACY_VERSIONS[decoded[:1]]
+    return DecodedAddress(version, address_type, decoded[1:])
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def decode_address(address):
+    """Decodes a cash address, with or without its prefix, or a legacy
+    address. Recently decoded addresses are cached.
+
+    :param address: The address to decode.
+    :type address: ``str``
+    :raises InvalidAddress: If the address is malformed.
+    :returns: The network (``'main'`` or ``'test'``), the type (``'P2PKH'``
+              or ``'P2SH'``) and the hash160 the address pays to.
+    :rtype: :class:`~bitcash.format.DecodedAddress`
+    """
+    if ':' in address:
+        return _decode_cash_address(address)
+
+    # LEGACYADDRESSDEPRECATION
+    # FIXME: This legacy address support will be removed.
+    try:
+        return _decode_legacy_address(address)
+    except InvalidAddress:
+        return _decode_cash_address(address)
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def encode_address(hash160, version='main', address_type='P2PKH'):
+    """Encodes a hash160 as a cash address. Recently encoded addresses are
+    cached.
+
+    :param hash160: The public key or script hash.
+    :type hash160: ``bytes``
+    :param version: ``'main'`` or ``'test'``.
+    :type version: ``str``
+    :param address_type: ``'P2PKH'`` or ``'P2SH'``.
+    :type address_type: ``str``
+    :rtype: ``str``
+    """
+    if version == 'main':
+        prefix = MAIN_CASHADDR_PREFIX
+    elif version == 'test':
+        prefix = TEST_CASHADDR_PREFIX
+    else:
+        raise ValueError('Invalid version.')
+
+    values = _convert_bits(bytes([CASHADDR_TYPE_BYTES[address_type]]) + hash160, 8, 5)
+    checksum = cashaddr_polymod(_prefix_values(prefix) + values + [0] * 8)
+    values += [(checksum >> 5 * (7 - i)) & 0x1f for i in range(8)]
+
+    return prefix + ':' + ''.join([CASHADDR_CHARSET[value] for value in values])
+
+
+def decode_many(addresses):
+    """Decodes many addresses with :func:`~bitcash.format.decode_address`.
+
+    :type addresses: iterable of ``str``
+    :rtype: ``list`` of :class:`~bitcash.format.DecodedAddress`
+    """
+    return [decode_address(address) for address in addresses]
+
+
+def encode_many(hashes, version='main', address_type='P2PKH'):
+    """Encodes many hashes with :func:`~bitcash.format.encode_address`.
+
+    :type hashes: iterable of ``bytes``
+    :rtype: ``list`` of ``str``
+    """
+    return [encode_address(hash160, version, address_type) for hash160 in hashes]
+
+
+def to_cash_address(address):
+    """Converts a legacy or cash address to a cash address with its prefix.
+
+    :rtype: ``str``
+    """
+    decoded = decode_address(address)
+    return encode_address(decoded.hash, decoded.version, decoded.type)
+
+
+def _lookup_table(alphabet):
+    table = np.full(256, -1, dtype=np.int16)
+    for index, char in enumerate(alphabet):
+        table[ord(char)] = index
+    return table
+
+
+def _validate_cash_addresses(codes, lengths, mask, hashes, versions):
+    main_prefix = np.frombuffer((MAIN_CASHADDR_PREFIX + ':').encode(), dtype=np.uint8)
+    test_prefix = np.frombuffer((TEST_CASHADDR_PREFIX + ':').encode(), dtype=np.uint8)
+
+    rows = np.flatnonzero((lengths == 42) | (lengths == len(main_prefix) + 42) |
+                          (lengths == len(test_prefix) + 42))
+    if not len(rows):
+        return
+
+    # Fold uppercase into lowercase, rejecting mixed case.
+    codes, lengths = codes[rows], lengths[rows]
+    upper = (codes >= 65) & (codes <= 90)
+    lower = (codes >= 97) & (codes <= 122)
+    valid = ~(upper.any(axis=1) & lower.any(axis=1))
+    codes = codes | (upper.view(np.uint8) << 5)
+
+    main = ((lengths == len(main_prefix) + 42) &
+            (codes[:, :len(main_prefix)] == main_prefix).all(axis=1))
+    test = ((lengths == len(test_prefix) + 42) &
+            (codes[:, :len(test_prefix)] == test_prefix).all(axis=1))
+    bare = lengths == 42
+    valid &= main | test | bare
+
+    payload = np.zeros((len(rows), 42), dtype=np.uint8)
+    starts = ((main, len(main_prefix)), (test, len(test_prefix)), (bare, 0))
+    for rows_with_prefix, start in starts:
+        payload[rows_with_prefix] = codes[rows_with_prefix, start:start + 42]
+
+    values = _lookup_table(CASHADDR_CHARSET)[payload]
+    valid &= (values >= 0).all(axis=1)
+    values = values.astype(np.uint8)
+
+    # Every row starts from the checksum state left by its prefix, and the
+    # generators selected by the top 5 bits are XORed in with one lookup.
+    main_state = cashaddr_polymod(_prefix_values(MAIN_CASHADDR_PREFIX)) ^ 1
+    test_state = cashaddr_polymod(_prefix_values(TEST_CASHADDR_PREFIX)) ^ 1
+    checksum = np.where(test, np.uint64(test_state), np.uint64(main_state))
+    generators = np.zeros(32, dtype=np.uint64)
+    for top in range(32):
+        for i, generator in enumerate(CASHADDR_GENERATORS):
+            if (top >> i) & 1:
+                generators[top] ^= np.uint64(generator)
+
+    low_bits, shift, five = np.uint64(0x07ffffffff), np.uint64(35), np.uint64(5)
+    for column in np.ascontiguousarray(values.T):
+        checksum = ((checksum & low_bits) << five) ^ column ^ generators[checksum >> shift]
+
+    valid &= checksum == np.uint64(1)
+
+    # The 34 data values, padded to 40, are 25 bytes: the type byte, the
+    # hash160 and zero bits.
+    words = np.zeros((len(rows), 40), dtype=np.uint64)
+    words[:, :34] = values[:, :34]
+    words = words.reshape(len(rows), 5, 8) @ (32 ** np.arange(7, -1, -1, dtype=np.uint64))
+    data = words.astype('>u8').view(np.uint8).reshape(len(rows), 5, 8)
+    data = data[:, :, 3:].reshape(len(rows), 25)
+    valid &= ~data[:, 21:].any(axis=1) & (data[:, 0] == CASHADDR_TYPE_BYTES['P2PKH'])
+
+    rows = rows[valid]
+    mask[rows] = True
+    hashes[rows] = data[valid, 1:21]
+    versions[rows] = test[valid]
+
+
+def _validate_legacy_addresses(codes, lengths, mask, hashes, versions):
+    # LEGACYADDRESSDEPRECATION
+    # FIXME: This legacy address support will be removed.
+    rows = np.flatnonzero((lengths > 0) & (lengths <= 35))
+    if not len(rows):
+        return
+
+    # Right-align the digits; the left padding decodes to 0.
+    codes, lengths = codes[rows], lengths[rows]
+    index = np.arange(35) - (35 - lengths)[:, None]
+    aligned = np.take_along_axis(codes, np.maximum(index, 0), axis=1)
+    digits = _lookup_table(BASE58_ALPHABET)[aligned]
+    digits[index < 0] = 0
+    valid = (digits >= 0).all(axis=1)
+
+    # Fold 5 digits at a time into big-endian base 2 ** 32 limbs.
+    powers = 58 ** np.arange(4, -1, -1, dtype=np.uint64)
+    groups = digits.astype(np.uint64).reshape(len(rows), 7, 5) @ powers
+    limbs = np.zeros((len(rows), 7), dtype=np.uint64)
+    low_bits, shift, base = np.uint64(0xffffffff), np.uint64(32), np.uint64(58 ** 5)
+
+    for group in groups.T:
+        carry = group
+        for i in range(6, -1, -1):
+            value = limbs[:, i] * base + carry
+            limbs[:, i] = value & low_bits
+            carry = value >> shift
+        valid &= carry == 0
+
+    # 7 limbs are 28 bytes; the first 3 must be zero.
+    decoded = limbs.astype('>u4').view(np.uint8).reshape(len(rows), 28)
+    valid &= ~decoded[:, :3].any(axis=1)
+    decoded = decoded[:, 3:]
+
+    # Leading '1's must match the leading zero bytes exactly.
+    pad = np.cumprod(codes[:, :35] == ord('1'), axis=1).sum(axis=1)
+    zeros = np.cumprod(decoded == 0, axis=1).sum(axis=1)
+    valid &= zeros == pad
+    valid &= (decoded[:, 0] == MAIN_PUBKEY_HASH[0]) | (decoded[:, 0] == TEST_PUBKEY_HASH[0])
+
+    for i in np.flatnonzero(valid):
+        row = decoded[i].tobytes()
+        if double_sha256(row[:21])[:4] != row[21:]:
+            valid[i] = False
+
+    mask[rows[valid]] = True
+    hashes[rows[valid]] = decoded[valid, 1:21]
+    versions[rows[valid]] = decoded[valid, 0] == TEST_PUBKEY_HASH[0]
+
+
+def validate_addresses(addresses, version=None):
+    """Validates many P2PKH addresses at once using NumPy. This is the bulk
+    equivalent of :func:`~bitcash.format.address_to_public_key_hash` and
+    requires ``numpy`` to be installed.
+
+    :param addresses: Cash addresses, with or without their prefix, or
+                      legacy addresses.
+    :type addresses: ``list`` of ``str`` or a NumPy array of strings
+    :param version: ``'main'`` or ``'test'`` to only accept addresses of that
+                    network, or ``None`` to accept both.
+    :type version: ``str``
+    :returns: A boolean mask of the valid addresses and a matrix with the
+              hash160 of each valid address in its row. Rows of invalid
+              addresses are zero.
+    :rtype: ``tuple`` of ``numpy.ndarray``
+    """
+    if np is None:
+        raise ImportError('validate_addresses() requires NumPy.')
+
+    if version not in (None, 'main', 'test'):
+        raise ValueError('Invalid version.')
+
+    addresses = np.ascontiguousarray(addresses, dtype=str).reshape(-1)
+    count = len(addresses)
+    lengths = np.char.str_len(addresses)
+
+    # ASCII codes of the first 54 characters, enough for any valid address.
+    # Longer or non-ASCII addresses are invalid.
+    width = min(addresses.itemsize // 4, 54)
+    codes = np.zeros((count, 54), dtype=np.uint32)
+    if count:
+        codes[:, :width] = addresses.view(np.uint32).reshape(count, -1)[:, :width]
+    lengths[(lengths > 54) | (codes >= 128).any(axis=1)] = 0
+    codes = codes.astype(np.uint8)
+
+    mask = np.zeros(count, dtype=bool)
+    hashes = np.zeros((count, 20), dtype=np.uint8)
+    versions = np.zeros(count, dtype=np.uint8)
+
+    _validate_cash_addresses(codes, lengths, mask, hashes, versions)
+    _validate_legacy_addresses(codes, lengths, mask, hashes, versions)
+
+    if version is not None:
+        mask &= versions == (version == 'test')
+        hashes[~mask] = 0
+
+    return mask, hashes
+
+
 def address_to_public_key_hash(address):
     # LEGACYADDRESSDEPRECATION
     # FIXME: This legacy address support will be removed.
-    address = cashaddress.to_cash_address(address)
-    get_version(address)
-    Address = cashaddress.Address._cash_string(address)
-    return bytes(Address.payload)
+    decoded = decode_address(address)
+    _check_p2pkh(decoded)
+    return decoded.hash
 
 
 def get_version(address):
-    address = cashaddress.Address._cash_string(address)
+    decoded = decode_address(address)
+    _check_p2pkh(decoded)
+    return decoded.version
 
-    if address.version == 'P2PKH':
-        return 'main'
-    elif address.version == 'P2PKH-TESTNET':
-        return 'test'
-    else:
-        raise ValueError('{} does not correspond to a mainnet nor '
-                         'testnet P2PKH address.'.format(address.version))
+
+def _check_p2pkh(decoded):
+    if decoded.type != 'P2PKH':
+        suffix = '-TESTNET' if decoded.version == 'test' else ''
+        raise ValueError('{}{} does not correspond to a mainnet nor '
+                         'testnet P2PKH address.'.format(decoded.type, suffix))
 
 
 def bytes_to_wif(private_key, version='main', compressed=False):
@@ -110,20 +467,14 @@ def wif_checksum_check(wif):
 
 
 def public_key_to_address(public_key, version='main'):
-    if version == 'test':
-        version = 'P2PKH-TESTNET'
-    elif version == 'main':
-        version = 'P2PKH'
-    else:
+    if version not in ('main', 'test'):
         raise ValueError('Invalid version.')
     # 33 bytes compressed, 65 uncompressed.
     length = len(public_key)
     if length not in (33, 65):
         raise ValueError('{} is an invalid length for a public key.'.format(length))
 
-    payload = list(ripemd160_sha256(public_key))
-    address = cashaddress.Address(payload=payload, version=version)
-    return address.cash_address()
+    return encode_address(ripemd160_sha256(public_key), version)
 
 
 def public_key_to_coords(public_key):
@@ -0,0 +1,191 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from bitcash.coinselect import SMALLEST_FIRST
+from bitcash.deserialize import deserialize_transaction
+from bitcash.network import NetworkAPI, get_fee, satoshi_to_currency_cached
+from bitcash.transaction import calc_txid, create_p2pkh_transaction_from_keys, sanitize_tx_data
+from bitcash.utils import bytes_to_hex
+from bitcash.wallet import PrivateKeyTestnet
+
+# Most requests in flight at once when fetching unspents.
+DEFAULT_WORKERS = 8
+
+
+class WalletGroup:
+    """Many keys of the same network used as one wallet. Their unspents are
+    fetched concurrently, in bulk where services support it, and pooled so
+    that a transaction may spend from any of them.
+
+    :param keys: The keys of the group.
+    :type keys: ``list`` of :class:`~bitcash.PrivateKey` or
+                :class:`~bitcash.PrivateKeyTestnet`
+    :param workers: The most requests in flight at once.
+    :type workers: ``int``
+    :raises ValueError: If the keys are not all on the same network.
+    """
+
+    def __init__(self, keys=(), workers=DEFAULT_WORKERS):
+        self.keys = []
+        self.workers = workers
+        self._testnet = None
+        self._owners = {}
+
+        for key in keys:
+            self.add(key)
+
+    def add(self, key):
+        """Adds a key to the group.
+
+        :raises ValueError: If the key is not on the network of the group.
+        """
+        testnet = isinstance(key, PrivateKeyTestnet)
+
+        if self._testnet is None:
+            self._testnet = testnet
+        elif testnet != self._testnet:
+            raise ValueError('All keys of a group must be on the same network.')
+
+        self.keys.append(key)
+        self._owners[bytes_to_hex(key.scriptcode)] = key
+
+    @property
+    def unspents(self):
+        """The unspents of all keys, as last fetched or updated."""
+        return [unspent for key in self.keys for unspent in key.unspents]
+
+    @property
+    def balance(self):
+        """The balance of all keys in satoshi, as last fetched or updated."""
+        return sum(key.balance for key in self.keys)
+
+    def balance_as(self, currency):
+        """Returns the balance of all keys as last fetched or updated, in the
+        given currency.
+
+        :param currency: One of the :ref:`supported currencies`.
+        :type currency: ``str``
+        :rtype: ``str``
+        """
+        return satoshi_to_currency_cached(self.balance, currency)
+
+    def get_balance(self, currency='satoshi'):
+        """Fetches the current balance of all keys by calling
+        :func:`~bitcash.group.WalletGroup.get_unspents`.
+
+        :param currency: One of the :ref:`supported currencies`.
+        :type currency: ``str``
+        :rtype: ``str``
+        """
+        self.get_unspents()
+        return self.balance_as(currency)
+
+    def get_unspents(self):
+        """Fetches all available unspent transaction outputs of every key.
+        Addresses are requested ``NetworkAPI.BULK_LIMIT`` at a time, with up to
+        ``workers`` requests in flight.
+
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``list`` of :class:`~bitcash.network.meta.Unspent`
+        """
+        if self._testnet:
+            get_unspent_bulk = NetworkAPI.get_unspent_bulk_testnet
+        else:
+            get_unspent_bulk = NetworkAPI.get_unspent_bulk
+
+        addresses = [key.address for key in self.keys]
+        size = NetworkAPI.BULK_LIMIT
+        chunks = [addresses[i:i + size] for i in range(0, len(addresses), size)]
+
+        fetched = {}
+        if chunks:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(chunks))) as executor:
+                for unspents in executor.map(get_unspent_bulk, chunks):
+                    fetched.update(unspents)
+
+        for key in self.keys:
+            key.unspents[:] = key.tracker.reconcile(fetched[key.address])
+            key.balance = sum(unspent.amount for unspent in key.unspents)
+
+        return self.unspents
+
+    def create_transaction(self, outputs, fee=None, leftover=None, combine=True,
+                           message=None, unspents=None, custom_pushdata=False,
+                           strategy=SMALLEST_FIRST):
+        """Creates a signed P2PKH transaction spending the pooled unspents of
+        the group. Each input is signed by the key it belongs to. This accepts
+        the same arguments as :func:`~bitcash.PrivateKey.create_transaction`,
+        except that change goes to the first key by default.
+
+        :param unspents: The UTXOs to use as the inputs, which must belong to
+                         keys of the group. By default all unspents of the
+                         group are used.
+        :type unspents: ``list`` of :class:`~bitcash.network.meta.Unspent`
+        :raises ValueError: If an unspent belongs to no key of the group.
+        :returns: The signed transaction as hex.
+        :rtype: ``str``
+        """
+        if not self.keys:
+            raise ValueError('The group has no keys.')
+
+        unspents, outputs = sanitize_tx_data(
+            unspents or self.unspents,
+            outputs,
+            fee or get_fee(),
+            leftover or self.keys[0].address,
+            combine=combine,
+            message=message,
+            compressed=all(key.is_compressed() for key in self.keys),
+            custom_pushdata=custom_pushdata,
+            strategy=strategy
+        )
+
+        return create_p2pkh_transaction_from_keys(
+            [self._owner(unspent) for unspent in unspents], unspents, outputs,
+            custom_pushdata=custom_pushdata
+        )
+
+    def send(self, outputs, fee=None, leftover=None, combine=True,
+             message=None, unspents=None):
+        """Creates a signed P2PKH transaction and attempts to broadcast it.
+        This accepts the same arguments as
+        :func:`~bitcash.group.WalletGroup.create_transaction`. Afterwards the
+        unspents of the keys involved are updated, as with
+        :func:`~bitcash.PrivateKey.send`.
+
+        :returns: The transaction ID.
+        :rtype: ``str``
+        """
+
+        tx_hex = self.create_transaction(
+            outputs, fee=fee, leftover=leftover, combine=combine, message=message, unspents=unspents
+        )
+
+        if self._testnet:
+            NetworkAPI.broadcast_tx_testnet(tx_hex)
+        else:
+            NetworkAPI.broadcast_tx(tx_hex)
+
+        tx = deserialize_transaction(tx_hex)
+        spent = {(txin.txid, txin.txindex) for txin in tx.inputs}
+
+        for key in self.keys:
+            paid = any(txout.script == key.scriptcode for txout in tx.outputs)
+            if paid or any((unspent.txid, unspent.txindex) in spent for unspent in key.unspents):
+                key.tracker.apply(tx)
+                key.unspents[:] = key.tracker.reconcile(key.unspents)
+                key.balance = sum(unspent.amount for unspent in key.unspents)
+
+        return calc_txid(tx_hex)
+
+    def _owner(self, unspent):
+        try:
+            return self._owners[unspent.script]
+        except KeyError:
+            raise ValueError('Unspent {}:{} belongs to no key of the group.'
+                             .format(unspent.txid, unspent.txindex)) from None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __repr__(self):
+        return '<WalletGroup: {} keys>'.format(len(self.keys))
@@ -0,0 +1,386 @@
+import asyncio
+import json
+import weakref
+from decimal import Decimal
+from functools import partial
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from bitcash.network import services
+from bitcash.network.services import BitcoinDotComAPI, BitcoreAPI
+
+# Most connections open at once, per event loop.
+DEFAULT_CONNECTION_LIMIT = 100
+
+# One session per event loop, as sessions cannot be shared between loops.
+_SESSIONS = weakref.WeakKeyDictionary()
+
+_decimal_loads = partial(json.loads, parse_float=Decimal)
+
+
+def set_connection_limit(limit):
+    global DEFAULT_CONNECTION_LIMIT
+    DEFAULT_CONNECTION_LIMIT = limit
+
+
+def _running_loop():
+    # asyncio.get_running_loop() only exists from Python 3.7.
+    loop = asyncio.get_event_loop()
+    if not loop.is_running():
+        raise RuntimeError('There is no running event loop.')
+    return loop
+
+
+def get_session():
+    """Returns the ``aiohttp.ClientSession`` of the running event loop,
+    creating it on first use. Its connections are reused by all requests made
+    by :class:`~bitcash.network.aio.AsyncNetworkAPI`. Requires ``aiohttp``,
+    see ``pip install bitcash[async]``.
+
+    :rtype: ``aiohttp.ClientSession``
+    """
+    if aiohttp is None:  # pragma: no cover
+        raise ImportError('AsyncNetworkAPI requires aiohttp, see pip install bitcash[async].')
+
+    loop = _running_loop()
+    session = _SESSIONS.get(loop)
+
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=DEFAULT_CONNECTION_LIMIT),
+            timeout=aiohttp.ClientTimeout(total=services.DEFAULT_TIMEOUT)
+        )
+        _SESSIONS[loop] = session
+
+    return session
+
+
+def set_session(session):
+    """Makes the running event loop use ``session`` for all requests, e.g.
+    one configured with a proxy.
+
+    :type session: ``aiohttp.ClientSession``
+    """
+    _SESSIONS[_running_loop()] = session
+
+
+async def close_session():
+    """Closes the session of the running event loop, if any. Call this before
+    the loop is closed.
+    """
+    session = _SESSIONS.pop(asyncio.get_event_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+async def _get_json(url, loads=json.loads):
+    async with get_session().get(url) as r:
+        r.raise_for_status()  # pragma: no cover
+        return await r.json(loads=loads, content_type=None)
+
+
+class AsyncBitcoinDotComAPI:
+    """ rest.bitcoin.com API, without blocking the event loop """
+
+    @classmethod
+    async def get_balance(cls, address):
+        data = await _get_json(BitcoinDotComAPI.MAIN_ADDRESS_API.format(address))
+        return data['balanceSat'] + data['unconfirmedBalanceSat']
+
+    @classmethod
+    async def get_balance_testnet(cls, address):
+        data = await _get_json(BitcoinDotComAPI.TEST_ADDRESS_API.format(address))
+        return data['balanceSat'] + data['unconfirmedBalanceSat']
+
+    @classmethod
+    async def get_transactions(cls, address):
+        data = await _get_json(BitcoinDotComAPI.MAIN_ADDRESS_API.format(address))
+        return data['transactions']
+
+    @classmethod
+    async def get_transactions_testnet(cls, address):
+        data = await _get_json(BitcoinDotComAPI.TEST_ADDRESS_API.format(address))
+        return data['transactions']
+
+    @classmethod
+    async def get_transaction(cls, txid):
+        response = await _get_json(BitcoinDotComAPI.MAIN_TX_API.format(txid), _decimal_loads)
+        return BitcoinDotComAPI._parse_transaction(response)
+
+    @classmethod
+    async def get_transaction_testnet(cls, txid):
+        response = await _get_json(BitcoinDotComAPI.TEST_TX_API.format(txid), _decimal_loads)
+        return BitcoinDotComAPI._parse_transaction(response)
+
+    @classmethod
+    async def get_unspent(cls, address):
+        response = await _get_json(BitcoinDotComAPI.MAIN_UNSPENT_API.format(address))
+        return BitcoinDotComAPI._parse_unspent(response)
+
+    @classmethod
+    async def get_unspent_testnet(cls, address):
+        response = await _get_json(BitcoinDotComAPI.TEST_UNSPENT_API.format(address))
+        return BitcoinDotComAPI._parse_unspent(response)
+
+    @classmethod
+    async def get_raw_transaction(cls, txid):
+        return await _get_json(BitcoinDotComAPI.MAIN_RAW_API.format(txid), _decimal_loads)
+
+    @classmethod
+    async def get_raw_transaction_testnet(cls, txid):
+        return await _get_json(BitcoinDotComAPI.TEST_RAW_API.format(txid), _decimal_loads)
+
+    @classmethod
+    async def broadcast_tx(cls, tx_hex):  # pragma: no cover
+        async with get_session().get(BitcoinDotComAPI.MAIN_TX_PUSH_API.format(tx_hex)) as r:
+            return True if r.status == 200 else False
+
+    @classmethod
+    async def broadcast_tx_testnet(cls, tx_hex):  # pragma: no cover
+        async with get_session().get(BitcoinDotComAPI.TEST_TX_PUSH_API.format(tx_hex)) as r:
+            return True if r.status == 200 else False
+
+
+class AsyncBitcoreAPI:
+    """ Insight API v8, without blocking the event loop """
+
+    @classmethod
+    async def get_balance(cls, address):
+        data = await _get_json(BitcoreAPI.MAIN_BALANCE_API.format(address))
+        return data['balance']
+
+    @classmethod
+    async def get_balance_testnet(cls, address):
+        data = await _get_json(BitcoreAPI.TEST_BALANCE_API.format(address))
+        return data['balance']
+
+    @classmethod
+    async def get_transactions(cls, address):
+        address = address.replace('bitcoincash:', '')
+        data = await _get_json(BitcoreAPI.MAIN_ADDRESS_API.format(address))
+        return [tx['mintTxid'] for tx in data]
+
+    @classmethod
+    async def get_transactions_testnet(cls, address):
+        address = address.replace('bchtest:', '')
+        data = await _get_json(BitcoreAPI.TEST_ADDRESS_API.format(address))
+        return [tx['mintTxid'] for tx in data]
+
+    @classmethod
+    async def get_unspent(cls, address):
+        address = address.replace('bitcoincash:', '')
+        response = await _get_json(BitcoreAPI.MAIN_UNSPENT_API.format(address))
+        return BitcoreAPI._parse_unspent(response)
+
+    @classmethod
+    async def get_unspent_testnet(cls, address):
+        address = address.replace('bchtest:', '')
+        response = await _get_json(BitcoreAPI.TEST_UNSPENT_API.format(address))
+        return BitcoreAPI._parse_unspent_testnet(response)
+
+    @classmethod
+    async def broadcast_tx(cls, tx_hex):  # pragma: no cover
+        async with get_session().post(BitcoreAPI.MAIN_TX_PUSH_API, json={
+                BitcoreAPI.TX_PUSH_PARAM: tx_hex, 'network': 'mainnet', 'coin': 'BCH'}) as r:
+            return True if r.status == 200 else False
+
+    @classmethod
+    async def broadcast_tx_testnet(cls, tx_hex):  # pragma: no cover
+        async with get_session().post(BitcoreAPI.TEST_TX_PUSH_API, json={
+                BitcoreAPI.TX_PUSH_PARAM: tx_hex, 'network': 'testnet', 'coin': 'BCH'}) as r:
+            return True if r.status == 200 else False
+
+
+class AsyncNetworkAPI:
+    """The asyncio counterpart of :class:`~bitcash.network.NetworkAPI`. Each
+    method tries the same services in the same order, sharing one pooled
+    ``aiohttp`` session per event loop.
+    """
+    IGNORED_ERRORS = (asyncio.TimeoutError, ) + ((aiohttp.ClientError, ) if aiohttp else ())
+
+    # Mainnet
+    GET_BALANCE_MAIN = [AsyncBitcoinDotComAPI.get_balance,
+                        AsyncBitcoreAPI.get_balance]
+    GET_TRANSACTIONS_MAIN = [AsyncBitcoinDotComAPI.get_transactions,
+                             AsyncBitcoreAPI.get_transactions]
+    GET_UNSPENT_MAIN = [AsyncBitcoinDotComAPI.get_unspent,
+                        AsyncBitcoreAPI.get_unspent]
+    BROADCAST_TX_MAIN = [AsyncBitcoinDotComAPI.broadcast_tx,
+                         AsyncBitcoreAPI.broadcast_tx]
+    GET_TX_MAIN = [AsyncBitcoinDotComAPI.get_transaction]
+    GET_RAW_TX_MAIN = [AsyncBitcoinDotComAPI.get_raw_transaction]
+
+    # Testnet
+    GET_BALANCE_TEST = [AsyncBitcoreAPI.get_balance_testnet,
+                        AsyncBitcoinDotComAPI.get_balance_testnet]
+    GET_TRANSACTIONS_TEST = [AsyncBitcoreAPI.get_transactions_testnet]
+    GET_UNSPENT_TEST = [AsyncBitcoreAPI.get_unspent_testnet,
+                        AsyncBitcoinDotComAPI.get_unspent_testnet]
+    BROADCAST_TX_TEST = [AsyncBitcoreAPI.broadcast_tx_testnet,
+                         AsyncBitcoinDotComAPI.broadcast_tx_testnet]
+    GET_TX_TEST = [AsyncBitcoinDotComAPI.get_transaction_testnet]
+    GET_RAW_TX_TEST = [AsyncBitcoinDotComAPI.get_raw_transaction_testnet]
+
+    @classmethod
+    async def _first(cls, api_calls, *args):
+        for api_call in api_calls:
+            try:
+                return await api_call(*args)
+            except cls.IGNORED_ERRORS:
+                pass
+
+        raise ConnectionError('All APIs are unreachable.')
+
+    @classmethod
+    async def _broadcast(cls, api_calls, tx_hex):
+        success = None
+
+        for api_call in api_calls:
+            try:
+                success = await api_call(tx_hex)
+                if not success:
+                    continue
+                return
+            except cls.IGNORED_ERRORS:
+                pass
+
+        if success is False:
+            raise ConnectionError('Transaction broadcast failed, or '
+                                  'Unspents were already used.')
+
+        raise ConnectionError('All APIs are unreachable.')
+
+    @classmethod
+    async def get_balance(cls, address):
+        """Gets the balance of an address in satoshi.
+
+        :param address: The address in question.
+        :type address: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``int``
+        """
+        return await cls._first(cls.GET_BALANCE_MAIN, address)
+
+    @classmethod
+    async def get_balance_testnet(cls, address):
+        """Gets the balance of an address on the test network in satoshi.
+
+        :param address: The address in question.
+        :type address: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``int``
+        """
+        return await cls._first(cls.GET_BALANCE_TEST, address)
+
+    @classmethod
+    async def get_transactions(cls, address):
+        """Gets the ID of all transactions related to an address.
+
+        :param address: The address in question.
+        :type address: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``list`` of ``str``
+        """
+        return await cls._first(cls.GET_TRANSACTIONS_MAIN, address)
+
+    @classmethod
+    async def get_transactions_testnet(cls, address):
+        """Gets the ID of all transactions related to an address on the test
+        network.
+
+        :param address: The address in question.
+        :type address: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``list`` of ``str``
+        """
+        return await cls._first(cls.GET_TRANSACTIONS_TEST, address)
+
+    @classmethod
+    async def get_transaction(cls, txid):
+        """Gets the full transaction details.
+
+        :param txid: The transaction id in question.
+        :type txid: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``Transaction``
+        """
+        return await cls._first(cls.GET_TX_MAIN, txid)
+
+    @classmethod
+    async def get_transaction_testnet(cls, txid):
+        """Gets the full transaction details on the test network.
+
+        :param txid: The transaction id in question.
+        :type txid: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``Transaction``
+        """
+        return await cls._first(cls.GET_TX_TEST, txid)
+
+    @classmethod
+    async def get_unspent(cls, address):
+        """Gets all unspent transaction outputs belonging to an address.
+
+        :param address: The address in question.
+        :type address: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``list`` of :class:`~bitcash.network.meta.Unspent`
+        """
+        return await cls._first(cls.GET_UNSPENT_MAIN, address)
+
+    @classmethod
+    async def get_unspent_testnet(cls, address):
+        """Gets all unspent transaction outputs belonging to an address on the
+        test network.
+
+        :param address: The address in question.
+        :type address: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``list`` of :class:`~bitcash.network.meta.Unspent`
+        """
+        return await cls._first(cls.GET_UNSPENT_TEST, address)
+
+    @classmethod
+    async def get_raw_transaction(cls, txid):
+        """Gets the raw, unparsed transaction details.
+
+        :param txid: The transaction id in question.
+        :type txid: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``dict``
+        """
+        return await cls._first(cls.GET_RAW_TX_MAIN, txid)
+
+    @classmethod
+    async def get_raw_transaction_testnet(cls, txid):
+        """Gets the raw, unparsed transaction details on the test network.
+
+        :param txid: The transaction id in question.
+        :type txid: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``dict``
+        """
+        return await cls._first(cls.GET_RAW_TX_TEST, txid)
+
+    @classmethod
+    async def broadcast_tx(cls, tx_hex):  # pragma: no cover
+        """Broadcasts a transaction to the blockchain.
+
+        :param tx_hex: A signed transaction in hex form.
+        :type tx_hex: ``str``
+        :raises ConnectionError: If all API services fail.
+        """
+        await cls._broadcast(cls.BROADCAST_TX_MAIN, tx_hex)
+
+    @classmethod
+    async def broadcast_tx_testnet(cls, tx_hex):  # pragma: no cover
+        """Broadcasts a transaction to the test network's blockchain.
+
+        :param tx_hex: A signed transaction in hex form.
+        :type tx_hex: ``str``
+        :raises ConnectionError: If all API services fail.
+        """
+        await cls._broadcast(cls.BROADCAST_TX_TEST, tx_hex)
@@ -0,0 +1,341 @@
+import json
+import sqlite3
+import struct
+import threading
+from decimal import Decimal
+from functools import wraps
+from time import time
+
+from bitcash.network.meta import Unspent
+from bitcash.network.transaction import Transaction, TxPart
+
+try:
+    import lmdb
+except ImportError:  # pragma: no cover
+    lmdb = None
+
+# Maximum size of a cache in bytes.
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# Seconds to cache data that changes, such as unspents and balances.
+DEFAULT_MUTABLE_CACHE_TIME = 10
+
+# Fraction of a full LMDB cache evicted at once, oldest entries first.
+EVICTION_FRACTION = 0.25
+EVICTION_ATTEMPTS = 4
+
+NETWORK_CACHE = None
+
+
+def set_network_cache(cache):
+    """Sets the persistent cache used by :class:`~bitcash.network.NetworkAPI`.
+
+    :param cache: A :class:`~bitcash.network.cache.SQLiteCache`, a
+                  :class:`~bitcash.network.cache.LMDBCache` or ``None`` to
+                  stop caching.
+    """
+    global NETWORK_CACHE
+    NETWORK_CACHE = cache
+
+
+def set_mutable_cache_time(seconds):
+    global DEFAULT_MUTABLE_CACHE_TIME
+    DEFAULT_MUTABLE_CACHE_TIME = seconds
+
+
+class SQLiteCache:
+    """A persistent cache in an SQLite database, read through a memory map.
+    When it grows beyond ``max_size``, the oldest entries are evicted.
+
+    :param path: The database file.
+    :type path: ``str``
+    :param max_size: The maximum total size of the cached values in bytes.
+    :type max_size: ``int``
+    """
+
+    def __init__(self, path, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA mmap_size={:d}'.format(max_size))
+        self._db.execute('CREATE TABLE IF NOT EXISTS entries ('
+                         'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+                         'expires REAL, stored REAL NOT NULL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS entries_stored ON entries (stored)')
+        self._size = self._total_size()
+
+    def get(self, key):
+        """:rtype: ``bytes`` or ``None`` if missing or expired"""
+        with self._lock:
+            row = self._db.execute('SELECT value, expires FROM entries WHERE key = ?', (key, )).fetchone()
+
+            if row is None:
+                return None
+
+            value, expires = row
+            if expires is not None and expires <= time():
+                self._db.execute('DELETE FROM entries WHERE key = ?', (key, ))
+                self._size -= len(value)
+                return None
+
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Stores a value for ``ttl`` seconds, or forever if ``ttl`` is ``None``."""
+        now = time()
+        expires = None if ttl is None else now + ttl
+
+        with self._lock:
+            self._size -= self._length(key)
+            self._db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)', (key, value, expires, now))
+            self._size += len(value)
+
+            if self._size > self.max_size:
+                self._evict(now)
+
+    def delete(self, key):
+        with self._lock:
+            self._size -= self._length(key)
+            self._db.execute('DELETE FROM entries WHERE key = ?', (key, ))
+
+    def clear(self):
+        with self._lock:
+            self._db.execute('DELETE FROM entries')
+            self._size = 0
+
+    def close(self):
+        self._db.close()
+
+    def _total_size(self):
+        return self._db.execute('SELECT COALESCE(SUM(LENGTH(value)), 0) FROM entries').fetchone()[0]
+
+    def _length(self, key):
+        row = self._db.execute('SELECT LENGTH(value) FROM entries WHERE key = ?', (key, )).fetchone()
+        return 0 if row is None else row[0]
+
+    def _evict(self, now):
+        self._db.execute('DELETE FROM entries WHERE expires <= ?', (now, ))
+        self._size = self._total_size()
+
+        # Evict the oldest entries until the rest fit.
+        keys = []
+        rows = self._db.execute('SELECT key, LENGTH(value) FROM entries ORDER BY stored')
+        for key, length in rows:
+            if self._size <= self.max_size:
+                break
+            keys.append((key, ))
+            self._size -= length
+        rows.close()
+
+        self._db.executemany('DELETE FROM entries WHERE key = ?', keys)
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+
+class LMDBCache:
+    """A persistent cache in an LMDB environment, which is memory-mapped.
+    When the map is full, the oldest entries are evicted. Requires ``lmdb``,
+    see ``pip install bitcash[cache]``.
+
+    :param path: The directory of the environment.
+    :type path: ``str``
+    :param max_size: The size of the memory map in bytes.
+    :type max_size: ``int``
+    """
+    # Each value is prefixed with when it expires (0 for never) and when it
+    # was stored, which is also the start of its key in the age index.
+    HEADER = struct.Struct('>dd')
+
+    def __init__(self, path, max_size=DEFAULT_MAX_SIZE):
+        if lmdb is None:  # pragma: no cover
+            raise ImportError('LMDBCache requires lmdb, see pip install bitcash[cache].')
+
+        self.max_size = max_size
+        self._env = lmdb.open(path, map_size=max_size, max_dbs=2)
+        self._entries = self._env.open_db(b'entries')
+        self._ages = self._env.open_db(b'ages')
+
+    def get(self, key):
+        """:rtype: ``bytes`` or ``None`` if missing or expired"""
+        key = key.encode('utf-8')
+
+        with self._env.begin(db=self._entries, buffers=True) as txn:
+            raw = txn.get(key)
+
+            if raw is None:
+                return None
+
+            expires, _ = self.HEADER.unpack_from(raw)
+            if not expires or expires > time():
+                return bytes(raw[self.HEADER.size:])
+
+        self.delete(key.decode('utf-8'))
+        return None
+
+    def set(self, key, value, ttl=None):
+        """Stores a value for ``ttl`` seconds, or forever if ``ttl`` is ``None``."""
+        key = key.encode('utf-8')
+
+        # Pages freed by an eviction may only become reusable a few
+        # transactions later.
+        for _ in range(EVICTION_ATTEMPTS):
+            try:
+                return self._put(key, value, ttl)
+            except lmdb.MapFullError:
+                self._evict()
+
+        self._put(key, value, ttl)
+
+    def delete(self, key):
+        with self._env.begin(write=True) as txn:
+            self._delete(txn, key.encode('utf-8'))
+
+    def clear(self):
+        with self._env.begin(write=True) as txn:
+            txn.drop(self._entries, delete=False)
+            txn.drop(self._ages, delete=False)
+
+    def close(self):
+        self._env.close()
+
+    def _put(self, key, value, ttl):
+        now = time()
+        header = self.HEADER.pack(0 if ttl is None else now + ttl, now)
+
+        with self._env.begin(write=True) as txn:
+            self._delete(txn, key)
+            txn.put(key, header + value, db=self._entries)
+            txn.put(header[8:] + key, b'', db=self._ages)
+
+    def _delete(self, txn, key):
+        raw = txn.get(key, db=self._entries)
+
+        if raw is not None:
+            txn.delete(raw[8:self.HEADER.size] + key, db=self._ages)
+            txn.delete(key, db=self._entries)
+
+    def _evict(self):
+        with self._env.begin(write=True) as txn:
+            count = max(int(txn.stat(self._entries)['entries'] * EVICTION_FRACTION), 1)
+            cursor = txn.cursor(db=self._ages)
+
+            for age_key in [age_key for age_key, _ in zip(cursor.iternext(values=False), range(count))]:
+                txn.delete(age_key, db=self._ages)
+                txn.delete(age_key[8:], db=self._entries)
+
+    def __len__(self):
+        with self._env.begin() as txn:
+            return txn.stat(self._entries)['entries']
+
+
+def forever(result):
+    return None
+
+
+def mutable(result):
+    return DEFAULT_MUTABLE_CACHE_TIME
+
+
+def until_confirmed(result):
+    """Caches transactions forever once they are in a block."""
+    if isinstance(result, dict):
+        confirmed = result.get('confirmations', 0) > 0
+    else:
+        confirmed = result.block is not None and result.block > 0
+
+    return None if confirmed else DEFAULT_MUTABLE_CACHE_TIME
+
+
+def _encode(value):
+    if isinstance(value, Decimal):
+        return {'__bitcash__': 'Decimal', 'value': str(value)}
+    elif isinstance(value, Unspent):
+        return {'__bitcash__': 'Unspent', 'value': value.to_dict()}
+    elif isinstance(value, Transaction):
+        return {'__bitcash__': 'Transaction', 'value': [
+            value.txid, value.block, value.amount_in, value.amount_out, value.amount_fee,
+            value.inputs, value.outputs
+        ]}
+    elif isinstance(value, TxPart):
+        return {'__bitcash__': 'TxPart', 'value': [value.address, value.amount, value.op_return]}
+    raise TypeError('{} cannot be cached.'.format(type(value).__name__))
+
+
+def _decode(obj):
+    kind = obj.get('__bitcash__')
+
+    if kind == 'Decimal':
+        return Decimal(obj['value'])
+    elif kind == 'Unspent':
+        return Unspent.from_dict(obj['value'])
+    elif kind == 'Transaction':
+        txid, block, amount_in, amount_out, amount_fee, inputs, outputs = obj['value']
+        tx = Transaction(txid, block, amount_in, amount_out, amount_fee)
+        tx.inputs, tx.outputs = inputs, outputs
+        return tx
+    elif kind == 'TxPart':
+        address, amount, op_return = obj['value']
+        part = TxPart(address, amount)
+        part.op_return = op_return
+        return part
+
+    return obj
+
+
+def dumps(value):
+    """Serializes a result of :class:`~bitcash.network.NetworkAPI` as JSON.
+
+    :rtype: ``bytes``
+    """
+    return json.dumps(value, default=_encode, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data):
+    """Restores a value serialized by :func:`dumps`. Unlike unpickling, this
+    cannot run code, whoever wrote the cache.
+
+    :raises ValueError: If ``data`` is not such a value.
+    """
+    return json.loads(data.decode('utf-8'), object_hook=_decode)
+
+
+def network_cache(name, ttl):
+    """Caches the results of a :class:`~bitcash.network.NetworkAPI` method in
+    :data:`NETWORK_CACHE`, if set. Results are stored as JSON.
+
+    :param name: Identifies the method in cache keys.
+    :type name: ``str``
+    :param ttl: Returns how long a result may be cached in seconds, ``None``
+                for forever or 0 for not at all.
+    :type ttl: ``callable``
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(cls, *args):
+            cache = NETWORK_CACHE
+            if cache is None:
+                return f(cls, *args)
+
+            key = ':'.join([name] + [str(arg) for arg in args])
+            value = cache.get(key)
+            if value is not None:
+                try:
+                    return loads(value)
+                except (KeyError, TypeError, ValueError):
+                    # Written by an older version or not by bitcash at all.
+                    pass
+
+            result = f(cls, *args)
+
+            seconds = ttl(result)
+            if seconds != 0:
+                cache.set(key, dumps(result), seconds)
+
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,97 @@
+import threading
+from copy import copy
+
+
+class _Flight:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls: while a call for a key is in
+    flight, other callers with the same key wait for it instead of making
+    their own, and all receive its result or exception.
+
+    Waiting callers get a shallow copy of the result, so that e.g. a list of
+    unspents can be changed by one caller without affecting the others.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.coalesced = 0
+
+    def do(self, key, f, *args):
+        """Calls ``f(*args)``, unless a call for ``key`` is in flight, in which
+        case its outcome is shared.
+
+        :param key: Identifies identical calls.
+        :type key: hashable
+        :param f: The call.
+        :type f: ``callable``
+        :returns: The result of the call.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy(flight.result)
+
+        try:
+            flight.result = f(*args)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+        return flight.result
+
+    def in_flight(self):
+        """:returns: The number of calls in flight."""
+        with self._lock:
+            return len(self._flights)
+
+
+SINGLE_FLIGHT = SingleFlight()
+
+
+def set_single_flight(single_flight):
+    """Sets how :class:`~bitcash.network.NetworkAPI` and the cached exchange
+    rates coalesce concurrent identical requests.
+
+    :param single_flight: A :class:`~bitcash.network.coalesce.SingleFlight`,
+                          or ``None`` to make every request separately.
+    """
+    global SINGLE_FLIGHT
+    SINGLE_FLIGHT = single_flight
+
+
+def coalesce(key, f, *args):
+    """Calls ``f(*args)`` through :data:`SINGLE_FLIGHT`, if set.
+
+    :param key: Identifies identical calls, e.g. the operation and its
+                arguments. Lists are made hashable.
+    :type key: ``tuple``
+    """
+    single_flight = SINGLE_FLIGHT
+    if single_flight is None:
+        return f(*args)
+
+    key = tuple(tuple(part) if isinstance(part, list) else part for part in key)
+    return single_flight.do(key, f, *args)
@@ -0,0 +1,265 @@
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from time import monotonic
+
+from bitcash.network import health, metrics, ratelimit
+
+# How NetworkAPI asks its services: one after another until one answers,
+# the next one also once the previous is slow, or all of them at once.
+SEQUENTIAL = 'sequential'
+HEDGED = 'hedged'
+RACE = 'race'
+REQUEST_MODES = (SEQUENTIAL, HEDGED, RACE)
+
+DEFAULT_REQUEST_MODE = SEQUENTIAL
+
+# Seconds to wait for a service before also asking the next one.
+DEFAULT_HEDGE_DELAY = 1
+
+# If set, wait for this percentile of recent latencies of the operation
+# instead, once enough have been seen.
+HEDGE_PERCENTILE = None
+LATENCY_SAMPLES = 100
+MIN_LATENCY_SAMPLES = 10
+
+# Threads running hedged and raced requests, shared by all operations.
+MAX_WORKERS = 32
+
+_MISSING = object()
+
+_operation_modes = {}
+_local = threading.local()
+_latencies = defaultdict(lambda: deque(maxlen=LATENCY_SAMPLES))
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def set_request_mode(mode, operation=None):
+    """Sets how :class:`~bitcash.network.NetworkAPI` queries its services.
+
+    :param mode: ``'sequential'``, ``'hedged'`` or ``'race'``.
+    :type mode: ``str``
+    :param operation: The name of a method of
+                      :class:`~bitcash.network.NetworkAPI`, e.g.
+                      ``'get_transaction'``, to only set its mode. By
+                      default all operations without their own mode are set.
+    :type operation: ``str``
+    :raises ValueError: If the mode is unknown.
+    """
+    global DEFAULT_REQUEST_MODE
+
+    if mode not in REQUEST_MODES:
+        raise ValueError('Unknown request mode {}, expected one of {}.'.format(
+            repr(mode), ', '.join(REQUEST_MODES)))
+
+    if operation is None:
+        DEFAULT_REQUEST_MODE = mode
+    else:
+        _operation_modes[operation] = mode
+
+
+def set_hedge_delay(seconds=None, percentile=None):
+    """Sets how long a hedged request waits for a service before asking the
+    next one.
+
+    :param seconds: A fixed delay, also used until enough latencies of an
+                    operation were recorded.
+    :type seconds: ``float``
+    :param percentile: Wait for this percentile of the recent latencies of
+                       the operation, e.g. ``95``. ``None`` to always use
+                       ``seconds``.
+    :type percentile: ``float``
+    """
+    global DEFAULT_HEDGE_DELAY, HEDGE_PERCENTILE
+
+    if seconds is not None:
+        DEFAULT_HEDGE_DELAY = seconds
+    HEDGE_PERCENTILE = percentile
+
+
+@contextmanager
+def request_mode(mode):
+    """Uses ``mode`` for all requests of the current thread within the
+    ``with`` block, e.g. to race services for one latency-critical lookup.
+    """
+    if mode not in REQUEST_MODES:
+        raise ValueError('Unknown request mode {}, expected one of {}.'.format(
+            repr(mode), ', '.join(REQUEST_MODES)))
+
+    previous = getattr(_local, 'mode', None)
+    _local.mode = mode
+    try:
+        yield
+    finally:
+        _local.mode = previous
+
+
+def get_request_mode(operation):
+    return getattr(_local, 'mode', None) or _operation_modes.get(operation, DEFAULT_REQUEST_MODE)
+
+
+def hedge_delay(operation):
+    """:returns: Seconds a hedged ``operation`` waits for each service."""
+    if HEDGE_PERCENTILE is not None:
+        latencies = sorted(_latencies[operation])
+        if len(latencies) >= MIN_LATENCY_SAMPLES:
+            index = min(int(len(latencies) * HEDGE_PERCENTILE / 100), len(latencies) - 1)
+            return latencies[index]
+
+    return DEFAULT_HEDGE_DELAY
+
+
+def _get_executor():
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+    return _executor
+
+
+def _timed(operation, api_call, args, level):
+    tracker = health.HEALTH_TRACKER
+    start = monotonic()
+
+    try:
+        with ratelimit.priority(level):
+            result = api_call(*args)
+    except Exception:
+        latency = monotonic() - start
+        if tracker is not None:
+            tracker.record_failure(api_call, latency)
+        if metrics.HOOKS:
+            metrics.emit_request(operation, metrics.provider_name(api_call), latency, False)
+        raise
+
+    latency = monotonic() - start
+    _latencies[operation].append(latency)
+    if tracker is not None:
+        tracker.record_success(api_call, latency)
+    if metrics.HOOKS:
+        metrics.emit_request(operation, metrics.provider_name(api_call), latency, True)
+
+    return result
+
+
+def _fall_back(operation, api_call):
+    if metrics.HOOKS:
+        metrics.emit_fallback(operation, metrics.provider_name(api_call))
+
+
+def dispatch(operation, api_calls, args, ignored_errors, accept=None):
+    """Calls services until one gives an accepted result, in the mode of the
+    operation and in the order of :data:`~bitcash.network.health.HEALTH_TRACKER`
+    if set. Hedged and raced calls that are no longer needed are
+    cancelled if they have not started yet, otherwise their results are
+    discarded.
+
+    :param operation: Names the operation for its mode and latencies.
+    :type operation: ``str``
+    :param api_calls: The services, in order of preference.
+    :type api_calls: ``list`` of ``callable``
+    :param args: The arguments of every call.
+    :type args: ``tuple``
+    :param ignored_errors: Errors after which the next service is asked.
+    :type ignored_errors: ``tuple`` of ``Exception``
+    :param accept: Returns whether a result is final. By default all are.
+    :type accept: ``callable``
+    :raises ConnectionError: If all services fail.
+    :raises Exception: Any error not in ``ignored_errors``, at once.
+    :returns: The first accepted result or, if there is none, the last
+              rejected one.
+    """
+    mode = get_request_mode(operation)
+    level = ratelimit.get_priority(operation)
+
+    tracker = health.HEALTH_TRACKER
+    if tracker is not None:
+        api_calls = tracker.order(api_calls)
+
+    if mode == SEQUENTIAL or len(api_calls) < 2:
+        return _dispatch_sequential(operation, api_calls, args, ignored_errors, accept, level)
+
+    executor = _get_executor()
+    pending = {}
+    launched = 0
+    rejected = _MISSING
+
+    def launch(count):
+        nonlocal launched
+        for api_call in api_calls[launched:launched + count]:
+            pending[executor.submit(_timed, operation, api_call, args, level)] = api_call
+            launched += 1
+
+    launch(len(api_calls) if mode == RACE else 1)
+
+    while pending:
+        timeout = hedge_delay(operation) if launched < len(api_calls) else None
+        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+        # The current services are slow, also ask the next one.
+        if not done:
+            launch(1)
+            continue
+
+        failed = []
+        for future in done:
+            api_call = pending.pop(future)
+
+            try:
+                result = future.result()
+            except ignored_errors:
+                failed.append(api_call)
+                continue
+            except Exception:
+                # Like sequential calls, other errors are not retried.
+                for future in pending:
+                    future.cancel()
+                raise
+
+            if accept is None or accept(result):
+                for future in pending:
+                    future.cancel()
+                return result
+
+            rejected = result
+            failed.append(api_call)
+
+        if pending or launched < len(api_calls):
+            for api_call in failed:
+                _fall_back(operation, api_call)
+
+        launch(len(failed))
+
+    if rejected is not _MISSING:
+        return rejected
+
+    raise ConnectionError('All APIs are unreachable.')
+
+
+def _dispatch_sequential(operation, api_calls, args, ignored_errors, accept, level):
+    rejected = _MISSING
+
+    for i, api_call in enumerate(api_calls, 1):
+        try:
+            result = _timed(operation, api_call, args, level)
+        except ignored_errors:
+            if i < len(api_calls):
+                _fall_back(operation, api_call)
+            continue
+
+        if accept is None or accept(result):
+            return result
+
+        rejected = result
+        if i < len(api_calls):
+            _fall_back(operation, api_call)
+
+    if rejected is not _MISSING:
+        return rejected
+
+    raise ConnectionError('All APIs are unreachable.')
@@ -0,0 +1,190 @@
+import threading
+from time import monotonic
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Weight of the newest call in the moving averages.
+DEFAULT_SMOOTHING = 0.2
+
+# Consecutive failures after which a service is skipped.
+DEFAULT_FAILURE_THRESHOLD = 5
+
+# Seconds a service is skipped before one call probes it again.
+DEFAULT_RESET_TIMEOUT = 30
+
+# Latency assumed for services without calls yet, so that a service is only
+# preferred over one listed before it once it proves faster or more reliable.
+INITIAL_LATENCY = 1
+
+
+class ProviderHealth:
+    """The health of one service for one operation."""
+    __slots__ = ('name', 'success_rate', 'latency', 'consecutive_failures',
+                 'calls', 'state', 'opened_at', 'updated_at')
+
+    def __init__(self, name):
+        self.name = name
+        self.success_rate = 1.0
+        self.latency = INITIAL_LATENCY
+        self.consecutive_failures = 0
+        self.calls = 0
+        self.state = CLOSED
+        self.opened_at = None
+        self.updated_at = None
+
+    def score(self, now, stale_after):
+        """Expected seconds per successful call, lower is better. Stale
+        records count as unknown, so that a service that was demoted is
+        eventually tried again.
+        """
+        if self.updated_at is None or now - self.updated_at >= stale_after:
+            return INITIAL_LATENCY
+        return self.latency / max(self.success_rate, 0.01)
+
+    def __repr__(self):
+        return 'ProviderHealth(name={}, state={}, success_rate={:.2f}, latency={:.3f})'.format(
+            repr(self.name), self.state, self.success_rate, self.latency)
+
+
+class HealthTracker:
+    """Records the success rate and latency of each service as exponentially
+    weighted moving averages, and orders services by them. After repeated
+    failures a service's circuit opens and it is skipped, until a single
+    call probes whether it recovered.
+
+    :param smoothing: Weight of the newest call in the moving averages.
+    :type smoothing: ``float``
+    :param failure_threshold: Consecutive failures that open the circuit.
+    :type failure_threshold: ``int``
+    :param reset_timeout: Seconds before an open circuit is probed, and
+                          before the record of a service becomes stale.
+    :type reset_timeout: ``float``
+    """
+
+    def __init__(self, smoothing=DEFAULT_SMOOTHING, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout=DEFAULT_RESET_TIMEOUT):
+        self.smoothing = smoothing
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._records = {}
+
+    def _record(self, api_call):
+        record = self._records.get(api_call)
+        if record is None:
+            name = getattr(api_call, '__qualname__', None) or repr(api_call)
+            record = self._records[api_call] = ProviderHealth(name)
+        return record
+
+    def order(self, api_calls):
+        """Orders services from healthiest to least healthy. Services with an
+        open circuit are left out, except for one probe per
+        ``reset_timeout``, which goes first. If every circuit is open and no
+        probe is due, the services are returned in their configured order,
+        so that a request is never dropped without being sent.
+
+        :param api_calls: The services, in order of preference.
+        :type api_calls: ``list`` of ``callable``
+        :rtype: ``list`` of ``callable``
+        """
+        now = monotonic()
+        probes = []
+        closed = []
+
+        with self._lock:
+            records = [(self._record(api_call), api_call) for api_call in api_calls]
+
+            for record, api_call in records:
+                if record.state == CLOSED:
+                    closed.append((record.score(now, self.reset_timeout), api_call))
+
+                # A probe that never finished, e.g. because it was cancelled,
+                # is retried after the same timeout.
+                elif now - record.opened_at >= self.reset_timeout:
+                    record.state = HALF_OPEN
+                    record.opened_at = now
+                    probes.append(api_call)
+
+        if not probes and not closed:
+            return list(api_calls)
+
+        closed.sort(key=lambda item: item[0])
+        return probes + [api_call for _, api_call in closed]
+
+    def record_success(self, api_call, latency):
+        with self._lock:
+            record = self._record(api_call)
+            record.calls += 1
+            record.updated_at = monotonic()
+            record.success_rate += self.smoothing * (1 - record.success_rate)
+            record.latency += self.smoothing * (latency - record.latency)
+            record.consecutive_failures = 0
+            record.state = CLOSED
+            record.opened_at = None
+
+    def record_failure(self, api_call, latency):
+        with self._lock:
+            record = self._record(api_call)
+            record.calls += 1
+            record.updated_at = monotonic()
+            record.success_rate -= self.smoothing * record.success_rate
+            record.latency += self.smoothing * (latency - record.latency)
+            record.consecutive_failures += 1
+
+            if record.state == HALF_OPEN or record.consecutive_failures >= self.failure_threshold:
+                record.state = OPEN
+                record.opened_at = monotonic()
+
+    def snapshot(self):
+        """Returns the current health of every service seen, e.g. for a
+        dashboard.
+
+        :returns: For each service, its ``state``, ``success_rate``,
+                  ``latency`` in seconds, ``consecutive_failures``, ``calls``
+                  and for open circuits ``retry_in`` seconds.
+        :rtype: ``dict`` of ``str`` to ``dict``
+        """
+        now = monotonic()
+
+        with self._lock:
+            return {
+                record.name: {
+                    'state': record.state,
+                    'success_rate': record.success_rate,
+                    'latency': record.latency,
+                    'consecutive_failures': record.consecutive_failures,
+                    'calls': record.calls,
+                    'retry_in': (max(self.reset_timeout - (now - record.opened_at), 0)
+                                 if record.state == OPEN else None),
+                }
+                for record in self._records.values()
+            }
+
+    def reset(self):
+        """Forgets all recorded calls."""
+        with self._lock:
+            self._records.clear()
+
+
+HEALTH_TRACKER = HealthTracker()
+
+
+def set_health_tracker(tracker):
+    """Sets the tracker used by :class:`~bitcash.network.NetworkAPI` to order
+    services.
+
+    :param tracker: A :class:`~bitcash.network.health.HealthTracker`, or
+                    ``None`` to always use the configured order.
+    """
+    global HEALTH_TRACKER
+    HEALTH_TRACKER = tracker
+
+
+def get_health_snapshot():
+    """Returns :func:`~bitcash.network.health.HealthTracker.snapshot` of the
+    tracker in use, or an empty ``dict`` if there is none.
+    """
+    tracker = HEALTH_TRACKER
+    return tracker.snapshot() if tracker is not None else {}
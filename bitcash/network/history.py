@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from bitcash.network.services import NetworkAPI
+
+# Transactions yielded by TransactionHistory.pages() at a time.
+DEFAULT_PAGE_SIZE = 100
+
+# Most transactions fetched at once when hydrating.
+DEFAULT_WORKERS = 8
+
+
+class TransactionHistory:
+    """Iterates lazily over the transaction history of an address, newest
+    first, fetching one page at a time from the services. The next page is
+    fetched in the background while the current one is consumed.
+
+    :param address: The address in question.
+    :type address: ``str``
+    :param page_size: Transactions per page of :meth:`pages`.
+    :type page_size: ``int``
+    :param since_height: Skip transactions confirmed below this block height.
+                         History is listed newest first, so no page after
+                         the first such transaction is fetched.
+    :type since_height: ``int``
+    :param until_height: Skip transactions confirmed above this block
+                         height, and unconfirmed ones.
+    :type until_height: ``int``
+    :param hydrate: Yield a :class:`~bitcash.network.transaction.Transaction`
+                    for each transaction instead of its ID.
+    :type hydrate: ``bool``
+    :param workers: The most transactions fetched at once when hydrating.
+    :type workers: ``int``
+    :param testnet: Whether the address is on the test network.
+    :type testnet: ``bool``
+    """
+
+    def __init__(self, address, page_size=DEFAULT_PAGE_SIZE, since_height=None,
+                 until_height=None, hydrate=False, workers=DEFAULT_WORKERS, testnet=False):
+        if page_size < 1:
+            raise ValueError('The page size must be at least 1.')
+
+        self.address = address
+        self.page_size = page_size
+        self.since_height = since_height
+        self.until_height = until_height
+        self.hydrate = hydrate
+        self.workers = workers
+        self.testnet = testnet
+
+    def _included(self, height):
+        if height is None:
+            return self.until_height is None
+        return self.until_height is None or height <= self.until_height
+
+    def _past(self, height):
+        return height is not None and self.since_height is not None and height < self.since_height
+
+    def _txids(self):
+        get_page = (NetworkAPI.get_transactions_page_testnet if self.testnet
+                    else NetworkAPI.get_transactions_page)
+
+        entries, next_page = get_page(self.address, 0)
+        prefetcher = ThreadPoolExecutor(max_workers=1)
+
+        try:
+            while True:
+                # Fetch the next page while this one is consumed.
+                upcoming = (prefetcher.submit(get_page, self.address, next_page)
+                            if next_page is not None else None)
+
+                for txid, height in entries:
+                    if self._past(height):
+                        return
+                    if self._included(height):
+                        yield txid
+
+                if upcoming is None:
+                    return
+
+                entries, next_page = upcoming.result()
+        finally:
+            # Do not wait for a page no longer needed.
+            prefetcher.shutdown(wait=False)
+
+    def _txid_pages(self):
+        page = []
+
+        for txid in self._txids():
+            page.append(txid)
+            if len(page) == self.page_size:
+                yield page
+                page = []
+
+        if page:
+            yield page
+
+    def pages(self):
+        """Yields the history in lists of up to ``page_size`` transaction IDs
+        or, if ``hydrate`` is set, transactions.
+
+        :raises ConnectionError: If all API services fail.
+        """
+        if not self.hydrate:
+            yield from self._txid_pages()
+            return
+
+        get_transaction = (NetworkAPI.get_transaction_testnet if self.testnet
+                           else NetworkAPI.get_transaction)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for page in self._txid_pages():
+                yield list(executor.map(get_transaction, page))
+
+    def __iter__(self):
+        if not self.hydrate:
+            return self._txids()
+        return (tx for page in self.pages() for tx in page)
+
+    def __repr__(self):
+        return 'TransactionHistory({})'.format(repr(self.address))
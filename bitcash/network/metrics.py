@@ -0,0 +1,211 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+# Upper bounds in seconds of the latency histogram buckets.
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# The hooks receiving measurements. Replaced rather than changed, so that
+# they can be read without a lock, and empty unless a hook was added, so
+# that measuring costs nothing by default.
+HOOKS = ()
+
+_LOCK = threading.Lock()
+
+
+class MetricsHook:
+    """Receives measurements of :class:`~bitcash.network.NetworkAPI`. Every
+    method does nothing, so a hook only overrides what it needs. Methods may
+    be called from many threads at once.
+    """
+
+    def request(self, operation, provider, seconds, success):
+        """Called after each call to a service.
+
+        :param operation: The method of :class:`~bitcash.network.NetworkAPI`,
+                          e.g. ``'get_unspent'``.
+        :type operation: ``str``
+        :param provider: The service, e.g. ``'BitcoinDotComAPI'``.
+        :type provider: ``str``
+        :param seconds: How long the call took.
+        :type seconds: ``float``
+        :param success: Whether the call returned a result.
+        :type success: ``bool``
+        """
+
+    def fallback(self, operation, provider):
+        """Called when another service is asked because ``provider`` failed
+        or gave a rejected result.
+        """
+
+    def transferred(self, provider, sent, received):
+        """Called after each HTTP request to a service with the bytes of the
+        request body and of the response body, as far as they are known
+        without reading a streamed response.
+        """
+
+
+def add_metrics_hook(hook):
+    """Starts sending measurements to ``hook``.
+
+    :param hook: A :class:`~bitcash.network.metrics.MetricsHook`.
+    """
+    global HOOKS
+    with _LOCK:
+        HOOKS = HOOKS + (hook, )
+
+
+def remove_metrics_hook(hook):
+    """Stops sending measurements to ``hook``."""
+    global HOOKS
+    with _LOCK:
+        HOOKS = tuple(other for other in HOOKS if other is not hook)
+
+
+def provider_name(api_call):
+    """:returns: The name of the class of a service method, e.g.
+                 ``'BitcoreAPI'`` for ``BitcoreAPI.get_balance``.
+    """
+    name = getattr(api_call, '__qualname__', None) or repr(api_call)
+    return name.rpartition('.')[0] or name
+
+
+def emit_request(operation, provider, seconds, success):
+    for hook in HOOKS:
+        hook.request(operation, provider, seconds, success)
+
+
+def emit_fallback(operation, provider):
+    for hook in HOOKS:
+        hook.fallback(operation, provider)
+
+
+def emit_transferred(provider, sent, received):
+    for hook in HOOKS:
+        hook.transferred(provider, sent, received)
+
+
+def _labels(**labels):
+    return '{' + ','.join('{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                          for name, value in labels.items()) + '}'
+
+
+class MetricsAggregator(MetricsHook):
+    """Aggregates measurements in memory: latency histograms, success and
+    failure counts and fallbacks per operation and service, and bytes
+    transferred per service.
+
+    :param buckets: Upper bounds in seconds of the latency buckets.
+    :type buckets: ``tuple`` of ``float``
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forgets all measurements."""
+        with self._lock:
+            self._histograms = defaultdict(lambda: [0] * (len(self.buckets) + 1))
+            self._sums = defaultdict(float)
+            self._outcomes = defaultdict(int)
+            self._fallbacks = defaultdict(int)
+            self._sent = defaultdict(int)
+            self._received = defaultdict(int)
+
+    def request(self, operation, provider, seconds, success):
+        key = (operation, provider)
+        with self._lock:
+            self._histograms[key][bisect_left(self.buckets, seconds)] += 1
+            self._sums[key] += seconds
+            self._outcomes[key + ('success' if success else 'failure', )] += 1
+
+    def fallback(self, operation, provider):
+        with self._lock:
+            self._fallbacks[(operation, provider)] += 1
+
+    def transferred(self, provider, sent, received):
+        with self._lock:
+            self._sent[provider] += sent
+            self._received[provider] += received
+
+    def snapshot(self):
+        """Returns the measurements so far.
+
+        :returns: ``'requests'`` maps ``(operation, provider)`` to the
+                  ``count``, ``successes``, ``failures``, total ``seconds``
+                  and cumulative ``buckets`` of its calls. ``'fallbacks'``
+                  maps ``(operation, provider)`` to a count, ``'bytes_sent'``
+                  and ``'bytes_received'`` map providers to totals.
+        :rtype: ``dict``
+        """
+        with self._lock:
+            requests = {}
+            for key, counts in self._histograms.items():
+                cumulative = []
+                total = 0
+                for count in counts:
+                    total += count
+                    cumulative.append(total)
+
+                requests[key] = {
+                    'count': total,
+                    'successes': self._outcomes[key + ('success', )],
+                    'failures': self._outcomes[key + ('failure', )],
+                    'seconds': self._sums[key],
+                    'buckets': dict(zip(self.buckets + (float('inf'), ), cumulative)),
+                }
+
+            return {
+                'requests': requests,
+                'fallbacks': dict(self._fallbacks),
+                'bytes_sent': dict(self._sent),
+                'bytes_received': dict(self._received),
+            }
+
+    def to_prometheus(self, prefix='bitcash'):
+        """Formats the measurements in the Prometheus text exposition
+        format, e.g. to serve them to a scraper.
+
+        :param prefix: Prepended to the name of every metric.
+        :type prefix: ``str``
+        :rtype: ``str``
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        name = prefix + '_request_duration_seconds'
+        lines.append('# HELP {} Time taken by calls to services.'.format(name))
+        lines.append('# TYPE {} histogram'.format(name))
+        for (operation, provider), stats in sorted(snapshot['requests'].items()):
+            for bound, count in stats['buckets'].items():
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                lines.append('{}_bucket{} {}'.format(
+                    name, _labels(operation=operation, provider=provider, le=le), count))
+            labels = _labels(operation=operation, provider=provider)
+            lines.append('{}_sum{} {!r}'.format(name, labels, stats['seconds']))
+            lines.append('{}_count{} {}'.format(name, labels, stats['count']))
+
+        name = prefix + '_requests_total'
+        lines.append('# HELP {} Calls to services by outcome.'.format(name))
+        lines.append('# TYPE {} counter'.format(name))
+        for (operation, provider), stats in sorted(snapshot['requests'].items()):
+            for outcome, count in (('success', stats['successes']), ('failure', stats['failures'])):
+                lines.append('{}{} {}'.format(name, _labels(
+                    operation=operation, provider=provider, outcome=outcome), count))
+
+        name = prefix + '_fallbacks_total'
+        lines.append('# HELP {} Times the next service was asked after one failed.'.format(name))
+        lines.append('# TYPE {} counter'.format(name))
+        for (operation, provider), count in sorted(snapshot['fallbacks'].items()):
+            lines.append('{}{} {}'.format(name, _labels(operation=operation, provider=provider), count))
+
+        for direction in ('sent', 'received'):
+            name = '{}_bytes_{}_total'.format(prefix, direction)
+            lines.append('# HELP {} Bytes {} in bodies of requests to services.'.format(name, direction))
+            lines.append('# TYPE {} counter'.format(name))
+            for provider, count in sorted(snapshot['bytes_' + direction].items()):
+                lines.append('{}{} {}'.format(name, _labels(provider=provider), count))
+
+        return '\n'.join(lines) + '\n'
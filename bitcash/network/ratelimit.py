@@ -0,0 +1,289 @@
+import heapq
+import itertools
+import threading
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from time import monotonic, time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError
+
+from bitcash.network import metrics
+
+# Priorities of requests waiting for a provider, served lowest first.
+INTERACTIVE = 0
+NORMAL = 1
+BULK = 2
+
+# Lookups a user is waiting for go first, background syncs last.
+OPERATION_PRIORITIES = {
+    'broadcast_tx': INTERACTIVE,
+    'broadcast_tx_testnet': INTERACTIVE,
+    'get_balance': INTERACTIVE,
+    'get_balance_testnet': INTERACTIVE,
+    'get_unspent': INTERACTIVE,
+    'get_unspent_testnet': INTERACTIVE,
+    'iter_unspent': INTERACTIVE,
+    'iter_unspent_testnet': INTERACTIVE,
+    'get_unspent_bulk': BULK,
+    'get_unspent_bulk_testnet': BULK,
+    'get_transactions_page': BULK,
+    'get_transactions_page_testnet': BULK,
+}
+
+# Requests per second and burst size of each provider. Providers not listed
+# are not limited.
+DEFAULT_QUOTAS = {
+    'BitcoinDotComAPI': (1, 60),
+    'BitcoreAPI': (10, 20),
+}
+
+# Longest a request waits for its turn before the next provider is asked
+# instead, and longest a rate limited request waits to be sent again.
+DEFAULT_MAX_WAIT = 5
+
+# Seconds a provider is paused after a 429 without a Retry-After header.
+DEFAULT_RETRY_AFTER = 1
+
+_RATE_LIMITERS = {}
+_LOCK = threading.Lock()
+_local = threading.local()
+
+
+class RateLimited(requests.exceptions.RequestException):
+    """Raised when a request would wait too long for its turn. As a
+    ``RequestException``, :class:`~bitcash.network.NetworkAPI` then asks the
+    next provider.
+    """
+
+
+class RateLimiter:
+    """A token bucket that paces requests to one provider. Requests wait in
+    a queue for their turn, higher priorities first and otherwise in order
+    of arrival.
+
+    :param rate: Requests per second.
+    :type rate: ``float``
+    :param burst: Requests that may be sent at once after a quiet period.
+    :type burst: ``int``
+    :param max_wait: Seconds a request may wait before :class:`RateLimited`
+                     is raised.
+    :type max_wait: ``float``
+    """
+
+    def __init__(self, rate, burst=1, max_wait=DEFAULT_MAX_WAIT):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self._tokens = burst
+        self._updated = monotonic()
+        self._paused_until = 0
+        self._queue = []
+        self._tickets = itertools.count()
+        self._condition = threading.Condition()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority=NORMAL):
+        """Waits until a request may be sent.
+
+        :param priority: :data:`INTERACTIVE`, :data:`NORMAL` or :data:`BULK`.
+        :type priority: ``int``
+        :raises RateLimited: If the request would wait longer than
+                             ``max_wait``.
+        """
+        ticket = (priority, next(self._tickets))
+
+        with self._condition:
+            heapq.heappush(self._queue, ticket)
+            deadline = monotonic() + self.max_wait
+
+            try:
+                while True:
+                    now = monotonic()
+                    self._refill(now)
+
+                    if self._queue[0] == ticket:
+                        delay = max(self._paused_until - now, 0)
+                        if not delay and self._tokens >= 1:
+                            self._tokens -= 1
+                            return
+                        delay = delay or (1 - self._tokens) / self.rate
+
+                        # Do not wait only to give up.
+                        if now + delay > deadline:
+                            raise RateLimited('Rate limit would delay the request by '
+                                              '{:.1f} seconds.'.format(delay))
+                    else:
+                        delay = deadline - now
+                        if delay <= 0:
+                            raise RateLimited('Too many requests waiting for their turn.')
+
+                    self._condition.wait(delay)
+            finally:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._condition.notify_all()
+
+    def pause(self, seconds):
+        """Sends no request for ``seconds``, e.g. as the provider asked with
+        ``Retry-After``.
+        """
+        with self._condition:
+            self._paused_until = max(self._paused_until, monotonic() + seconds)
+            self._tokens = 0
+            self._condition.notify_all()
+
+    def waiting(self):
+        """:returns: The number of requests waiting for their turn."""
+        with self._condition:
+            return len(self._queue)
+
+
+def get_rate_limiter(provider):
+    """Returns the rate limiter of a provider, creating it from
+    :data:`DEFAULT_QUOTAS` on first use.
+
+    :param provider: The name of the provider, e.g. ``'BitcoinDotComAPI'``.
+    :type provider: ``str``
+    :returns: The limiter, or ``None`` if the provider is not limited.
+    :rtype: :class:`~bitcash.network.ratelimit.RateLimiter`
+    """
+    with _LOCK:
+        if provider not in _RATE_LIMITERS:
+            quota = DEFAULT_QUOTAS.get(provider)
+            _RATE_LIMITERS[provider] = RateLimiter(*quota) if quota else None
+        return _RATE_LIMITERS[provider]
+
+
+def set_rate_limit(provider, rate, burst=1, max_wait=DEFAULT_MAX_WAIT):
+    """Sets the quota of a provider.
+
+    :param provider: The name of the provider, e.g. ``'BitcoreAPI'``.
+    :type provider: ``str``
+    :param rate: Requests per second, or ``None`` to not limit the provider.
+    :type rate: ``float``
+    :param burst: Requests that may be sent at once after a quiet period.
+    :type burst: ``int``
+    :param max_wait: Seconds a request may wait for its turn before the next
+                     provider is asked instead.
+    :type max_wait: ``float``
+    """
+    with _LOCK:
+        _RATE_LIMITERS[provider] = RateLimiter(rate, burst, max_wait) if rate else None
+
+
+@contextmanager
+def priority(level):
+    """Sends the requests of the current thread within the ``with`` block at
+    ``level``, e.g. :data:`BULK` for a background sync.
+    """
+    previous = getattr(_local, 'priority', None)
+    _local.priority = level
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+def get_priority(operation=None):
+    """:returns: The priority of the current thread, or else of the
+                 operation.
+    """
+    level = getattr(_local, 'priority', None)
+    if level is not None:
+        return level
+    return OPERATION_PRIORITIES.get(operation, NORMAL)
+
+
+def parse_retry_after(value):
+    """:returns: Seconds to wait as stated by a ``Retry-After`` header, or
+                 ``None`` if it cannot be parsed.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """Sends the requests of a provider through its rate limiter. A 429
+    pauses the provider for as long as ``Retry-After`` asks, and the request
+    is sent once more if that is within ``max_wait``. Error responses are
+    retried here rather than by urllib3, so that every retry waits for its
+    turn like the first request. The bytes transferred are reported to
+    :mod:`~bitcash.network.metrics` hooks.
+
+    :param provider: The name of the provider.
+    :type provider: ``str``
+    """
+    __attrs__ = HTTPAdapter.__attrs__ + ['provider', 'status_retries']
+
+    def __init__(self, provider, *args, **kwargs):
+        self.provider = provider
+        super().__init__(*args, **kwargs)
+
+        # urllib3 only retries requests that did not reach the provider.
+        self.status_retries = self.max_retries
+        self.max_retries = self.max_retries.new(read=0, status_forcelist=None)
+
+    def send(self, request, **kwargs):
+        response = self._send_limited(get_rate_limiter(self.provider), request, **kwargs)
+
+        if metrics.HOOKS:
+            metrics.emit_transferred(self.provider, len(request.body or b''),
+                                     _received(response, kwargs.get('stream')))
+
+        return response
+
+    def _send_limited(self, limiter, request, **kwargs):
+        level = get_priority()
+        retries = self.status_retries
+        paused = False
+
+        if limiter is not None:
+            limiter.acquire(level)
+        response = super().send(request, **kwargs)
+
+        while True:
+            if response.status_code == 429 and limiter is not None and not paused:
+                delay = parse_retry_after(response.headers.get('Retry-After'))
+                limiter.pause(DEFAULT_RETRY_AFTER if delay is None else delay)
+                paused = True
+            elif retries.is_retry(request.method, response.status_code):
+                try:
+                    retries = retries.increment(request.method, request.url)
+                except MaxRetryError:
+                    return response
+                retries.sleep()
+            else:
+                return response
+
+            if limiter is not None:
+                try:
+                    limiter.acquire(level)
+                except RateLimited:
+                    return response
+
+            response.close()
+            response = super().send(request, **kwargs)
+
+
+def _received(response, stream):
+    length = response.headers.get('Content-Length')
+    if length is not None and length.isdigit():
+        return int(length)
+
+    # Reading a streamed body here would defeat streaming.
+    return 0 if stream else len(response.content)
@@ -5,6 +5,8 @@ from time import time
 
 import requests
 
+from bitcash.network.coalesce import coalesce
+from bitcash.network.sessions import get_session
 from bitcash.utils import Decimal
 
 DEFAULT_CACHE_TIME = 60
@@ -125,7 +127,7 @@ class BitpayRates:
     def currency_to_satoshi(cls, currency):
         headers = {"x-accept-version": "2.0.0",
                    "Accept": "application/json"}
-        r = requests.get(cls.SINGLE_RATE + currency, headers=headers)
+        r = get_session(cls.__name__).get(cls.SINGLE_RATE + currency, headers=headers)
         r.raise_for_status()
         rate = r.json()['data']['rate']
         return int(ONE / Decimal(rate) * BCH)
@@ -251,7 +253,7 @@ class LivecoinRates:
 
     @classmethod
     def currency_to_satoshi(cls, currency):
-        r = requests.get(cls.SINGLE_RATE.format(currency))
+        r = get_session(cls.__name__).get(cls.SINGLE_RATE.format(currency))
         if r.status_code != 200:
             raise requests.exceptions.ConnectionError
         rate = r.json()['last']
@@ -687,6 +689,15 @@ def currency_to_satoshi_local_cache(f):
         (currency, CachedRate(None, start_time)) for currency in EXCHANGE_RATES.keys()
     ])
 
+    def refresh(cached_rate, currency):
+        # Another thread may have refreshed the rate since this one found it
+        # expired, without this one joining its request.
+        if cached_rate.satoshis and time() - cached_rate.last_update <= DEFAULT_CACHE_TIME:
+            return
+
+        cached_rate.satoshis = EXCHANGE_RATES[currency]()
+        cached_rate.last_update = time()
+
     @wraps(f)
     def wrapper(amount, currency):
         now = time()
@@ -694,8 +705,8 @@ def currency_to_satoshi_local_cache(f):
         cached_rate = cached_rates[currency]
 
         if not cached_rate.satoshis or now - cached_rate.last_update > DEFAULT_CACHE_TIME:
-            cached_rate.satoshis = EXCHANGE_RATES[currency]()
-            cached_rate.last_update = now
+            # Threads finding the rate expired at once share one refresh.
+            coalesce(('currency_to_satoshi', currency), refresh, cached_rate, currency)
 
         return int(cached_rate.satoshis * Decimal(amount))
 
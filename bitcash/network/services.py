@@ -1,10 +1,18 @@
 import logging
+import sys
+from itertools import chain
 
 import requests
 from decimal import Decimal
 
+from bitcash.format import decode_address
 from bitcash.network import currency_to_satoshi
+from bitcash.network.cache import forever, mutable, network_cache, until_confirmed
+from bitcash.network.coalesce import coalesce
+from bitcash.network.dispatch import dispatch
 from bitcash.network.meta import Unspent
+from bitcash.network.sessions import get_session
+from bitcash.network.stream import CHUNK_SIZE, iter_json_array
 from bitcash.network.transaction import Transaction, TxPart
 
 DEFAULT_TIMEOUT = 30
@@ -17,6 +25,13 @@ def set_service_timeout(seconds):
     DEFAULT_TIMEOUT = seconds
 
 
+def _address_script(address):
+    decoded = decode_address(address)
+    if decoded.type == 'P2SH':
+        return 'a914' + decoded.hash.hex() + '87'
+    return '76a914' + decoded.hash.hex() + '88ac'
+
+
 class InsightAPI:
     MAIN_ENDPOINT = ''
     MAIN_ADDRESS_API = ''
@@ -29,21 +44,21 @@ class InsightAPI:
 
     @classmethod
     def get_balance(cls, address):
-        r = requests.get(cls.MAIN_BALANCE_API.format(
+        r = get_session(cls.__name__).get(cls.MAIN_BALANCE_API.format(
             address), timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         return r.json()
 
     @classmethod
     def get_transactions(cls, address):
-        r = requests.get(cls.MAIN_ADDRESS_API.format(
+        r = get_session(cls.__name__).get(cls.MAIN_ADDRESS_API.format(
             address), timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         return r.json()['transactions']
 
     @classmethod
     def get_tx_amount(cls, txid, txindex):
-        r = requests.get(cls.MAIN_TX_AMOUNT_API.format(
+        r = get_session(cls.__name__).get(cls.MAIN_TX_AMOUNT_API.format(
             txid), timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         response = r.json(parse_float=Decimal)
@@ -51,7 +66,7 @@ class InsightAPI:
 
     @classmethod
     def get_unspent(cls, address):
-        r = requests.get(cls.MAIN_UNSPENT_API.format(
+        r = get_session(cls.__name__).get(cls.MAIN_UNSPENT_API.format(
             address), timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         return [
@@ -65,7 +80,7 @@ class InsightAPI:
 
     @classmethod
     def broadcast_tx(cls, tx_hex):  # pragma: no cover
-        r = requests.post(cls.MAIN_TX_PUSH_API, json={
+        r = get_session(cls.__name__).post(cls.MAIN_TX_PUSH_API, json={
                           cls.TX_PUSH_PARAM: tx_hex, 'network': 'mainnet', 'coin': 'BCH'}, timeout=DEFAULT_TIMEOUT)
         return True if r.status_code == 200 else False
 
@@ -74,7 +89,9 @@ class BitcoinDotComAPI():
     """ rest.bitcoin.com API """
     MAIN_ENDPOINT = 'https://rest.bitcoin.com/v2/'
     MAIN_ADDRESS_API = MAIN_ENDPOINT + 'address/details/{}'
+    MAIN_HISTORY_API = MAIN_ENDPOINT + 'address/transactions/{}?page={}'
     MAIN_UNSPENT_API = MAIN_ENDPOINT + 'address/utxo/{}'
+    MAIN_BULK_UNSPENT_API = MAIN_ENDPOINT + 'address/utxo'
     MAIN_TX_PUSH_API = MAIN_ENDPOINT + 'rawtransactions/sendRawTransaction/{}'
     MAIN_TX_API = MAIN_ENDPOINT + 'transaction/details/{}'
     MAIN_TX_AMOUNT_API = MAIN_TX_API
@@ -82,15 +99,20 @@ class BitcoinDotComAPI():
     TX_PUSH_PARAM = 'rawtx'
     TEST_ENDPOINT = 'https://trest.bitcoin.com/v2/'
     TEST_ADDRESS_API = TEST_ENDPOINT + 'address/details/{}'
+    TEST_HISTORY_API = TEST_ENDPOINT + 'address/transactions/{}?page={}'
     TEST_UNSPENT_API = TEST_ENDPOINT + 'address/utxo/{}'
+    TEST_BULK_UNSPENT_API = TEST_ENDPOINT + 'address/utxo'
     TEST_TX_PUSH_API = TEST_ENDPOINT + 'rawtransactions/sendRawTransaction/{}'
     TEST_TX_API = TEST_ENDPOINT + 'transaction/details/{}'
     TEST_TX_AMOUNT_API = TEST_TX_API
     TEST_RAW_API = TEST_ENDPOINT + 'transaction/details/{}'
 
+    # Most addresses accepted by one bulk request.
+    BULK_LIMIT = 20
+
     @classmethod
     def get_balance(cls, address):
-        r = requests.get(cls.MAIN_ADDRESS_API.format(address),
+        r = get_session(cls.__name__).get(cls.MAIN_ADDRESS_API.format(address),
                          timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         data = r.json()
@@ -99,7 +121,7 @@ class BitcoinDotComAPI():
 
     @classmethod
     def get_balance_testnet(cls, address):
-        r = requests.get(cls.TEST_ADDRESS_API.format(address),
+        r = get_session(cls.__name__).get(cls.TEST_ADDRESS_API.format(address),
                          timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         data = r.json()
@@ -108,58 +130,146 @@ class BitcoinDotComAPI():
 
     @classmethod
     def get_transactions(cls, address):
-        r = requests.get(cls.MAIN_ADDRESS_API.format(address),
+        r = get_session(cls.__name__).get(cls.MAIN_ADDRESS_API.format(address),
                          timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         return r.json()['transactions']
 
     @classmethod
     def get_transactions_testnet(cls, address):
-        r = requests.get(cls.TEST_ADDRESS_API.format(address),
+        r = get_session(cls.__name__).get(cls.TEST_ADDRESS_API.format(address),
                          timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         return r.json()['transactions']
 
+    @classmethod
+    def get_transactions_page(cls, address, page):
+        return cls._get_transactions_page(cls.MAIN_HISTORY_API, address, page)
+
+    @classmethod
+    def get_transactions_page_testnet(cls, address, page):
+        return cls._get_transactions_page(cls.TEST_HISTORY_API, address, page)
+
+    @classmethod
+    def _get_transactions_page(cls, url, address, page):
+        r = get_session(cls.__name__).get(url.format(address, page),
+                         timeout=DEFAULT_TIMEOUT)
+        r.raise_for_status()  # pragma: no cover
+        response = r.json()
+
+        # Unconfirmed transactions have no height, listed first.
+        entries = [
+            (tx['txid'], tx['blockheight'] if tx.get('blockheight', -1) > 0 else None)
+            for tx in response['txs']
+        ]
+        next_page = page + 1 if page + 1 < response['pagesTotal'] else None
+
+        return entries, next_page
+
     @classmethod
     def get_transaction(cls, txid):
-        r = requests.get(cls.MAIN_TX_API.format(txid),
+        r = get_session(cls.__name__).get(cls.MAIN_TX_API.format(txid),
                          timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
+        return cls._parse_transaction(r.json(parse_float=Decimal))
+
+    @classmethod
+    def get_transaction_testnet(cls, txid):
+        r = get_session(cls.__name__).get(cls.TEST_TX_API.format(txid),
+                         timeout=DEFAULT_TIMEOUT)
+        r.raise_for_status()  # pragma: no cover
+        return cls._parse_transaction(r.json(parse_float=Decimal))
+
+    @classmethod
+    def get_tx_amount(cls, txid, txindex):
+        r = get_session(cls.__name__).get(cls.MAIN_TX_AMOUNT_API.format(
+            txid), timeout=DEFAULT_TIMEOUT)
+        r.raise_for_status()  # pragma: no cover
         response = r.json(parse_float=Decimal)
+        return (Decimal(response['vout'][txindex]['value']) * BCH_TO_SAT_MULTIPLIER).normalize()
 
-        tx = Transaction(response['txid'], response['blockheight'],
-                         (Decimal(response['valueIn']) *
-                          BCH_TO_SAT_MULTIPLIER).normalize(),
-                         (Decimal(response['valueOut']) *
-                          BCH_TO_SAT_MULTIPLIER).normalize(),
-                         (Decimal(response['fees']) * BCH_TO_SAT_MULTIPLIER).normalize())
+    @classmethod
+    def get_unspent(cls, address):
+        r = get_session(cls.__name__).get(cls.MAIN_UNSPENT_API.format(address),
+                         timeout=DEFAULT_TIMEOUT)
+        r.raise_for_status()  # pragma: no cover
+        return cls._parse_unspent(r.json())
 
-        for txin in response['vin']:
-            part = TxPart(txin['cashAddress'],
-                          txin['value'],
-                          txin['scriptSig']['asm'])
-            tx.add_input(part)
+    @classmethod
+    def get_unspent_testnet(cls, address):
+        r = get_session(cls.__name__).get(cls.TEST_UNSPENT_API.format(address),
+                         timeout=DEFAULT_TIMEOUT)
+        r.raise_for_status()  # pragma: no cover
+        return cls._parse_unspent(r.json())
 
-        for txout in response['vout']:
-            addr = None
-            if 'cashAddrs' in txout['scriptPubKey'] and txout['scriptPubKey']['cashAddrs'] is not None:
-                addr = txout['scriptPubKey']['cashAddrs'][0]
+    @classmethod
+    def iter_unspent(cls, address):
+        return cls._iter_unspent(cls.MAIN_UNSPENT_API, address)
 
-            part = TxPart(addr,
-                          (Decimal(txout['value']) *
-                           BCH_TO_SAT_MULTIPLIER).normalize(),
-                          txout['scriptPubKey']['asm'])
-            tx.add_output(part)
+    @classmethod
+    def iter_unspent_testnet(cls, address):
+        return cls._iter_unspent(cls.TEST_UNSPENT_API, address)
 
-        return tx
+    @classmethod
+    def _iter_unspent(cls, url, address):
+        r = get_session(cls.__name__).get(url.format(address),
+                         timeout=DEFAULT_TIMEOUT, stream=True)
+        r.raise_for_status()  # pragma: no cover
+
+        # All unspents of an address share its script, which the response
+        # only states after them.
+        script = sys.intern(_address_script(address))
+
+        with r:
+            for tx in iter_json_array(r.iter_content(CHUNK_SIZE), 'utxos'):
+                yield Unspent(currency_to_satoshi(tx['amount'], 'bch'),
+                              tx['confirmations'],
+                              script,
+                              tx['txid'],
+                              tx['vout'])
 
     @classmethod
-    def get_transaction_testnet(cls, txid):
-        r = requests.get(cls.TEST_TX_API.format(txid),
-                         timeout=DEFAULT_TIMEOUT)
+    def get_unspent_bulk(cls, addresses):
+        return cls._get_unspent_bulk(cls.MAIN_BULK_UNSPENT_API, addresses)
+
+    @classmethod
+    def get_unspent_bulk_testnet(cls, addresses):
+        return cls._get_unspent_bulk(cls.TEST_BULK_UNSPENT_API, addresses)
+
+    @classmethod
+    def _get_unspent_bulk(cls, url, addresses):
+        unspents = {}
+
+        for i in range(0, len(addresses), cls.BULK_LIMIT):
+            chunk = addresses[i:i + cls.BULK_LIMIT]
+            r = get_session(cls.__name__).post(url, json={'addresses': chunk},
+                              timeout=DEFAULT_TIMEOUT)
+            r.raise_for_status()  # pragma: no cover
+
+            # Results are in the order of the requested addresses.
+            for address, response in zip(chunk, r.json()):
+                unspents[address] = cls._parse_unspent(response)
+
+        return unspents
+
+    @classmethod
+    def get_raw_transaction(cls, txid):
+        r = get_session(cls.__name__).get(cls.MAIN_RAW_API.format(
+            txid), timeout=DEFAULT_TIMEOUT)
+        r.raise_for_status()  # pragma: no cover
+        response = r.json(parse_float=Decimal)
+        return response
+
+    @classmethod
+    def get_raw_transaction_testnet(cls, txid):
+        r = get_session(cls.__name__).get(cls.TEST_RAW_API.format(
+            txid), timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         response = r.json(parse_float=Decimal)
+        return response
 
+    @classmethod
+    def _parse_transaction(cls, response):
         tx = Transaction(response['txid'], response['blockheight'],
                          (Decimal(response['valueIn']) *
                           BCH_TO_SAT_MULTIPLIER).normalize(),
@@ -187,65 +297,24 @@ class BitcoinDotComAPI():
         return tx
 
     @classmethod
-    def get_tx_amount(cls, txid, txindex):
-        r = requests.get(cls.MAIN_TX_AMOUNT_API.format(
-            txid), timeout=DEFAULT_TIMEOUT)
-        r.raise_for_status()  # pragma: no cover
-        response = r.json(parse_float=Decimal)
-        return (Decimal(response['vout'][txindex]['value']) * BCH_TO_SAT_MULTIPLIER).normalize()
-
-    @classmethod
-    def get_unspent(cls, address):
-        r = requests.get(cls.MAIN_UNSPENT_API.format(address),
-                         timeout=DEFAULT_TIMEOUT)
-        r.raise_for_status()  # pragma: no cover
+    def _parse_unspent(cls, response):
         return [
             Unspent(currency_to_satoshi(tx['amount'], 'bch'),
                     tx['confirmations'],
-                    r.json()['scriptPubKey'],
+                    response['scriptPubKey'],
                     tx['txid'],
                     tx['vout'])
-            for tx in r.json()['utxos']
+            for tx in response['utxos']
         ]
 
-    @classmethod
-    def get_unspent_testnet(cls, address):
-        r = requests.get(cls.TEST_UNSPENT_API.format(address),
-                         timeout=DEFAULT_TIMEOUT)
-        r.raise_for_status()  # pragma: no cover
-        return [
-            Unspent(currency_to_satoshi(tx['amount'], 'bch'),
-                    tx['confirmations'],
-                    r.json()['scriptPubKey'],
-                    tx['txid'],
-                    tx['vout'])
-            for tx in r.json()['utxos']
-        ]
-
-    @classmethod
-    def get_raw_transaction(cls, txid):
-        r = requests.get(cls.MAIN_RAW_API.format(
-            txid), timeout=DEFAULT_TIMEOUT)
-        r.raise_for_status()  # pragma: no cover
-        response = r.json(parse_float=Decimal)
-        return response
-
-    @classmethod
-    def get_raw_transaction_testnet(cls, txid):
-        r = requests.get(cls.TEST_RAW_API.format(
-            txid), timeout=DEFAULT_TIMEOUT)
-        r.raise_for_status()  # pragma: no cover
-        response = r.json(parse_float=Decimal)
-        return response
-
     @classmethod
     def broadcast_tx(cls, tx_hex):  # pragma: no cover
-        r = requests.get(cls.MAIN_TX_PUSH_API.format(tx_hex))
+        r = get_session(cls.__name__).get(cls.MAIN_TX_PUSH_API.format(tx_hex))
         return True if r.status_code == 200 else False
 
     @classmethod
     def broadcast_tx_testnet(cls, tx_hex):  # pragma: no cover
-        r = requests.get(cls.TEST_TX_PUSH_API.format(tx_hex))
+        r = get_session(cls.__name__).get(cls.TEST_TX_PUSH_API.format(tx_hex))
         return True if r.status_code == 200 else False
 
 
@@ -270,36 +339,29 @@ class BitcoreAPI(InsightAPI):
     @classmethod
     def get_unspent(cls, address):
         address = address.replace('bitcoincash:', '')
-        r = requests.get(cls.MAIN_UNSPENT_API.format(
+        r = get_session(cls.__name__).get(cls.MAIN_UNSPENT_API.format(
             address), timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
-        return [
-            Unspent(currency_to_satoshi(tx['value'], 'satoshi'),
-                    tx['confirmations'],
-                    tx['script'],
-                    tx['mintTxid'],
-                    tx['mintIndex'])
-            for tx in r.json()
-        ]
+        return cls._parse_unspent(r.json())
 
     @classmethod
     def get_transactions(cls, address):
         address = address.replace('bitcoincash:', '')
-        r = requests.get(cls.MAIN_ADDRESS_API.format(
+        r = get_session(cls.__name__).get(cls.MAIN_ADDRESS_API.format(
             address), timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         return [tx['mintTxid'] for tx in r.json()]
 
     @classmethod
     def get_balance(cls, address):
-        r = requests.get(cls.MAIN_BALANCE_API.format(
+        r = get_session(cls.__name__).get(cls.MAIN_BALANCE_API.format(
             address), timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         return r.json()['balance']
 
     @classmethod
     def get_balance_testnet(cls, address):
-        r = requests.get(cls.TEST_BALANCE_API.format(
+        r = get_session(cls.__name__).get(cls.TEST_BALANCE_API.format(
             address), timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         return r.json()['balance']
@@ -307,14 +369,14 @@ class BitcoreAPI(InsightAPI):
     @classmethod
     def get_transactions_testnet(cls, address):
         address = address.replace('bchtest:', '')
-        r = requests.get(cls.TEST_ADDRESS_API.format(
+        r = get_session(cls.__name__).get(cls.TEST_ADDRESS_API.format(
             address), timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         return [tx['mintTxid'] for tx in r.json()]
 
     @classmethod
     def get_tx_amount_testnet(cls, txid, txindex):
-        r = requests.get(cls.TEST_TX_AMOUNT_API.format(
+        r = get_session(cls.__name__).get(cls.TEST_TX_AMOUNT_API.format(
             txid), timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         response = r.json(parse_float=Decimal)
@@ -324,11 +386,59 @@ class BitcoreAPI(InsightAPI):
     @classmethod
     def get_unspent_testnet(cls, address):
         address = address.replace('bchtest:', '')
-        r = requests.get(cls.TEST_UNSPENT_API.format(
+        r = get_session(cls.__name__).get(cls.TEST_UNSPENT_API.format(
             address), timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
+        return cls._parse_unspent_testnet(r.json())
+
+    @classmethod
+    def iter_unspent(cls, address):
+        address = address.replace('bitcoincash:', '')
+        r = get_session(cls.__name__).get(cls.MAIN_UNSPENT_API.format(
+            address), timeout=DEFAULT_TIMEOUT, stream=True)
+        r.raise_for_status()  # pragma: no cover
+
+        with r:
+            for tx in iter_json_array(r.iter_content(CHUNK_SIZE)):
+                yield Unspent(currency_to_satoshi(tx['value'], 'satoshi'),
+                              tx['confirmations'],
+                              sys.intern(tx['script']),
+                              tx['mintTxid'],
+                              tx['mintIndex'])
+
+    @classmethod
+    def iter_unspent_testnet(cls, address):
+        address = address.replace('bchtest:', '')
+        r = get_session(cls.__name__).get(cls.TEST_UNSPENT_API.format(
+            address), timeout=DEFAULT_TIMEOUT, stream=True)
+        r.raise_for_status()  # pragma: no cover
+
+        with r:
+            for tx in iter_json_array(r.iter_content(CHUNK_SIZE)):
+                if 'script' in tx:
+                    yield Unspent(currency_to_satoshi(tx['value'], 'satoshi'),
+                                  tx['confirmations'],
+                                  sys.intern(tx['script']),
+                                  tx['mintTxid'],
+                                  tx['mintIndex'])
+                else:
+                    logging.warning('Unspent without scriptPubKey.')
+
+    @classmethod
+    def _parse_unspent(cls, response):
+        return [
+            Unspent(currency_to_satoshi(tx['value'], 'satoshi'),
+                    tx['confirmations'],
+                    tx['script'],
+                    tx['mintTxid'],
+                    tx['mintIndex'])
+            for tx in response
+        ]
+
+    @classmethod
+    def _parse_unspent_testnet(cls, response):
         unspents = []
-        for tx in r.json():
+        for tx in response:
             # In weird conditions, the API will send back unspents
             # without a scriptPubKey.
             if 'script' in tx:
@@ -346,13 +456,42 @@ class BitcoreAPI(InsightAPI):
 
     @classmethod
     def broadcast_tx_testnet(cls, tx_hex):  # pragma: no cover
-        r = requests.post(cls.TEST_TX_PUSH_API, json={
+        r = get_session(cls.__name__).post(cls.TEST_TX_PUSH_API, json={
                           cls.TX_PUSH_PARAM: tx_hex,
                           'network': 'testnet',
                           'coin': 'BCH'}, timeout=DEFAULT_TIMEOUT)
         return True if r.status_code == 200 else False
 
 
+class _FirstItem:
+    """Calls a streaming service and waits for its first item, so that it is
+    ordered, timed and rate limited by
+    :func:`~bitcash.network.dispatch.dispatch` like other services, which
+    moves on to the next service if it fails before sending data. Equal to
+    the service, so that its health is recorded under the service.
+    """
+
+    def __init__(self, api_call):
+        self.api_call = api_call
+        self.__qualname__ = getattr(api_call, '__qualname__', None) or repr(api_call)
+
+    def __call__(self, *args):
+        items = self.api_call(*args)
+
+        try:
+            first = next(items)
+        except StopIteration:
+            return iter(())
+
+        return chain((first, ), items)
+
+    def __eq__(self, other):
+        return self.api_call == getattr(other, 'api_call', other)
+
+    def __hash__(self):
+        return hash(self.api_call)
+
+
 class NetworkAPI:
     IGNORED_ERRORS = (
         requests.exceptions.RequestException,
@@ -382,6 +521,10 @@ class NetworkAPI:
     GET_TX_AMOUNT_MAIN = [BitcoinDotComAPI.get_tx_amount,
                           BitcoreAPI.get_tx_amount]
     GET_RAW_TX_MAIN = [BitcoinDotComAPI.get_raw_transaction]
+    GET_UNSPENT_BULK_MAIN = [BitcoinDotComAPI.get_unspent_bulk]
+    GET_TRANSACTIONS_PAGE_MAIN = [BitcoinDotComAPI.get_transactions_page]
+    ITER_UNSPENT_MAIN = [BitcoinDotComAPI.iter_unspent,
+                         BitcoreAPI.iter_unspent]
 
     # Testnet
     GET_BALANCE_TEST = [BitcoreAPI.get_balance_testnet,
@@ -394,8 +537,23 @@ class NetworkAPI:
     GET_TX_TEST = [BitcoinDotComAPI.get_transaction_testnet]
     GET_TX_AMOUNT_TEST = [BitcoreAPI.get_tx_amount_testnet]
     GET_RAW_TX_TEST = [BitcoinDotComAPI.get_raw_transaction_testnet]
+    GET_UNSPENT_BULK_TEST = [BitcoinDotComAPI.get_unspent_bulk_testnet]
+    GET_TRANSACTIONS_PAGE_TEST = [BitcoinDotComAPI.get_transactions_page_testnet]
+    ITER_UNSPENT_TEST = [BitcoreAPI.iter_unspent_testnet,
+                         BitcoinDotComAPI.iter_unspent_testnet]
+
+    # Most addresses accepted by one bulk request of any of the services.
+    BULK_LIMIT = min(api_call.__self__.BULK_LIMIT
+                     for api_call in GET_UNSPENT_BULK_MAIN + GET_UNSPENT_BULK_TEST)
 
     @classmethod
+    def _dispatch(cls, operation, api_calls, *args, accept=None):
+        # Concurrent identical requests share one in flight.
+        return coalesce((operation, ) + args, dispatch, operation, api_calls, args,
+                        cls.IGNORED_ERRORS, accept)
+
+    @classmethod
+    @network_cache('get_balance', mutable)
     def get_balance(cls, address):
         """Gets the balance of an address in satoshi.
 
@@ -404,16 +562,10 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``int``
         """
-
-        for api_call in cls.GET_BALANCE_MAIN:
-            try:
-                return api_call(address)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._dispatch('get_balance', cls.GET_BALANCE_MAIN, address)
 
     @classmethod
+    @network_cache('get_balance_testnet', mutable)
     def get_balance_testnet(cls, address):
         """Gets the balance of an address on the test network in satoshi.
 
@@ -422,16 +574,10 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``int``
         """
-
-        for api_call in cls.GET_BALANCE_TEST:
-            try:
-                return api_call(address)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._dispatch('get_balance_testnet', cls.GET_BALANCE_TEST, address)
 
     @classmethod
+    @network_cache('get_transactions', mutable)
     def get_transactions(cls, address):
         """Gets the ID of all transactions related to an address.
 
@@ -440,16 +586,10 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``list`` of ``str``
         """
-
-        for api_call in cls.GET_TRANSACTIONS_MAIN:
-            try:
-                return api_call(address)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._dispatch('get_transactions', cls.GET_TRANSACTIONS_MAIN, address)
 
     @classmethod
+    @network_cache('get_transactions_testnet', mutable)
     def get_transactions_testnet(cls, address):
         """Gets the ID of all transactions related to an address on the test
         network.
@@ -459,16 +599,41 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``list`` of ``str``
         """
+        return cls._dispatch('get_transactions_testnet', cls.GET_TRANSACTIONS_TEST, address)
 
-        for api_call in cls.GET_TRANSACTIONS_TEST:
-            try:
-                return api_call(address)
-            except cls.IGNORED_ERRORS:
-                pass
+    @classmethod
+    def get_transactions_page(cls, address, page):
+        """Gets one page of the transaction history of an address, newest
+        first. See :class:`~bitcash.network.history.TransactionHistory` to
+        iterate over all pages.
 
-        raise ConnectionError('All APIs are unreachable.')
+        :param address: The address in question.
+        :type address: ``str``
+        :param page: The page, starting at 0.
+        :type page: ``int``
+        :raises ConnectionError: If all API services fail.
+        :returns: The transaction IDs with their block heights, ``None`` for
+                  unconfirmed transactions, and the next page or ``None``.
+        :rtype: ``tuple``
+        """
+        return cls._dispatch('get_transactions_page', cls.GET_TRANSACTIONS_PAGE_MAIN, address, page)
+
+    @classmethod
+    def get_transactions_page_testnet(cls, address, page):
+        """Gets one page of the transaction history of an address on the
+        test network, newest first. See :func:`get_transactions_page`.
+
+        :param address: The address in question.
+        :type address: ``str``
+        :param page: The page, starting at 0.
+        :type page: ``int``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``tuple``
+        """
+        return cls._dispatch('get_transactions_page_testnet', cls.GET_TRANSACTIONS_PAGE_TEST, address, page)
 
     @classmethod
+    @network_cache('get_transaction', until_confirmed)
     def get_transaction(cls, txid):
         """Gets the full transaction details.
 
@@ -477,16 +642,10 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``Transaction``
         """
-
-        for api_call in cls.GET_TX_MAIN:
-            try:
-                return api_call(txid)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._dispatch('get_transaction', cls.GET_TX_MAIN, txid)
 
     @classmethod
+    @network_cache('get_transaction_testnet', until_confirmed)
     def get_transaction_testnet(cls, txid):
         """Gets the full transaction details on the test
         network.
@@ -496,16 +655,10 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``Transaction``
         """
-
-        for api_call in cls.GET_TX_TEST:
-            try:
-                return api_call(txid)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._dispatch('get_transaction_testnet', cls.GET_TX_TEST, txid)
 
     @classmethod
+    @network_cache('get_tx_amount', forever)
     def get_tx_amount(cls, txid, txindex):
         """Gets the amount of a given transaction output.
 
@@ -516,16 +669,10 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``Decimal``
         """
-
-        for api_call in cls.GET_TX_AMOUNT_MAIN:
-            try:
-                return api_call(txid, txindex)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._dispatch('get_tx_amount', cls.GET_TX_AMOUNT_MAIN, txid, txindex)
 
     @classmethod
+    @network_cache('get_tx_amount_testnet', forever)
     def get_tx_amount_testnet(cls, txid, txindex):
         """Gets the amount of a given transaction output on the
         test network.
@@ -537,16 +684,10 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``Decimal``
         """
-
-        for api_call in cls.GET_TX_AMOUNT_TEST:
-            try:
-                return api_call(txid, txindex)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._dispatch('get_tx_amount_testnet', cls.GET_TX_AMOUNT_TEST, txid, txindex)
 
     @classmethod
+    @network_cache('get_unspent', mutable)
     def get_unspent(cls, address):
         """Gets all unspent transaction outputs belonging to an address.
 
@@ -555,16 +696,10 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``list`` of :class:`~bitcash.network.meta.Unspent`
         """
-
-        for api_call in cls.GET_UNSPENT_MAIN:
-            try:
-                return api_call(address)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._dispatch('get_unspent', cls.GET_UNSPENT_MAIN, address)
 
     @classmethod
+    @network_cache('get_unspent_testnet', mutable)
     def get_unspent_testnet(cls, address):
         """Gets all unspent transaction outputs belonging to an address on the
         test network.
@@ -574,16 +709,86 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``list`` of :class:`~bitcash.network.meta.Unspent`
         """
+        return cls._dispatch('get_unspent_testnet', cls.GET_UNSPENT_TEST, address)
+
+    @classmethod
+    def _iterate(cls, operation, api_calls, *args):
+        # Once a service sent data, its failures can no longer be hidden by
+        # asking the next one.
+        api_calls = [_FirstItem(api_call) for api_call in api_calls]
+        yield from dispatch(operation, api_calls, args, cls.IGNORED_ERRORS)
 
-        for api_call in cls.GET_UNSPENT_TEST:
-            try:
-                return api_call(address)
-            except cls.IGNORED_ERRORS:
-                pass
+    @classmethod
+    def iter_unspent(cls, address):
+        """Yields the unspent transaction outputs belonging to an address
+        while the response is parsed, so that addresses with very many
+        unspents can be processed without holding them all in memory.
+        Services are asked like for :func:`get_unspent` until one sends its
+        first unspent.
 
-        raise ConnectionError('All APIs are unreachable.')
+        :param address: The address in question.
+        :type address: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: generator of :class:`~bitcash.network.meta.Unspent`
+        """
+        return cls._iterate('iter_unspent', cls.ITER_UNSPENT_MAIN, address)
 
     @classmethod
+    def iter_unspent_testnet(cls, address):
+        """Yields the unspent transaction outputs belonging to an address on
+        the test network while the response is parsed. See
+        :func:`iter_unspent`.
+
+        :param address: The address in question.
+        :type address: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: generator of :class:`~bitcash.network.meta.Unspent`
+        """
+        return cls._iterate('iter_unspent_testnet', cls.ITER_UNSPENT_TEST, address)
+
+    @classmethod
+    def get_unspent_bulk(cls, addresses):
+        """Gets all unspent transaction outputs belonging to many addresses,
+        in as few requests as services allow. If no service supports bulk
+        requests, falls back to :func:`get_unspent` for each address.
+
+        :param addresses: The addresses in question.
+        :type addresses: ``list`` of ``str``
+        :raises ConnectionError: If all API services fail.
+        :returns: The unspents of each address.
+        :rtype: ``dict`` of ``str`` to ``list`` of :class:`~bitcash.network.meta.Unspent`
+        """
+
+        try:
+            return cls._dispatch('get_unspent_bulk', cls.GET_UNSPENT_BULK_MAIN, addresses)
+        except ConnectionError:
+            pass
+
+        return {address: cls.get_unspent(address) for address in addresses}
+
+    @classmethod
+    def get_unspent_bulk_testnet(cls, addresses):
+        """Gets all unspent transaction outputs belonging to many addresses
+        on the test network, in as few requests as services allow. If no
+        service supports bulk requests, falls back to
+        :func:`get_unspent_testnet` for each address.
+
+        :param addresses: The addresses in question.
+        :type addresses: ``list`` of ``str``
+        :raises ConnectionError: If all API services fail.
+        :returns: The unspents of each address.
+        :rtype: ``dict`` of ``str`` to ``list`` of :class:`~bitcash.network.meta.Unspent`
+        """
+
+        try:
+            return cls._dispatch('get_unspent_bulk_testnet', cls.GET_UNSPENT_BULK_TEST, addresses)
+        except ConnectionError:
+            pass
+
+        return {address: cls.get_unspent_testnet(address) for address in addresses}
+
+    @classmethod
+    @network_cache('get_raw_transaction', until_confirmed)
     def get_raw_transaction(cls, txid):
         """Gets the raw, unparsed transaction details.
 
@@ -592,16 +797,10 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``Transaction``
         """
-
-        for api_call in cls.GET_RAW_TX_MAIN:
-            try:
-                return api_call(txid)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._dispatch('get_raw_transaction', cls.GET_RAW_TX_MAIN, txid)
 
     @classmethod
+    @network_cache('get_raw_transaction_testnet', until_confirmed)
     def get_raw_transaction_testnet(cls, txid):
         """Gets the raw, unparsed transaction details on the test
         network.
@@ -611,14 +810,7 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``Transaction``
         """
-
-        for api_call in cls.GET_RAW_TX_TEST:
-            try:
-                return api_call(txid)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._dispatch('get_raw_transaction_testnet', cls.GET_RAW_TX_TEST, txid)
 
     @classmethod
     def broadcast_tx(cls, tx_hex):  # pragma: no cover
@@ -628,23 +820,11 @@ class NetworkAPI:
         :type tx_hex: ``str``
         :raises ConnectionError: If all API services fail.
         """
-        success = None
-
-        for api_call in cls.BROADCAST_TX_MAIN:
-            try:
-                success = api_call(tx_hex)
-                if not success:
-                    continue
-                return
-            except cls.IGNORED_ERRORS:
-                pass
-
-        if success is False:
+
+        if not cls._dispatch('broadcast_tx', cls.BROADCAST_TX_MAIN, tx_hex, accept=bool):
             raise ConnectionError('Transaction broadcast failed, or '
                                   'Unspents were already used.')
 
-        raise ConnectionError('All APIs are unreachable.')
-
     @classmethod
     def broadcast_tx_testnet(cls, tx_hex):  # pragma: no cover
         """Broadcasts a transaction to the test network's blockchain.
@@ -653,19 +833,7 @@ class NetworkAPI:
         :type tx_hex: ``str``
         :raises ConnectionError: If all API services fail.
         """
-        success = None
-
-        for api_call in cls.BROADCAST_TX_TEST:
-            try:
-                success = api_call(tx_hex)
-                if not success:
-                    continue
-                return
-            except cls.IGNORED_ERRORS:
-                pass
-
-        if success is False:
+
+        if not cls._dispatch('broadcast_tx_testnet', cls.BROADCAST_TX_TEST, tx_hex, accept=bool):
             raise ConnectionError('Transaction broadcast failed, or '
                                   'Unspents were already used.')
-
-        raise ConnectionError('All APIs are unreachable.')
@@ -0,0 +1,125 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from bitcash.network.ratelimit import RateLimitedAdapter
+
+# Connections kept alive per host, for each provider.
+DEFAULT_POOL_SIZE = 10
+
+# Retries of idempotent requests that could not connect or that got a
+# 502, 503 or 504, with exponential backoff.
+DEFAULT_MAX_RETRIES = 2
+RETRY_BACKOFF = 0.1
+RETRY_STATUSES = (502, 503, 504)
+
+_SESSIONS = {}
+_INJECTED_SESSIONS = {}
+_DEFAULT_SESSION = None
+_LOCK = threading.Lock()
+
+
+def set_pool_size(size):
+    """Sets how many connections each provider keeps alive per host. Applies
+    to sessions created afterwards, see :func:`reset_sessions`.
+    """
+    global DEFAULT_POOL_SIZE
+    DEFAULT_POOL_SIZE = size
+
+
+def set_max_retries(retries):
+    """Sets how often idempotent requests are retried. Applies to sessions
+    created afterwards, see :func:`reset_sessions`.
+    """
+    global DEFAULT_MAX_RETRIES
+    DEFAULT_MAX_RETRIES = retries
+
+
+def make_session(pool_size=None, max_retries=None, provider=None):
+    """Creates a ``requests.Session`` with keep-alive connection pools and
+    retries. Responses are gzip compressed when the server supports it.
+
+    :param pool_size: Connections kept alive per host. Defaults to
+                      :data:`DEFAULT_POOL_SIZE`.
+    :type pool_size: ``int``
+    :param max_retries: Defaults to :data:`DEFAULT_MAX_RETRIES`.
+    :type max_retries: ``int``
+    :param provider: Paces requests to the quota of this provider, see
+                     :mod:`bitcash.network.ratelimit`.
+    :type provider: ``str``
+    :rtype: ``requests.Session``
+    """
+    pool_size = DEFAULT_POOL_SIZE if pool_size is None else pool_size
+    max_retries = DEFAULT_MAX_RETRIES if max_retries is None else max_retries
+
+    # Only connection errors are retried for POST, as a broadcast that got
+    # an error response may still have been received. A Retry-After is left
+    # to the rate limiter instead of blocking here for as long as it asks.
+    retry = Retry(total=max_retries, backoff_factor=RETRY_BACKOFF,
+                  status_forcelist=RETRY_STATUSES, raise_on_status=False,
+                  respect_retry_after_header=False)
+    if provider is None:
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    else:
+        adapter = RateLimitedAdapter(provider, pool_connections=pool_size, pool_maxsize=pool_size,
+                                     max_retries=retry)
+
+    session = requests.Session()
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session(provider):
+    """Returns the session shared by all requests to a provider, creating it
+    on first use. Sessions are safe to use from many threads as long as
+    their settings are not changed meanwhile.
+
+    :param provider: The name of the provider, e.g. ``'BitcoinDotComAPI'``.
+    :type provider: ``str``
+    :rtype: ``requests.Session``
+    """
+    session = _INJECTED_SESSIONS.get(provider) or _DEFAULT_SESSION or _SESSIONS.get(provider)
+    if session is not None:
+        return session
+
+    with _LOCK:
+        session = _SESSIONS.get(provider)
+        if session is None:
+            session = _SESSIONS[provider] = make_session(provider=provider)
+        return session
+
+
+def set_session(session, provider=None):
+    """Makes requests to a provider use ``session``, e.g. one that sends
+    everything to a local stand-in server in tests.
+
+    :param session: The session, or ``None`` to go back to the default.
+    :type session: ``requests.Session``
+    :param provider: The name of the provider, e.g. ``'BitcoreAPI'``. By
+                     default, ``session`` is used for every provider that
+                     was not given its own.
+    :type provider: ``str``
+    """
+    global _DEFAULT_SESSION
+
+    with _LOCK:
+        if provider is None:
+            _DEFAULT_SESSION = session
+        elif session is None:
+            _INJECTED_SESSIONS.pop(provider, None)
+        else:
+            _INJECTED_SESSIONS[provider] = session
+
+
+def reset_sessions():
+    """Closes all sessions created by :func:`get_session`. New ones are
+    created as needed. Sessions passed to :func:`set_session` are kept.
+    """
+    with _LOCK:
+        for session in _SESSIONS.values():
+            session.close()
+        _SESSIONS.clear()
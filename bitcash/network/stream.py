@@ -0,0 +1,124 @@
+import codecs
+import json
+import re
+
+# Bytes read from a streamed response at a time.
+CHUNK_SIZE = 64 * 1024
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# Characters after which a number at the end of the buffer may continue.
+NUMBER_CONTINUATION = frozenset('0123456789.eE+-')
+
+
+class JSONStream:
+    """Parses a JSON document from chunks of bytes as they arrive, so that
+    the items of a large array can be processed one at a time without
+    holding the whole document in memory.
+
+    :param chunks: The document in UTF-8, e.g. ``response.iter_content()``.
+    :type chunks: iterable of ``bytes``
+    :param parse_float: Called with the string of every JSON float, like
+                        :func:`json.loads`.
+    :type parse_float: ``callable``
+    """
+
+    def __init__(self, chunks, parse_float=None):
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder(parse_float=parse_float)
+        self._buffer = ''
+        self._pos = 0
+        self._exhausted = False
+
+    def _fill(self):
+        if self._exhausted:
+            return False
+
+        for chunk in self._chunks:
+            text = self._text.decode(chunk)
+            if text:
+                # Drop what was parsed, only when new data arrives.
+                self._buffer = self._buffer[self._pos:] + text
+                self._pos = 0
+                return True
+
+        self._exhausted = True
+        text = self._text.decode(b'', final=True)
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        return bool(text)
+
+    def _peek(self):
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError('Unexpected end of JSON document.')
+
+    def _expect(self, chars):
+        char = self._peek()
+        if char not in chars:
+            raise ValueError('Expected one of {} in JSON document, got {}.'.format(
+                repr(chars), repr(char)))
+        self._pos += 1
+        return char
+
+    def _value(self):
+        self._peek()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # The value is incomplete, or invalid once all data arrived.
+                if self._fill():
+                    continue
+                raise
+
+            # A number may continue in the next chunk, e.g. 5 of 5.5.
+            if (end == len(self._buffer) or self._buffer[end] in NUMBER_CONTINUATION) and self._fill():
+                continue
+
+            self._pos = end
+            return value
+
+    def items(self, key=None):
+        """Yields the items of the array the document consists of or, if
+        ``key`` is given, of the array under ``key`` of the top-level object.
+        The rest of the document is not read.
+
+        :param key: A key of the top-level object.
+        :type key: ``str``
+        :raises ValueError: If the document is malformed.
+        """
+        if key is not None:
+            self._expect('{')
+            if self._peek() == '}':
+                return
+
+            while True:
+                name = self._value()
+                self._expect(':')
+                if name == key:
+                    break
+                self._value()
+                if self._expect(',}') == '}':
+                    return
+
+        self._expect('[')
+        if self._peek() == ']':
+            return
+
+        while True:
+            yield self._value()
+            if self._expect(',]') == ']':
+                return
+
+
+def iter_json_array(chunks, key=None, parse_float=None):
+    """Yields the items of a streamed JSON array, see
+    :meth:`~bitcash.network.stream.JSONStream.items`.
+    """
+    return JSONStream(chunks, parse_float).items(key)
@@ -0,0 +1,114 @@
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from time import perf_counter
+
+# Names of the spans around each phase of building and sending a transaction.
+SEND = 'bitcash.send'
+CREATE = 'bitcash.create_transaction'
+SANITIZE = 'bitcash.sanitize_tx_data'
+DECODE_ADDRESSES = 'bitcash.decode_addresses'
+CONVERT_CURRENCY = 'bitcash.convert_currency'
+SELECT_UNSPENTS = 'bitcash.select_unspents'
+BUILD_OUTPUTS = 'bitcash.build_outputs'
+SIGN = 'bitcash.sign'
+SERIALIZE = 'bitcash.serialize'
+ENCODE_HEX = 'bitcash.encode_hex'
+BROADCAST = 'bitcash.broadcast'
+
+# Number of recent spans a PhaseTimer keeps. Totals cover every span.
+MAX_SPANS = 1000
+
+# The tracer receiving spans, or ``None`` so that tracing costs nothing by
+# default.
+TRACER = None
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def set_tracer(tracer):
+    """Traces the phases of building and sending transactions, e.g. rate
+    conversion, signing and broadcasting, with ``tracer``.
+
+    :param tracer: Anything with a ``start_as_current_span(name, attributes)``
+                   method returning a context manager, such as an OpenTelemetry
+                   tracer from ``opentelemetry.trace.get_tracer('bitcash')`` or
+                   a :class:`~bitcash.tracing.PhaseTimer`. ``None`` stops
+                   tracing.
+    """
+    global TRACER
+    TRACER = tracer
+
+
+def span(name, **attributes):
+    """Returns a context manager that traces the code within it as the
+    phase ``name``.
+    """
+    tracer = TRACER
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+class PhaseTimer:
+    """A tracer without dependencies that records how long each phase took.
+    Spans of many threads are recorded together. Only the most recent spans
+    are kept, so a long-lived timer uses bounded memory.
+
+    :param max_spans: The number of recent spans kept in ``spans``.
+    :type max_spans: ``int``
+    """
+
+    def __init__(self, max_spans=MAX_SPANS):
+        self._lock = threading.Lock()
+        self.max_spans = max_spans
+        self.reset()
+
+    def reset(self):
+        """Forgets all spans."""
+        with self._lock:
+            self.spans = deque(maxlen=self.max_spans)
+            self._totals = defaultdict(float)
+            self._counts = defaultdict(int)
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None, **kwargs):
+        start = perf_counter()
+        try:
+            yield None
+        finally:
+            seconds = perf_counter() - start
+            with self._lock:
+                self.spans.append((name, seconds, dict(attributes or {})))
+                self._totals[name] += seconds
+                self._counts[name] += 1
+
+    def breakdown(self):
+        """Returns the time spent in each phase.
+
+        :returns: Maps span names to the total seconds of their spans. Phases
+                  contain the phases within them, e.g. ``bitcash.send``
+                  contains ``bitcash.broadcast``.
+        :rtype: ``dict``
+        """
+        with self._lock:
+            return dict(self._totals)
+
+    def counts(self):
+        """Returns how many spans of each phase were recorded.
+
+        :rtype: ``dict``
+        """
+        with self._lock:
+            return dict(self._counts)
@@ -1,12 +1,21 @@
 import logging
+import os
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from hashlib import sha256 as _sha256
+from itertools import islice
 
-from cashaddress import convert as cashaddress
-
-from bitcash.crypto import double_sha256, sha256
+from bitcash.coinselect import SMALLEST_FIRST, select_coins
+from bitcash.crypto import ECPrivateKey, double_sha256
 from bitcash.exceptions import InsufficientFunds
-from bitcash.format import address_to_public_key_hash
+from bitcash.format import address_to_public_key_hash, to_cash_address, verify_sig
+from bitcash.network.meta import Unspent
 from bitcash.network.rates import currency_to_satoshi_cached
+from bitcash.tracing import (
+    BUILD_OUTPUTS, CONVERT_CURRENCY, DECODE_ADDRESSES, ENCODE_HEX, SANITIZE,
+    SELECT_UNSPENTS, SERIALIZE, SIGN, span
+)
 from bitcash.utils import (
     bytes_to_hex, chunk_data, hex_to_bytes, int_to_unknown_bytes, int_to_varint
 )
@@ -38,6 +47,15 @@ OP_PUSHDATA4 = b'\x4e'
 
 MESSAGE_LIMIT = 220
 
+# Transactions larger than this are not relayed by nodes.
+MAX_STANDARD_TX_SIZE = 100000
+
+# Outputs smaller than this are not relayed by nodes.
+DUST_LIMIT = 546
+
+# Nodes reject a transaction with more unconfirmed ancestors than this.
+MAX_UNCONFIRMED_CHAIN = 25
+
 
 class TxIn:
     __slots__ = ('script', 'script_len', 'txid', 'txindex', 'amount')
@@ -69,8 +87,10 @@ class TxIn:
 Output = namedtuple('Output', ('address', 'amount', 'currency'))
 
 
-def calc_txid(tx_hex):
-    return bytes_to_hex(double_sha256(hex_to_bytes(tx_hex))[::-1])
+def calc_txid(tx):
+    if isinstance(tx, str):
+        tx = hex_to_bytes(tx)
+    return bytes_to_hex(double_sha256(tx)[::-1])
 
 
 def estimate_tx_fee(n_in, n_out, satoshis, compressed, op_return_size=0):
@@ -129,26 +149,46 @@ def get_op_pushdata_code(dest):
         return OP_PUSHDATA4 + length_data.to_bytes(4, byteorder='little')  # OP_PUSHDATA4 format
 
 
-def sanitize_tx_data(unspents, outputs, fee, leftover, combine=True, message=None, compressed=True, custom_pushdata=False):
+def sanitize_tx_data(unspents, outputs, fee, leftover, combine=True, message=None, compressed=True, custom_pushdata=False,
+                     strategy=SMALLEST_FIRST):
     """
     sanitize_tx_data()
 
-    fee is in satoshis per byte.
+    fee is in satoshis per byte. When ``combine`` is ``False``, unspents are
+    chosen by ``strategy``, see :func:`~bitcash.coinselect.select_coins`.
     """
 
-    outputs = outputs.copy()
+    with span(SANITIZE, outputs=len(outputs)):
+
+        with span(DECODE_ADDRESSES):
+            # LEGACYADDRESSDEPRECATION
+            # FIXME: Will be removed in an upcoming release, breaking compatibility with legacy addresses.
+            destinations = [to_cash_address(dest) for dest, _, _ in outputs]
+
+        with span(CONVERT_CURRENCY):
+            outputs = [(dest, currency_to_satoshi_cached(amount, currency))
+                       for dest, (_, amount, currency) in zip(destinations, outputs)]
+
+        # A generator is always truthy and can only be read once.
+        unspents = list(unspents)
+        if not unspents:
+            raise ValueError('Transactions must have at least one unspent.')
 
-    for i, output in enumerate(outputs):
-        dest, amount, currency = output
-        # LEGACYADDRESSDEPRECATION
-        # FIXME: Will be removed in an upcoming release, breaking compatibility with legacy addresses.
-        dest = cashaddress.to_cash_address(dest)
-        outputs[i] = (dest, currency_to_satoshi_cached(amount, currency))
+        # Temporary storage so all outputs precede messages.
+        messages, total_op_return_size = sanitize_message(message, custom_pushdata)
 
-    if not unspents:
-        raise ValueError('Transactions must have at least one unspent.')
+        with span(SELECT_UNSPENTS, combine=combine):
+            unspents, outputs = select_unspents(
+                unspents, outputs, fee, leftover, combine, compressed, total_op_return_size, strategy
+            )
+
+        outputs.extend(messages)
+
+    return unspents, outputs
+
+
+def sanitize_message(message, custom_pushdata=False):
 
-    # Temporary storage so all outputs precede messages.
     messages = []
     total_op_return_size = 0
 
@@ -172,68 +212,123 @@ def sanitize_tx_data(unspents, outputs, fee, leftover, combine=True, message=Non
             messages.append((message, 0))
             total_op_return_size += get_op_return_size(message, custom_pushdata=True)
 
+    return messages, total_op_return_size
+
+
+def select_unspents(unspents, outputs, fee, leftover, combine=True, compressed=True, op_return_size=0,
+                    strategy=SMALLEST_FIRST):
+    """Chooses the unspents that pay for ``outputs``, which must already be
+    in the form ``(destination, satoshi)``, and appends the change output.
+    Unless ``combine`` is set, unspents are chosen by ``strategy``, see
+    :func:`~bitcash.coinselect.select_coins`.
+    """
 
-    # Include return address in fee estimate.
-    total_in = 0
-    num_outputs = len(outputs) + 1
+    unspents = list(unspents)
+    num_outputs = len(outputs)
     sum_outputs = sum(out[1] for out in outputs)
 
-    if combine:
+    def fee_for(n_in, change):
         # calculated_fee is in total satoshis.
-        calculated_fee = estimate_tx_fee(len(unspents), num_outputs, fee, compressed, total_op_return_size)
-        total_out = sum_outputs + calculated_fee
-        unspents = unspents.copy()
-        total_in += sum(unspent.amount for unspent in unspents)
+        return estimate_tx_fee(n_in, num_outputs + 1 if change else num_outputs,
+                               fee, compressed, op_return_size)
 
+    if combine:
+        # Include return address in fee estimate.
+        change = True
     else:
-        unspents = sorted(unspents, key=lambda x: x.amount)
-
-        index = 0
-
-        for index, unspent in enumerate(unspents):
-            total_in += unspent.amount
-            calculated_fee = estimate_tx_fee(len(unspents[:index + 1]), num_outputs, fee, compressed, total_op_return_size)
-            total_out = sum_outputs + calculated_fee
+        unspents, change = select_coins(unspents, sum_outputs, fee_for, strategy)
 
-            if total_in >= total_out:
-                break
-
-        unspents[:] = unspents[:index + 1]
+    total_in = sum(unspent.amount for unspent in unspents)
+    total_out = sum_outputs + fee_for(len(unspents), change)
 
     remaining = total_in - total_out
 
-    if remaining > 0:
+    if remaining > 0 and change:
         outputs.append((leftover, remaining))
     elif remaining < 0:
         raise InsufficientFunds('Balance {} is less than {} (including '
                                 'fee).'.format(total_in, total_out))
 
-    outputs.extend(messages)
-
     return unspents, outputs
 
 
-def construct_output_block(outputs, custom_pushdata=False):
+class TxWriter:
+    """Serializes a transaction into a single buffer in linear time.
+
+    :param sink: Where the bytes are written. A ``bytearray`` is extended in
+                 place, a writable ``memoryview`` (e.g. over a preallocated
+                 buffer) is filled from its start and any other object must
+                 have a ``write`` method, like a file. By default a new
+                 ``bytearray`` is used.
+    """
+    __slots__ = ('sink', 'offset', 'write')
+
+    def __init__(self, sink=None):
+        self.sink = bytearray() if sink is None else sink
+        self.offset = 0
+
+        if isinstance(self.sink, bytearray):
+            self.write = self._write_bytearray
+        elif isinstance(self.sink, memoryview):
+            self.write = self._write_memoryview
+        else:
+            self.write = self._write_file
+
+    def _write_bytearray(self, data):
+        self.sink += data
+        self.offset += len(data)
+
+    def _write_memoryview(self, data):
+        end = self.offset + len(data)
+        self.sink[self.offset:end] = data
+        self.offset = end
+
+    def _write_file(self, data):
+        self.sink.write(data)
+        self.offset += len(data)
+
+    def getvalue(self):
+        """Returns everything written so far.
 
-    output_block = b''
+        :rtype: ``bytes``
+        :raises TypeError: If the sink is not a ``bytearray`` or ``memoryview``.
+        """
+        if isinstance(self.sink, bytearray):
+            return bytes(self.sink)
+        elif isinstance(self.sink, memoryview):
+            return self.sink[:self.offset].tobytes()
+        raise TypeError('Only bytearray and memoryview sinks can be read back.')
+
+
+def write_output_block(writer, outputs, custom_pushdata=False, scripts=None):
+    """Writes serialized outputs. ``scripts`` may be a ``dict`` used to
+    remember the locking script of each destination across calls.
+    """
+    write = writer.write
 
     for data in outputs:
         dest, amount = data
 
         # Real recipient
         if amount:
-            script = (OP_DUP + OP_HASH160 + OP_PUSH_20 +
-                      address_to_public_key_hash(dest) +
-                      OP_EQUALVERIFY + OP_CHECKSIG)
+            script = scripts.get(dest) if scripts is not None else None
+
+            if script is None:
+                script = (OP_DUP + OP_HASH160 + OP_PUSH_20 +
+                          address_to_public_key_hash(dest) +
+                          OP_EQUALVERIFY + OP_CHECKSIG)
 
-            output_block += amount.to_bytes(8, byteorder='little')
+                if scripts is not None:
+                    scripts[dest] = script
+
+            write(amount.to_bytes(8, byteorder='little'))
 
         # Blockchain storage
         else:
             if custom_pushdata is False:
                 script = OP_RETURN + get_op_pushdata_code(dest) + dest
 
-                output_block += b'\x00\x00\x00\x00\x00\x00\x00\x00'
+                write(b'\x00\x00\x00\x00\x00\x00\x00\x00')
 
             elif custom_pushdata is True:
                 # manual control over number of bytes in each batch of pushdata
@@ -242,85 +337,251 @@ def construct_output_block(outputs, custom_pushdata=False):
                 else:
                     script = (OP_RETURN + dest)
 
-                output_block += b'\x00\x00\x00\x00\x00\x00\x00\x00'
+                write(b'\x00\x00\x00\x00\x00\x00\x00\x00')
+
+        write(int_to_varint(len(script)))
+        write(script)
+
+
+def write_input_block(writer, inputs):
+    write = writer.write
+    sequence = SEQUENCE
+
+    for txin in inputs:
+        write(txin.txid)
+        write(txin.txindex)
+        write(txin.script_len)
+        write(txin.script)
+        write(sequence)
+
+
+def write_transaction(writer, inputs, output_block, output_count,
+                      version=VERSION_1, lock_time=LOCK_TIME):
+    write = writer.write
+
+    write(version)
+    write(int_to_varint(len(inputs)))
+    write_input_block(writer, inputs)
+    write(int_to_varint(output_count))
+    write(output_block)
+    write(lock_time)
+
 
-        # Script length in wiki is "Var_int" but there's a note of "modern BitcoinQT" using a more compact "CVarInt"
-        # CVarInt is what I believe we have here - No changes made. If incorrect - only breaks if 220 byte limit is increased.
-        output_block += int_to_unknown_bytes(len(script), byteorder='little')
-        output_block += script
+def construct_output_block(outputs, custom_pushdata=False, scripts=None):
 
-    return output_block
+    writer = TxWriter()
+    write_output_block(writer, outputs, custom_pushdata=custom_pushdata, scripts=scripts)
+    return writer.getvalue()
 
 
 def construct_input_block(inputs):
 
-    input_block = b''
-    sequence = SEQUENCE
+    writer = TxWriter()
+    write_input_block(writer, inputs)
+    return writer.getvalue()
 
-    for txin in inputs:
-        input_block += (
-            txin.txid +
-            txin.txindex +
-            txin.script_len +
-            txin.script +
-            sequence
-        )
 
-    return input_block
+class SighashContext:
+    """Computes BIP-143 signature hashes for every input of a transaction.
 
+    The parts of the preimage shared by all inputs are computed once: the
+    version, ``hashPrevouts`` and ``hashSequence`` prefix is kept as a
+    SHA-256 midstate and the ``nSequence``, ``hashOutputs``, ``nLocktime``
+    and sighash type suffix is concatenated once, so each input only hashes
+    its own outpoint, scriptCode and amount.
 
-def create_p2pkh_transaction(private_key, unspents, outputs, custom_pushdata=False):
+    :param inputs: The transaction inputs.
+    :type inputs: ``list`` of :class:`~bitcash.transaction.TxIn`
+    :param output_block: The serialized outputs of the transaction.
+    :type output_block: ``bytes``
+    :param scriptcode: The scriptCode of the inputs being signed.
+    :type scriptcode: ``bytes``
+    """
+    __slots__ = ('inputs', '_prefix', '_scriptcode', '_suffix')
+
+    def __init__(self, inputs, output_block, scriptcode, version=VERSION_1,
+                 lock_time=LOCK_TIME, hash_type=HASH_TYPE):
+        self.inputs = inputs
+
+        hashPrevouts = double_sha256(b''.join([i.txid + i.txindex for i in inputs]))
+        hashSequence = double_sha256(SEQUENCE * len(inputs))
+        hashOutputs = double_sha256(output_block)
+
+        self._prefix = _sha256(version + hashPrevouts + hashSequence)
+        self._scriptcode = int_to_varint(len(scriptcode)) + scriptcode
+        self._suffix = SEQUENCE + hashOutputs + lock_time + hash_type
+
+    def digest(self, index, scriptcode=None):
+        """Returns the hash to be signed for an input. This is the single
+        SHA-256 of the preimage, signing hashes it once more.
+
+        :param index: The position of the input.
+        :type index: ``int``
+        :param scriptcode: The scriptCode of this input, if it differs from
+                           the one the context was created with.
+        :type scriptcode: ``bytes``
+        :rtype: ``bytes``
+        """
+        txin = self.inputs[index]
+
+        if scriptcode is None:
+            scriptcode = self._scriptcode
+        else:
+            scriptcode = int_to_varint(len(scriptcode)) + scriptcode
+
+        hashed = self._prefix.copy()
+        hashed.update(txin.txid + txin.txindex + scriptcode + txin.amount + self._suffix)
+        return hashed.digest()
+
+    def digests(self):
+        """Yields the hash to be signed for each input, in order."""
+        for index in range(len(self.inputs)):
+            yield self.digest(index)
+
+    def verify(self, index, signature, public_key):
+        """Verifies the signature of an input.
+
+        :param index: The position of the input.
+        :type index: ``int``
+        :param signature: The DER signature, without the sighash type byte.
+        :type signature: ``bytes``
+        :param public_key: The public key of the input's owner.
+        :type public_key: ``bytes``
+        :rtype: ``bool``
+        """
+        return verify_sig(signature, self.digest(index), public_key)
+
+
+def _sign_chunk(private_key_bytes, digests):
+    private_key = ECPrivateKey(private_key_bytes)
+    return [private_key.sign(digest) for digest in digests]
+
+
+def sign_digests(private_key, digests, workers=None, executor=None):
+    """Signs many hashes with one private key, optionally in parallel.
+
+    The hashes are split into contiguous chunks that are signed by a pool of
+    workers. Signatures are deterministic (RFC 6979) and are returned in the
+    same order as ``digests``, so the result is always identical to signing
+    serially.
+
+    :param private_key: The key to sign with.
+    :type private_key: :class:`~bitcash.wallet.BaseKey`
+    :param digests: The hashes to sign.
+    :type digests: ``list`` of ``bytes``
+    :param workers: The number of threads to sign with. By default, signing
+                    happens serially in the calling thread.
+    :type workers: ``int``
+    :param executor: A :class:`concurrent.futures.Executor` to use instead of
+                     a new thread pool, e.g. a ``ProcessPoolExecutor``. The
+                     hashes are then split into ``workers`` chunks, or one
+                     per CPU by default.
+    :rtype: ``list`` of ``bytes``
+    """
+    if executor is None and (workers is None or workers <= 1):
+        return [private_key.sign(digest) for digest in digests]
 
-    public_key = private_key.public_key
-    public_key_len = len(public_key).to_bytes(1, byteorder='little')
+    n_chunks = workers or os.cpu_count() or 1
+    chunk_size = -(-len(digests) // n_chunks) or 1
+    chunks = [digests[i:i + chunk_size] for i in range(0, len(digests), chunk_size)]
+    sign_chunk = partial(_sign_chunk, private_key.to_bytes())
+
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(sign_chunk, chunks))
+    else:
+        results = list(executor.map(sign_chunk, chunks))
+
+    return [signature for chunk in results for signature in chunk]
+
+
+def create_p2pkh_transaction(private_key, unspents, outputs, custom_pushdata=False,
+                             workers=None, executor=None):
+
+    tx = create_p2pkh_transaction_bytes(
+        private_key, unspents, outputs, custom_pushdata=custom_pushdata,
+        workers=workers, executor=executor
+    )
 
-    scriptCode = private_key.scriptcode
-    scriptCode_len = int_to_varint(len(scriptCode))
+    with span(ENCODE_HEX, size=len(tx)):
+        return bytes_to_hex(tx)
+
+
+def create_p2pkh_transaction_bytes(private_key, unspents, outputs, custom_pushdata=False,
+                                   sink=None, workers=None, executor=None):
+    """Creates a signed P2PKH transaction in binary form.
+
+    :param sink: Where to write the transaction, see
+                 :class:`~bitcash.transaction.TxWriter`.
+    :param workers: The number of threads to sign inputs with, see
+                    :func:`~bitcash.transaction.sign_digests`.
+    :type workers: ``int``
+    :param executor: An executor to sign inputs with instead.
+    :returns: The signed transaction, or the number of bytes written if
+              ``sink`` is supplied.
+    :rtype: ``bytes`` or ``int``
+    """
+
+    with span(BUILD_OUTPUTS, outputs=len(outputs)):
+        output_block = construct_output_block(outputs, custom_pushdata=custom_pushdata)
+
+    return _create_p2pkh_transaction(
+        private_key, private_key.scriptcode, unspents, output_block, len(outputs),
+        sink=sink, workers=workers, executor=executor
+    )
+
+
+def _create_p2pkh_transaction(private_key, scriptCode, unspents, output_block, output_count,
+                              sink=None, workers=None, executor=None):
 
     version = VERSION_1
     lock_time = LOCK_TIME
-    # sequence = SEQUENCE
-    hash_type = HASH_TYPE
-    input_count = int_to_unknown_bytes(len(unspents), byteorder='little')
-    output_count = int_to_unknown_bytes(len(outputs), byteorder='little')
 
-    output_block = construct_output_block(outputs, custom_pushdata=custom_pushdata)
+    with span(SIGN, inputs=len(unspents)):
+        inputs = _construct_inputs(unspents)
+        sighash = SighashContext(inputs, output_block, scriptCode, version, lock_time)
+
+        # BIP-143: Used for Bitcoin Cash
+        _sign_inputs(sighash, private_key, range(len(inputs)), workers=workers, executor=executor)
+
+    with span(SERIALIZE):
+        writer = TxWriter(sink)
+        write_transaction(writer, inputs, output_block, output_count, version, lock_time)
+
+    if sink is None:
+        return writer.getvalue()
+
+    return writer.offset
+
+
+def _construct_inputs(unspents):
 
     # Optimize for speed, not memory, by pre-computing values.
     inputs = []
     for unspent in unspents:
         script = hex_to_bytes(unspent.script)
-        script_len = int_to_unknown_bytes(len(script), byteorder='little')
+        script_len = int_to_varint(len(script))
         txid = hex_to_bytes(unspent.txid)[::-1]
         txindex = unspent.txindex.to_bytes(4, byteorder='little')
         amount = unspent.amount.to_bytes(8, byteorder='little')
 
         inputs.append(TxIn(script, script_len, txid, txindex, amount))
 
-    hashPrevouts = double_sha256(b''.join([i.txid+i.txindex for i in inputs]))
-    hashSequence = double_sha256(b''.join([SEQUENCE for i in inputs]))
-    hashOutputs = double_sha256(output_block)
-
-    # scriptCode_len is part of the script.
-    for i, txin in enumerate(inputs):
-        to_be_hashed = (
-            version +
-            hashPrevouts +
-            hashSequence +
-            txin.txid +
-            txin.txindex +
-            scriptCode_len +
-            scriptCode +
-            txin.amount +
-            SEQUENCE +
-            hashOutputs +
-            lock_time +
-            hash_type
-        )
-        hashed = sha256(to_be_hashed)  # BIP-143: Used for Bitcoin Cash
+    return inputs
+
+
+def _sign_inputs(sighash, private_key, indices, scriptcode=None, workers=None, executor=None):
+
+    public_key = private_key.public_key
+    public_key_len = len(public_key).to_bytes(1, byteorder='little')
+
+    digests = [sighash.digest(i, scriptcode) for i in indices]
+    signatures = sign_digests(private_key, digests, workers=workers, executor=executor)
+
+    for i, signature in zip(indices, signatures):
 
-        # signature = private_key.sign(hashed) + b'\x01'
-        signature = private_key.sign(hashed) + b'\x41'
+        # signature = signature + b'\x01'
+        signature = signature + b'\x41'
 
         script_sig = (
             len(signature).to_bytes(1, byteorder='little') +
@@ -329,14 +590,298 @@ def create_p2pkh_transaction(private_key, unspents, outputs, custom_pushdata=Fal
             public_key
         )
 
-        inputs[i].script = script_sig
-        inputs[i].script_len = int_to_unknown_bytes(len(script_sig), byteorder='little')
+        sighash.inputs[i].script = script_sig
+        sighash.inputs[i].script_len = int_to_varint(len(script_sig))
+
+
+def create_p2pkh_transaction_from_keys(private_keys, unspents, outputs, custom_pushdata=False,
+                                       workers=None, executor=None):
+    """Creates a signed P2PKH transaction spending the unspents of several
+    keys.
+
+    :param private_keys: The key owning each unspent, in the same order.
+    :type private_keys: ``list`` of :class:`~bitcash.wallet.BaseKey`
+    :param unspents: The UTXOs to spend.
+    :type unspents: ``list`` of :class:`~bitcash.network.meta.Unspent`
+    :param outputs: The outputs in the form ``(destination, satoshi)``.
+    :type outputs: ``list`` of ``tuple``
+    :returns: The signed transaction as hex.
+    :rtype: ``str``
+    """
+    if len(private_keys) != len(unspents):
+        raise ValueError('Every unspent needs exactly one key.')
+
+    output_block = construct_output_block(outputs, custom_pushdata=custom_pushdata)
+    inputs = _construct_inputs(unspents)
+    sighash = SighashContext(inputs, output_block, private_keys[0].scriptcode if private_keys else b'')
+
+    # Keys are unhashable, group the inputs of each one by identity.
+    owned = {}
+    for i, private_key in enumerate(private_keys):
+        owned.setdefault(id(private_key), (private_key, []))[1].append(i)
+
+    for private_key, indices in owned.values():
+        _sign_inputs(sighash, private_key, indices, private_key.scriptcode,
+                     workers=workers, executor=executor)
+
+    writer = TxWriter()
+    write_transaction(writer, inputs, output_block, len(outputs))
+    return bytes_to_hex(writer.getvalue())
+
+
+def create_p2pkh_transactions(private_key, output_sets, unspents, fee, leftover=None,
+                              message=None, compressed=True, custom_pushdata=False,
+                              workers=None, executor=None, strategy=SMALLEST_FIRST):
+    """Creates many signed P2PKH transactions from one key in a single call.
+
+    Each set of outputs gets its own transaction. Unspents are taken from the
+    shared pool by ``strategy``, smallest first by default, and are never
+    used by more than one of the transactions. Amounts, destination addresses, output scripts and
+    the key's scriptCode are only converted or looked up once for the whole batch.
+
+    :param private_key: The key that owns ``unspents``.
+    :type private_key: :class:`~bitcash.wallet.BaseKey`
+    :param output_sets: The outputs of each transaction, in the form
+                        ``(destination, amount, currency)``.
+    :type output_sets: ``list`` of ``list`` of ``tuple``
+    :param unspents: The pool of UTXOs to spend from.
+    :type unspents: ``list`` of :class:`~bitcash.network.meta.Unspent`
+    :param fee: The number of satoshi per byte to pay to miners.
+    :type fee: ``int``
+    :param leftover: The destination of any change. Defaults to the key's
+                     address.
+    :type leftover: ``str``
+    :param message: A message to include in every transaction.
+    :raises InsufficientFunds: If the pool cannot pay for every transaction.
+    :returns: The signed transactions as hex, in the order of ``output_sets``.
+    :rtype: ``list`` of ``str``
+    """
+
+    leftover = leftover or private_key.address
+    scriptcode = private_key.scriptcode
+    messages, total_op_return_size = sanitize_message(message, custom_pushdata)
+
+    amounts = {}
+    scripts = {}
+
+    pool = sorted(unspents, key=lambda x: x.amount)
+    transactions = []
+
+    for outputs in output_sets:
+        sanitized = []
+
+        for dest, amount, currency in outputs:
+            if (amount, currency) not in amounts:
+                amounts[amount, currency] = currency_to_satoshi_cached(amount, currency)
+
+            # LEGACYADDRESSDEPRECATION
+            sanitized.append((to_cash_address(dest), amounts[amount, currency]))
+
+        if not pool:
+            raise InsufficientFunds('No unspents left for transaction {} of '
+                                    'the batch.'.format(len(transactions)))
+
+        selected, sanitized = select_unspents(
+            pool, sanitized, fee, leftover, combine=False, compressed=compressed,
+            op_return_size=total_op_return_size, strategy=strategy
+        )
+        sanitized.extend(messages)
+
+        spent = {id(unspent) for unspent in selected}
+        pool = [unspent for unspent in pool if id(unspent) not in spent]
+
+        output_block = construct_output_block(sanitized, custom_pushdata=custom_pushdata, scripts=scripts)
+
+        transactions.append(bytes_to_hex(_create_p2pkh_transaction(
+            private_key, scriptcode, selected, output_block, len(sanitized),
+            workers=workers, executor=executor
+        )))
+
+    return transactions
+
+
+def _iter_chunks(data, size, offset=0):
+    if isinstance(data, (bytes, bytearray, memoryview, str)):
+        pieces = (data, )
+    elif hasattr(data, 'read'):
+        if offset and hasattr(data, 'seekable') and data.seekable():
+            data.seek(offset)
+            offset = 0
+        pieces = iter(partial(data.read, size * 64), data.read(0))
+    else:
+        pieces = data
+
+    buffer = bytearray()
+
+    for piece in pieces:
+        if isinstance(piece, str):
+            piece = piece.encode('utf-8')
+
+        # Skips data stored by a previous chain without holding it.
+        if offset:
+            if len(piece) <= offset:
+                offset -= len(piece)
+                continue
+            piece, offset = piece[offset:], 0
+
+        buffer += piece
+
+        while len(buffer) >= size:
+            yield bytes(buffer[:size])
+            del buffer[:size]
+
+    if buffer:
+        yield bytes(buffer)
+
+
+class OpReturnChain:
+    """The transactions of
+    :func:`~bitcash.transaction.create_op_return_transactions` as hex, in the
+    order they must be broadcast. They are signed as they are consumed.
+
+    :ivar consumed: The bytes of the data stored by the transactions consumed
+                    so far, including the ``offset`` the chain started at.
+    :ivar change: The change output of the last transaction consumed, which
+                  pays for the next part, or ``None``.
+    :ivar complete: Whether the chain stores the rest of the data. Otherwise
+                    pass ``consumed`` as ``offset`` to store the next part.
+    """
+
+    def __init__(self, private_key, chunks, unspents, fee, compressed,
+                 pushes_per_transaction, workers, executor, offset=0, complete=True):
+        self.consumed = offset
+        self.change = None
+        self.complete = complete
+        self._transactions = self._create(
+            private_key, chunks, unspents, fee, compressed,
+            pushes_per_transaction, workers, executor
+        )
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._transactions)
+
+    def _create(self, private_key, chunks, unspents, fee, compressed,
+                pushes_per_transaction, workers, executor):
+
+        address = private_key.address
+        scriptcode = private_key.scriptcode
+        scripts = {}
+
+        batch = list(islice(chunks, pushes_per_transaction))
+
+        while batch:
+            next_batch = list(islice(chunks, pushes_per_transaction))
+
+            # The next part of the data is paid for by the last change.
+            needs_change = next_batch or not self.complete
+
+            op_return_size = sum(get_op_return_size(chunk) for chunk in batch)
+            total_in = sum(unspent.amount for unspent in unspents)
+            total_out = estimate_tx_fee(len(unspents), 1, fee, compressed, op_return_size)
+            change = total_in - total_out
+
+            if change < 0:
+                raise InsufficientFunds('Balance {} is less than {} (including '
+                                        'fee).'.format(total_in, total_out))
+            elif change < DUST_LIMIT and needs_change:
+                raise InsufficientFunds('Balance {} leaves no change to fund the '
+                                        'next transaction.'.format(total_in))
+
+            # Change below the dust limit of the last transaction goes to miners.
+            outputs = [(address, change)] if change >= DUST_LIMIT else []
+            outputs.extend((chunk, 0) for chunk in batch)
+            output_block = construct_output_block(outputs, scripts=scripts)
+
+            tx = _create_p2pkh_transaction(
+                private_key, scriptcode, unspents, output_block, len(outputs),
+                workers=workers, executor=executor
+            )
+
+            unspents = [Unspent(change, 0, bytes_to_hex(scriptcode), calc_txid(tx), 0)]
+            self.change = unspents[0] if change >= DUST_LIMIT else None
+            self.consumed += sum(len(chunk) for chunk in batch)
+
+            yield bytes_to_hex(tx)
+
+            batch = next_batch
+
+
+def create_op_return_transactions(private_key, data, unspents, fee, compressed=True,
+                                  pushes_per_transaction=1, workers=None, executor=None,
+                                  max_chain=MAX_UNCONFIRMED_CHAIN, offset=0, allow_partial=False):
+    """Stores data in the blockchain in a chain of signed transactions.
+    Transactions are signed as they are consumed.
+
+    The first transaction spends all of ``unspents``. Every transaction pays
+    its change back to the key's address in output 0, which the next one
+    spends, so the transactions must be broadcast in order. As nodes reject
+    chains of more than ``max_chain`` unconfirmed transactions, larger data
+    must be stored in parts, each after the previous part confirmed. If any
+    of ``unspents`` is unconfirmed, the chain is one shorter.
+
+    To store data in parts, set ``allow_partial``. Once the chain confirmed,
+    call again with the same data, the chain's ``change`` as ``unspents`` and
+    its ``consumed`` as ``offset``.
+
+    :param private_key: The key that owns ``unspents``.
+    :type private_key: :class:`~bitcash.wallet.BaseKey`
+    :param data: The data to store. ``str`` is encoded as UTF-8.
+    :type data: ``bytes``, ``str``, a file-like object or an iterable of
+                ``bytes`` or ``str``
+    :param unspents: The UTXOs that pay for all of the transactions.
+    :type unspents: ``list`` of :class:`~bitcash.network.meta.Unspent`
+    :param fee: The number of satoshi per byte to pay to miners.
+    :type fee: ``int``
+    :param pushes_per_transaction: The number of OP_RETURN outputs of up to
+                                   220 bytes in each transaction. Nodes only
+                                   relay transactions with one by default.
+    :type pushes_per_transaction: ``int``
+    :param max_chain: The most unconfirmed transactions nodes accept in a
+                      chain, 25 by default.
+    :type max_chain: ``int``
+    :param offset: The bytes at the start of ``data`` that are already
+                   stored. Seekable files are seeked past them, other data is
+                   read and discarded.
+    :type offset: ``int``
+    :param allow_partial: Whether to store only as much of the data as one
+                          chain can, instead of raising ``ValueError``.
+    :type allow_partial: ``bool``
+    :raises ValueError: If the transactions would exceed the standard size,
+                        or if ``data`` needs more than ``max_chain``
+                        transactions and ``allow_partial`` is not set. Nothing
+                        is signed then, and at most one transaction's worth of
+                        data beyond the limit is read.
+    :raises InsufficientFunds: When ``unspents`` cannot pay for the next
+                               transaction, or would leave change below the
+                               dust limit to fund it. Transactions already
+                               yielded remain valid.
+    :rtype: :class:`~bitcash.transaction.OpReturnChain`
+    """
 
-    return bytes_to_hex(
-        version +
-        input_count +
-        construct_input_block(inputs) +
-        output_count +
-        output_block +
-        lock_time
+    op_return_size = get_op_return_size(bytes(MESSAGE_LIMIT)) * pushes_per_transaction
+    if (pushes_per_transaction < 1 or
+            estimate_tx_fee(1, 1, 1, compressed, op_return_size) > MAX_STANDARD_TX_SIZE):
+        raise ValueError('{} pushes per transaction is not '
+                         'supported.'.format(pushes_per_transaction))
+
+    unspents = list(unspents)
+    if any(unspent.confirmations == 0 for unspent in unspents):
+        max_chain -= 1
+
+    limit = max(max_chain, 0) * pushes_per_transaction
+    chunks = list(islice(_iter_chunks(data, MESSAGE_LIMIT, offset), limit + 1))
+    complete = len(chunks) <= limit
+    if not complete:
+        if not allow_partial:
+            raise ValueError('The data needs more than {} chained transactions, which '
+                             'nodes would reject. Set allow_partial to store it in '
+                             'parts.'.format(max_chain))
+        del chunks[limit:]
+
+    return OpReturnChain(
+        private_key, iter(chunks), unspents, fee, compressed,
+        pushes_per_transaction, workers, executor, offset, complete
     )
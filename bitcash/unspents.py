@@ -0,0 +1,102 @@
+from time import time
+
+from bitcash.deserialize import TxView, deserialize_transaction
+from bitcash.network.meta import Unspent
+from bitcash.utils import bytes_to_hex
+
+# Seconds to trust local changes that services have not reported yet.
+DEFAULT_GRACE_PERIOD = 600
+
+
+class UnspentTracker:
+    """Keeps the unspents of an address up to date between calls to a
+    service. Transactions are applied as they are broadcast: the outputs
+    they spend are hidden and the outputs paying ``script`` are added as
+    unconfirmed. Any list of unspents, such as one just fetched from a
+    service, can then be corrected with
+    :func:`~bitcash.unspents.UnspentTracker.reconcile`.
+
+    :param script: The locking script of the tracked address.
+    :type script: ``bytes``
+    :param grace_period: How long in seconds local changes are applied to
+                         unspents that do not reflect them. After this, the
+                         transaction is assumed to have been dropped.
+    :type grace_period: ``int``
+    """
+    __slots__ = ('script', 'grace_period', '_spent', '_created')
+
+    def __init__(self, script, grace_period=DEFAULT_GRACE_PERIOD):
+        self.script = script
+        self.grace_period = grace_period
+        self._spent = {}
+        self._created = {}
+
+    def apply(self, tx):
+        """Records a transaction that was broadcast.
+
+        :param tx: The signed transaction.
+        :type tx: ``str``, ``bytes`` or :class:`~bitcash.deserialize.TxView`
+        """
+        if not isinstance(tx, TxView):
+            tx = deserialize_transaction(tx)
+
+        now = time()
+        txid = tx.txid
+
+        for txin in tx.inputs:
+            self._spent[(txin.txid, txin.txindex)] = now
+
+        for txindex, txout in enumerate(tx.outputs):
+            if txout.script == self.script:
+                unspent = Unspent(txout.amount, 0, bytes_to_hex(self.script), txid, txindex)
+                self._created[(txid, txindex)] = (unspent, now)
+
+    def reconcile(self, unspents):
+        """Applies the recorded transactions to some unspents.
+
+        :param unspents: The unspents of the address, possibly out of date.
+        :type unspents: ``list`` of :class:`~bitcash.network.meta.Unspent`
+        :returns: ``unspents`` without the outputs that were spent, followed
+                  by the new outputs not included in ``unspents``.
+        :rtype: ``list`` of :class:`~bitcash.network.meta.Unspent`
+        """
+        self._expire()
+
+        spent = self._spent
+        reconciled = []
+        known = set()
+
+        for unspent in unspents:
+            outpoint = (unspent.txid, unspent.txindex)
+            known.add(outpoint)
+            if outpoint not in spent:
+                reconciled.append(unspent)
+
+        for outpoint, (unspent, _) in list(self._created.items()):
+            # Once reported, the service's copy is the authoritative one.
+            if outpoint in known:
+                del self._created[outpoint]
+            elif outpoint not in spent:
+                reconciled.append(unspent)
+
+        return reconciled
+
+    def clear(self):
+        """Forgets all recorded transactions."""
+        self._spent.clear()
+        self._created.clear()
+
+    def _expire(self):
+        cutoff = time() - self.grace_period
+
+        for outpoint in [outpoint for outpoint, at in self._spent.items() if at < cutoff]:
+            del self._spent[outpoint]
+
+        for outpoint in [outpoint for outpoint, (_, at) in self._created.items() if at < cutoff]:
+            del self._created[outpoint]
+
+    def __len__(self):
+        return len(self._spent) + len(self._created)
+
+    def __repr__(self):
+        return 'UnspentTracker(spent={}, created={})'.format(len(self._spent), len(self._created))
@@ -1,17 +1,22 @@
+import asyncio
 import json
+from functools import partial
 
-from bitcash.crypto import ECPrivateKey
+from bitcash.coinselect import SMALLEST_FIRST
+from bitcash.crypto import ECPrivateKey, ripemd160_sha256
 from bitcash.curve import Point
-from bitcash.format import (
-    bytes_to_wif, public_key_to_address, public_key_to_coords, wif_to_bytes,
-    address_to_public_key_hash
-)
+from bitcash.format import bytes_to_wif, encode_address, public_key_to_coords, wif_to_bytes
 from bitcash.network import NetworkAPI, get_fee, satoshi_to_currency_cached
+from bitcash.network.aio import AsyncNetworkAPI
+from bitcash.network.history import DEFAULT_PAGE_SIZE, TransactionHistory
 from bitcash.network.meta import Unspent
 from bitcash.transaction import (
-    calc_txid, create_p2pkh_transaction, sanitize_tx_data,
+    calc_txid, create_op_return_transactions, create_p2pkh_transaction,
+    create_p2pkh_transactions, sanitize_tx_data,
     OP_CHECKSIG, OP_DUP, OP_EQUALVERIFY, OP_HASH160, OP_PUSH_20
     )
+from bitcash.tracing import BROADCAST, CREATE, SEND, span
+from bitcash.unspents import UnspentTracker
 
 
 def wif_to_key(wif):
@@ -41,6 +46,8 @@ class BaseKey:
     :type wif: ``str``
     :raises TypeError: If ``wif`` is not a ``str``.
     """
+    __slots__ = ('_pk', '_public_key', '_public_point', '_public_key_hash')
+
     def __init__(self, wif=None):
         if wif:
             if isinstance(wif, str):
@@ -56,6 +63,7 @@ class BaseKey:
             compressed = True
 
         self._public_point = None
+        self._public_key_hash = None
         self._public_key = self._pk.public_key.format(compressed=compressed)
 
     @property
@@ -70,6 +78,13 @@ class BaseKey:
             self._public_point = Point(*public_key_to_coords(self._public_key))
         return self._public_point
 
+    @property
+    def public_key_hash(self):
+        """The hash160 of the public key, which addresses pay to."""
+        if self._public_key_hash is None:
+            self._public_key_hash = ripemd160_sha256(self._public_key)
+        return self._public_key_hash
+
     def sign(self, data):
         """Signs some data which can be verified later by others using
         the public key.
@@ -135,11 +150,14 @@ class PrivateKey(BaseKey):
     :raises TypeError: If ``wif`` is not a ``str``.
     """
 
+    __slots__ = ('_address', '_scriptcode', '_tracker', 'balance', 'unspents', 'transactions')
+
     def __init__(self, wif=None):
         super().__init__(wif=wif)
 
         self._address = None
         self._scriptcode = None
+        self._tracker = None
 
         self.balance = 0
         self.unspents = []
@@ -149,17 +167,28 @@ class PrivateKey(BaseKey):
     def address(self):
         """The public address you share with others to receive funds."""
         if self._address is None:
-            self._address = public_key_to_address(self._public_key, version='main')
+            self._address = encode_address(self.public_key_hash, version='main')
 
         return self._address
 
     @property
     def scriptcode(self):
-        self._scriptcode = (OP_DUP + OP_HASH160 + OP_PUSH_20 +
-                            address_to_public_key_hash(self.address) +
-                            OP_EQUALVERIFY + OP_CHECKSIG)
+        """The script locking coins sent to :attr:`address` (its scriptPubKey),
+        which is also the scriptCode signed when spending them."""
+        if self._scriptcode is None:
+            self._scriptcode = (OP_DUP + OP_HASH160 + OP_PUSH_20 +
+                                self.public_key_hash +
+                                OP_EQUALVERIFY + OP_CHECKSIG)
         return self._scriptcode
 
+    @property
+    def tracker(self):
+        """The :class:`~bitcash.unspents.UnspentTracker` that keeps
+        :attr:`unspents` up to date with the transactions sent by this key."""
+        if self._tracker is None:
+            self._tracker = UnspentTracker(self.scriptcode)
+        return self._tracker
+
     def to_wif(self):
         return bytes_to_wif(
             self._pk.secret,
@@ -185,7 +214,7 @@ class PrivateKey(BaseKey):
         :type currency: ``str``
         :rtype: ``str``
         """
-        self.unspents[:] = NetworkAPI.get_unspent(self.address)
+        self.unspents[:] = self.tracker.reconcile(NetworkAPI.get_unspent(self.address))
         self.balance = sum(unspent.amount for unspent in self.unspents)
         return self.balance_as(currency)
 
@@ -194,7 +223,7 @@ class PrivateKey(BaseKey):
 
         :rtype: ``list`` of :class:`~bitcash.network.meta.Unspent`
         """
-        self.unspents[:] = NetworkAPI.get_unspent(self.address)
+        self.unspents[:] = self.tracker.reconcile(NetworkAPI.get_unspent(self.address))
         self.balance = sum(unspent.amount for unspent in self.unspents)
         return self.unspents
 
@@ -206,8 +235,31 @@ class PrivateKey(BaseKey):
         self.transactions[:] = NetworkAPI.get_transactions(self.address)
         return self.transactions
 
+    def iter_transactions(self, page_size=DEFAULT_PAGE_SIZE, since_height=None,
+                          until_height=None, hydrate=False):
+        """Iterates lazily over the transaction history, newest first,
+        without storing it in :attr:`transactions`. Suited to addresses with
+        very long histories.
+
+        :param page_size: Transactions fetched at once when hydrating.
+        :type page_size: ``int``
+        :param since_height: Stop at transactions confirmed below this block
+                             height.
+        :type since_height: ``int``
+        :param until_height: Skip transactions confirmed above this block
+                             height, and unconfirmed ones.
+        :type until_height: ``int``
+        :param hydrate: Yield :class:`~bitcash.network.transaction.Transaction`
+                        objects instead of transaction IDs.
+        :type hydrate: ``bool``
+        :rtype: :class:`~bitcash.network.history.TransactionHistory`
+        """
+        return TransactionHistory(self.address, page_size, since_height, until_height,
+                                  hydrate, testnet=False)
+
     def create_transaction(self, outputs, fee=None, leftover=None, combine=True,
-                           message=None, unspents=None, custom_pushdata=False):  # pragma: no cover
+                           message=None, unspents=None, custom_pushdata=False,
+                           strategy=SMALLEST_FIRST):  # pragma: no cover
         """Creates a signed P2PKH transaction.
 
         :param outputs: A sequence of outputs you wish to send in the form
@@ -236,28 +288,106 @@ class PrivateKey(BaseKey):
         :param unspents: The UTXOs to use as the inputs. By default Bitcash will
                          communicate with the blockchain itself.
         :type unspents: ``list`` of :class:`~bitcash.network.meta.Unspent`
+        :param strategy: How to choose UTXOs when not combining them: one of
+                         ``'smallest'``, ``'largest'``, ``'bnb'`` or ``'random'``.
+                         See :func:`~bitcash.coinselect.select_coins`.
+        :type strategy: ``str``
         :returns: The signed transaction as hex.
         :rtype: ``str``
         """
 
-        unspents, outputs = sanitize_tx_data(
+        with span(CREATE):
+            unspents, outputs = sanitize_tx_data(
+                unspents or self.unspents,
+                outputs,
+                fee or get_fee(),
+                leftover or self.address,
+                combine=combine,
+                message=message,
+                compressed=self.is_compressed(),
+                custom_pushdata=custom_pushdata,
+                strategy=strategy
+            )
+
+            return create_p2pkh_transaction(self, unspents, outputs, custom_pushdata=custom_pushdata)
+
+    def create_transactions(self, output_sets, fee=None, leftover=None,
+                            message=None, unspents=None):  # pragma: no cover
+        """Creates many signed P2PKH transactions at once, e.g. for a payout
+        run. Each transaction spends different UTXOs. This accepts the same
+        arguments as :func:`~bitcash.PrivateKey.create_transaction` except that
+        UTXOs are never combined.
+
+        :param output_sets: The outputs of each transaction, in the form
+                            ``(destination, amount, currency)``.
+        :type output_sets: ``list`` of ``list`` of ``tuple``
+        :param unspents: The UTXOs to use as the inputs. By default Bitcash will
+                         communicate with the blockchain itself.
+        :type unspents: ``list`` of :class:`~bitcash.network.meta.Unspent`
+        :returns: The signed transactions as hex.
+        :rtype: ``list`` of ``str``
+        """
+
+        return create_p2pkh_transactions(
+            self,
+            output_sets,
             unspents or self.unspents,
-            outputs,
             fee or get_fee(),
-            leftover or self.address,
-            combine=combine,
+            leftover=leftover or self.address,
             message=message,
-            compressed=self.is_compressed(),
-            custom_pushdata=custom_pushdata
+            compressed=self.is_compressed()
         )
 
-        return create_p2pkh_transaction(self, unspents, outputs, custom_pushdata=custom_pushdata)
+    def create_op_return_transactions(self, data, fee=None, unspents=None, offset=0,
+                                      allow_partial=False):  # pragma: no cover
+        """Creates signed transactions that store data on the blockchain, 220
+        bytes per transaction. Each transaction spends the change of the
+        previous one, so they must be broadcast in order. Nodes accept at most
+        25 unconfirmed transactions in a chain, so larger data must be stored
+        in parts with ``allow_partial`` and ``offset``. See
+        :func:`~bitcash.transaction.create_op_return_transactions`.
+
+        :param data: The data to store, e.g. a file opened in binary mode.
+                     ``str`` is encoded as UTF-8.
+        :type data: ``bytes``, ``str``, a file-like object or an iterable of
+                    ``bytes`` or ``str``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bitcash will poll `<https://bitcoincashfees.earn.com>`_ and use a fee
+                    that will allow your transaction to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param unspents: The UTXOs that pay for all of the transactions. By
+                         default Bitcash will communicate with the blockchain
+                         itself.
+        :type unspents: ``list`` of :class:`~bitcash.network.meta.Unspent`
+        :param offset: The bytes at the start of ``data`` that are already
+                       stored, e.g. the ``consumed`` of the previous part.
+        :type offset: ``int``
+        :param allow_partial: Whether to store only as much of the data as one
+                              chain can, instead of raising ``ValueError``.
+        :type allow_partial: ``bool``
+        :returns: The signed transactions as hex. They are signed as they are
+                  consumed.
+        :rtype: :class:`~bitcash.transaction.OpReturnChain`
+        """
+
+        return create_op_return_transactions(
+            self,
+            data,
+            unspents or self.unspents,
+            fee or get_fee(),
+            compressed=self.is_compressed(),
+            offset=offset,
+            allow_partial=allow_partial
+        )
 
     def send(self, outputs, fee=None, leftover=None, combine=True,
              message=None, unspents=None):  # pragma: no cover
         """Creates a signed P2PKH transaction and attempts to broadcast it on
         the blockchain. This accepts the same arguments as
-        :func:`~bitcash.PrivateKey.create_transaction`.
+        :func:`~bitcash.PrivateKey.create_transaction`. Afterwards the spent
+        UTXOs are removed from ``unspents`` and any change is added, so more
+        transactions can be sent without fetching UTXOs again.
 
         :param outputs: A sequence of outputs you wish to send in the form
                         ``(destination, amount, currency)``. The amount can
@@ -289,11 +419,17 @@ class PrivateKey(BaseKey):
         :rtype: ``str``
         """
 
-        tx_hex = self.create_transaction(
-            outputs, fee=fee, leftover=leftover, combine=combine, message=message, unspents=unspents
-        )
+        with span(SEND, testnet=False):
+            tx_hex = self.create_transaction(
+                outputs, fee=fee, leftover=leftover, combine=combine, message=message, unspents=unspents
+            )
+
+            with span(BROADCAST, size=len(tx_hex) // 2):
+                NetworkAPI.broadcast_tx(tx_hex)
 
-        NetworkAPI.broadcast_tx(tx_hex)
+            self.tracker.apply(tx_hex)
+            self.unspents[:] = self.tracker.reconcile(self.unspents)
+            self.balance = sum(unspent.amount for unspent in self.unspents)
 
         return calc_txid(tx_hex)
 
@@ -430,11 +566,14 @@ class PrivateKeyTestnet(BaseKey):
     :raises TypeError: If ``wif`` is not a ``str``.
     """
 
+    __slots__ = ('_address', '_scriptcode', '_tracker', 'balance', 'unspents', 'transactions')
+
     def __init__(self, wif=None):
         super().__init__(wif=wif)
 
         self._address = None
         self._scriptcode = None
+        self._tracker = None
 
         self.balance = 0
         self.unspents = []
@@ -444,17 +583,28 @@ class PrivateKeyTestnet(BaseKey):
     def address(self):
         """The public address you share with others to receive funds."""
         if self._address is None:
-            self._address = public_key_to_address(self._public_key, version='test')
+            self._address = encode_address(self.public_key_hash, version='test')
 
         return self._address
 
     @property
     def scriptcode(self):
-        self._scriptcode = (OP_DUP + OP_HASH160 + OP_PUSH_20 +
-                            address_to_public_key_hash(self.address) +
-                            OP_EQUALVERIFY + OP_CHECKSIG)
+        """The script locking coins sent to :attr:`address` (its scriptPubKey),
+        which is also the scriptCode signed when spending them."""
+        if self._scriptcode is None:
+            self._scriptcode = (OP_DUP + OP_HASH160 + OP_PUSH_20 +
+                                self.public_key_hash +
+                                OP_EQUALVERIFY + OP_CHECKSIG)
         return self._scriptcode
 
+    @property
+    def tracker(self):
+        """The :class:`~bitcash.unspents.UnspentTracker` that keeps
+        :attr:`unspents` up to date with the transactions sent by this key."""
+        if self._tracker is None:
+            self._tracker = UnspentTracker(self.scriptcode)
+        return self._tracker
+
     def to_wif(self):
         return bytes_to_wif(
             self._pk.secret,
@@ -481,7 +631,7 @@ class PrivateKeyTestnet(BaseKey):
         :type currency: ``str``
         :rtype: ``str``
         """
-        self.unspents[:] = NetworkAPI.get_unspent_testnet(self.address)
+        self.unspents[:] = self.tracker.reconcile(NetworkAPI.get_unspent_testnet(self.address))
         self.balance = sum(unspent.amount for unspent in self.unspents)
         return self.balance
 
@@ -490,7 +640,7 @@ class PrivateKeyTestnet(BaseKey):
 
         :rtype: ``list`` of :class:`~bitcash.network.meta.Unspent`
         """
-        self.unspents[:] = NetworkAPI.get_unspent_testnet(self.address)
+        self.unspents[:] = self.tracker.reconcile(NetworkAPI.get_unspent_testnet(self.address))
         self.balance = sum(unspent.amount for unspent in self.unspents)
         return self.unspents
 
@@ -502,8 +652,31 @@ class PrivateKeyTestnet(BaseKey):
         self.transactions[:] = NetworkAPI.get_transactions_testnet(self.address)
         return self.transactions
 
+    def iter_transactions(self, page_size=DEFAULT_PAGE_SIZE, since_height=None,
+                          until_height=None, hydrate=False):
+        """Iterates lazily over the transaction history, newest first,
+        without storing it in :attr:`transactions`. Suited to addresses with
+        very long histories.
+
+        :param page_size: Transactions fetched at once when hydrating.
+        :type page_size: ``int``
+        :param since_height: Stop at transactions confirmed below this block
+                             height.
+        :type since_height: ``int``
+        :param until_height: Skip transactions confirmed above this block
+                             height, and unconfirmed ones.
+        :type until_height: ``int``
+        :param hydrate: Yield :class:`~bitcash.network.transaction.Transaction`
+                        objects instead of transaction IDs.
+        :type hydrate: ``bool``
+        :rtype: :class:`~bitcash.network.history.TransactionHistory`
+        """
+        return TransactionHistory(self.address, page_size, since_height, until_height,
+                                  hydrate, testnet=True)
+
     def create_transaction(self, outputs, fee=None, leftover=None, combine=True,
-                           message=None, unspents=None, custom_pushdata=False):
+                           message=None, unspents=None, custom_pushdata=False,
+                           strategy=SMALLEST_FIRST):
         """Creates a signed P2PKH transaction.
 
         :param outputs: A sequence of outputs you wish to send in the form
@@ -532,28 +705,106 @@ class PrivateKeyTestnet(BaseKey):
         :param unspents: The UTXOs to use as the inputs. By default Bitcash will
                          communicate with the testnet blockchain itself.
         :type unspents: ``list`` of :class:`~bitcash.network.meta.Unspent`
+        :param strategy: How to choose UTXOs when not combining them: one of
+                         ``'smallest'``, ``'largest'``, ``'bnb'`` or ``'random'``.
+                         See :func:`~bitcash.coinselect.select_coins`.
+        :type strategy: ``str``
         :returns: The signed transaction as hex.
         :rtype: ``str``
         """
 
-        unspents, outputs = sanitize_tx_data(
+        with span(CREATE):
+            unspents, outputs = sanitize_tx_data(
+                unspents or self.unspents,
+                outputs,
+                fee or get_fee(),
+                leftover or self.address,
+                combine=combine,
+                message=message,
+                compressed=self.is_compressed(),
+                custom_pushdata=custom_pushdata,
+                strategy=strategy
+            )
+
+            return create_p2pkh_transaction(self, unspents, outputs, custom_pushdata=custom_pushdata)
+
+    def create_transactions(self, output_sets, fee=None, leftover=None,
+                            message=None, unspents=None):
+        """Creates many signed P2PKH transactions at once, e.g. for a payout
+        run. Each transaction spends different UTXOs. This accepts the same
+        arguments as :func:`~bitcash.PrivateKeyTestnet.create_transaction` except that
+        UTXOs are never combined.
+
+        :param output_sets: The outputs of each transaction, in the form
+                            ``(destination, amount, currency)``.
+        :type output_sets: ``list`` of ``list`` of ``tuple``
+        :param unspents: The UTXOs to use as the inputs. By default Bitcash will
+                         communicate with the testnet blockchain itself.
+        :type unspents: ``list`` of :class:`~bitcash.network.meta.Unspent`
+        :returns: The signed transactions as hex.
+        :rtype: ``list`` of ``str``
+        """
+
+        return create_p2pkh_transactions(
+            self,
+            output_sets,
             unspents or self.unspents,
-            outputs,
             fee or get_fee(),
-            leftover or self.address,
-            combine=combine,
+            leftover=leftover or self.address,
             message=message,
-            compressed=self.is_compressed(),
-            custom_pushdata=custom_pushdata
+            compressed=self.is_compressed()
         )
 
-        return create_p2pkh_transaction(self, unspents, outputs, custom_pushdata=custom_pushdata)
+    def create_op_return_transactions(self, data, fee=None, unspents=None, offset=0,
+                                      allow_partial=False):
+        """Creates signed transactions that store data on the blockchain, 220
+        bytes per transaction. Each transaction spends the change of the
+        previous one, so they must be broadcast in order. Nodes accept at most
+        25 unconfirmed transactions in a chain, so larger data must be stored
+        in parts with ``allow_partial`` and ``offset``. See
+        :func:`~bitcash.transaction.create_op_return_transactions`.
+
+        :param data: The data to store, e.g. a file opened in binary mode.
+                     ``str`` is encoded as UTF-8.
+        :type data: ``bytes``, ``str``, a file-like object or an iterable of
+                    ``bytes`` or ``str``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bitcash will poll `<https://bitcoincashfees.earn.com>`_ and use a fee
+                    that will allow your transaction to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param unspents: The UTXOs that pay for all of the transactions. By
+                         default Bitcash will communicate with the blockchain
+                         itself.
+        :type unspents: ``list`` of :class:`~bitcash.network.meta.Unspent`
+        :param offset: The bytes at the start of ``data`` that are already
+                       stored, e.g. the ``consumed`` of the previous part.
+        :type offset: ``int``
+        :param allow_partial: Whether to store only as much of the data as one
+                              chain can, instead of raising ``ValueError``.
+        :type allow_partial: ``bool``
+        :returns: The signed transactions as hex. They are signed as they are
+                  consumed.
+        :rtype: :class:`~bitcash.transaction.OpReturnChain`
+        """
+
+        return create_op_return_transactions(
+            self,
+            data,
+            unspents or self.unspents,
+            fee or get_fee(),
+            compressed=self.is_compressed(),
+            offset=offset,
+            allow_partial=allow_partial
+        )
 
     def send(self, outputs, fee=None, leftover=None, combine=True,
              message=None, unspents=None):
         """Creates a signed P2PKH transaction and attempts to broadcast it on
         the testnet blockchain. This accepts the same arguments as
-        :func:`~bitcash.PrivateKeyTestnet.create_transaction`.
+        :func:`~bitcash.PrivateKeyTestnet.create_transaction`. Afterwards the
+        spent UTXOs are removed from ``unspents`` and any change is added, so
+        more transactions can be sent without fetching UTXOs again.
 
         :param outputs: A sequence of outputs you wish to send in the form
                         ``(destination, amount, currency)``. The amount can
@@ -585,11 +836,17 @@ class PrivateKeyTestnet(BaseKey):
         :rtype: ``str``
         """
 
-        tx_hex = self.create_transaction(
-            outputs, fee=fee, leftover=leftover, combine=combine, message=message, unspents=unspents
-        )
+        with span(SEND, testnet=True):
+            tx_hex = self.create_transaction(
+                outputs, fee=fee, leftover=leftover, combine=combine, message=message, unspents=unspents
+            )
 
-        NetworkAPI.broadcast_tx_testnet(tx_hex)
+            with span(BROADCAST, size=len(tx_hex) // 2):
+                NetworkAPI.broadcast_tx_testnet(tx_hex)
+
+            self.tracker.apply(tx_hex)
+            self.unspents[:] = self.tracker.reconcile(self.unspents)
+            self.balance = sum(unspent.amount for unspent in self.unspents)
 
         return calc_txid(tx_hex)
 
@@ -714,4 +971,105 @@ class PrivateKeyTestnet(BaseKey):
         return '<PrivateKeyTestnet: {}>'.format(self.address)
 
 
+class AsyncKey:
+    """Wraps a :class:`~bitcash.PrivateKey` or
+    :class:`~bitcash.PrivateKeyTestnet` with coroutine versions of the methods
+    that use the network, so one event loop can serve many keys. They update
+    the wrapped key exactly like their blocking counterparts. All other
+    attributes are those of the wrapped key. Requires ``aiohttp``, see
+    ``pip install bitcash[async]``.
+
+    >>> key = AsyncKey(PrivateKey(wif))
+    >>> await key.get_unspents()
+    >>> await key.send([('bitcoincash:...', 1000, 'satoshi')])
+
+    :param key: The key to wrap.
+    :type key: :class:`~bitcash.PrivateKey` or :class:`~bitcash.PrivateKeyTestnet`
+    """
+    __slots__ = ('key', )
+
+    def __init__(self, key):
+        self.key = key
+
+    def __getattr__(self, name):
+        return getattr(self.key, name)
+
+    def _is_testnet(self):
+        return isinstance(self.key, PrivateKeyTestnet)
+
+    async def get_balance(self, currency='satoshi'):
+        """Fetches the current balance by calling
+        :func:`~bitcash.wallet.AsyncKey.get_unspents`. On the main network it
+        is returned using :func:`~bitcash.PrivateKey.balance_as`.
+
+        :param currency: One of the :ref:`supported currencies`.
+        :type currency: ``str``
+        :rtype: ``str``
+        """
+        await self.get_unspents()
+
+        if self._is_testnet():
+            return self.key.balance
+        return self.key.balance_as(currency)
+
+    async def get_unspents(self):
+        """Fetches all available unspent transaction outputs.
+
+        :rtype: ``list`` of :class:`~bitcash.network.meta.Unspent`
+        """
+        key = self.key
+        if self._is_testnet():
+            unspents = await AsyncNetworkAPI.get_unspent_testnet(key.address)
+        else:
+            unspents = await AsyncNetworkAPI.get_unspent(key.address)
+
+        key.unspents[:] = key.tracker.reconcile(unspents)
+        key.balance = sum(unspent.amount for unspent in key.unspents)
+        return key.unspents
+
+    async def get_transactions(self):
+        """Fetches transaction history.
+
+        :rtype: ``list`` of ``str`` transaction IDs
+        """
+        key = self.key
+        if self._is_testnet():
+            key.transactions[:] = await AsyncNetworkAPI.get_transactions_testnet(key.address)
+        else:
+            key.transactions[:] = await AsyncNetworkAPI.get_transactions(key.address)
+        return key.transactions
+
+    async def send(self, outputs, fee=None, leftover=None, combine=True,
+                   message=None, unspents=None):
+        """Creates a signed P2PKH transaction and attempts to broadcast it.
+        This accepts the same arguments as
+        :func:`~bitcash.PrivateKey.send`, and likewise updates ``unspents``
+        and ``balance`` afterwards. The transaction is created in the loop's
+        default executor, as the fee and exchange rates may be fetched and
+        signing many inputs takes a while.
+
+        :returns: The transaction ID.
+        :rtype: ``str``
+        """
+        key = self.key
+        tx_hex = await asyncio.get_event_loop().run_in_executor(None, partial(
+            key.create_transaction,
+            outputs, fee=fee, leftover=leftover, combine=combine, message=message, unspents=unspents
+        ))
+
+        if self._is_testnet():
+            await AsyncNetworkAPI.broadcast_tx_testnet(tx_hex)
+        else:
+            await AsyncNetworkAPI.broadcast_tx(tx_hex)
+
+        key.tracker.apply(tx_hex)
+        key.unspents[:] = key.tracker.reconcile(key.unspents)
+        key.balance = sum(unspent.amount for unspent in key.unspents)
+
+        return calc_txid(tx_hex)
+
+    def __repr__(self):
+        return '<AsyncKey: {}>'.format(self.key.address)
+
+
 Key = PrivateKey
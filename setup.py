@@ -52,6 +52,8 @@ setup(
     extras_require={
         'cli': ('appdirs', 'click', 'privy', 'tinydb'),
         'cache': ('lmdb', ),
+        'bulk': ('numpy', ),
+        'async': ('aiohttp', ),
     },
     tests_require=['pytest'],
 
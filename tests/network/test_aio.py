@@ -0,0 +1,187 @@
+import asyncio
+import threading
+
+import pytest
+
+from bitcash.network import aio
+from bitcash.network.aio import (
+    AsyncBitcoinDotComAPI, AsyncBitcoreAPI, AsyncNetworkAPI, close_session, get_session
+)
+from bitcash.network.meta import Unspent
+from bitcash.transaction import calc_txid
+from bitcash.utils import bytes_to_hex
+from bitcash.wallet import AsyncKey, PrivateKeyTestnet
+from tests.samples import WALLET_FORMAT_TEST
+
+RETURN_ADDRESS = 'n2eMqTT929pb1RDNuqEnxdaLau1rxy3efi'
+TXID = 'f3ad23dac2a3546167b27a43ac3e370236caf93f75bfcf27c625ec839d397888'
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def returning(result, calls=None):
+    async def api_call(*args):
+        if calls is not None:
+            calls.append(args)
+        await asyncio.sleep(0)
+        return result
+    return api_call
+
+
+async def unreachable(*args):
+    raise asyncio.TimeoutError
+
+
+class TestAsyncNetworkAPI:
+    def test_failover(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(AsyncNetworkAPI, 'GET_BALANCE_MAIN', [unreachable, returning(5, calls)])
+
+        assert run(AsyncNetworkAPI.get_balance('address')) == 5
+        assert calls == [('address', )]
+
+    def test_all_unreachable(self, monkeypatch):
+        monkeypatch.setattr(AsyncNetworkAPI, 'GET_TX_TEST', [unreachable, unreachable])
+
+        with pytest.raises(ConnectionError):
+            run(AsyncNetworkAPI.get_transaction_testnet(TXID))
+
+    def test_other_errors_propagate(self, monkeypatch):
+        async def broken(address):
+            raise KeyError('utxos')
+
+        monkeypatch.setattr(AsyncNetworkAPI, 'GET_UNSPENT_MAIN', [broken, returning([])])
+
+        with pytest.raises(KeyError):
+            run(AsyncNetworkAPI.get_unspent('address'))
+
+    def test_broadcast_rejected(self, monkeypatch):
+        monkeypatch.setattr(AsyncNetworkAPI, 'BROADCAST_TX_MAIN', [returning(False), unreachable])
+
+        with pytest.raises(ConnectionError, match='broadcast failed'):
+            run(AsyncNetworkAPI.broadcast_tx('00'))
+
+    def test_concurrent(self, monkeypatch):
+        in_flight = []
+        most = []
+
+        async def slow(address):
+            in_flight.append(address)
+            most.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(address)
+            return [address]
+
+        monkeypatch.setattr(AsyncNetworkAPI, 'GET_TRANSACTIONS_MAIN', [slow])
+
+        async def fetch_all():
+            return await asyncio.gather(*[AsyncNetworkAPI.get_transactions(str(i)) for i in range(100)])
+
+        assert run(fetch_all()) == [[str(i)] for i in range(100)]
+        assert max(most) == 100
+
+
+class TestServices:
+    def test_parsing_shared(self, monkeypatch):
+        urls = []
+
+        async def get_json(url, loads=None):
+            urls.append(url)
+            return {'scriptPubKey': '76a914', 'utxos': [
+                {'amount': 0.001, 'confirmations': 3, 'txid': TXID, 'vout': 1}
+            ]}
+
+        monkeypatch.setattr(aio, '_get_json', get_json)
+
+        assert run(AsyncBitcoinDotComAPI.get_unspent('bitcoincash:qq')) == [
+            Unspent(100000, 3, '76a914', TXID, 1)
+        ]
+        assert urls == ['https://rest.bitcoin.com/v2/address/utxo/bitcoincash:qq']
+
+    def test_bitcore_address_prefix(self, monkeypatch):
+        urls = []
+
+        async def get_json(url, loads=None):
+            urls.append(url)
+            return [{'mintTxid': TXID}]
+
+        monkeypatch.setattr(aio, '_get_json', get_json)
+
+        assert run(AsyncBitcoreAPI.get_transactions_testnet('bchtest:qq')) == [TXID]
+        assert urls == ['https://api.bitcore.io/api/BCH/testnet/address/qq']
+
+
+class TestSession:
+    def test_one_per_loop(self):
+        pytest.importorskip('aiohttp')
+
+        async def sessions():
+            first, second = get_session(), get_session()
+            await close_session()
+            return first, second
+
+        first, second = run(sessions())
+        assert first is second
+        assert first.closed
+        assert run(sessions())[0] is not first
+
+    def test_requires_running_loop(self):
+        pytest.importorskip('aiohttp')
+
+        with pytest.raises(RuntimeError):
+            get_session()
+
+
+class TestAsyncKey:
+    def setup_method(self):
+        self.key = PrivateKeyTestnet(WALLET_FORMAT_TEST)
+        self.unspents = [Unspent(100000, 10, bytes_to_hex(self.key.scriptcode), TXID, 0)]
+
+    def test_attributes(self):
+        key = AsyncKey(self.key)
+        assert key.address == self.key.address
+        assert key.unspents is self.key.unspents
+
+    def test_get_balance(self, monkeypatch):
+        monkeypatch.setattr(AsyncNetworkAPI, 'GET_UNSPENT_TEST', [returning(self.unspents)])
+
+        assert run(AsyncKey(self.key).get_balance()) == 100000
+        assert self.key.unspents == self.unspents
+
+    def test_get_transactions(self, monkeypatch):
+        monkeypatch.setattr(AsyncNetworkAPI, 'GET_TRANSACTIONS_TEST', [returning([TXID])])
+
+        assert run(AsyncKey(self.key).get_transactions()) == [TXID]
+        assert self.key.transactions == [TXID]
+
+    def test_send(self, monkeypatch):
+        broadcast = []
+        monkeypatch.setattr(AsyncNetworkAPI, 'BROADCAST_TX_TEST', [returning(True, broadcast)])
+        self.key.unspents[:] = self.unspents
+
+        txid = run(AsyncKey(self.key).send([(RETURN_ADDRESS, 10000, 'satoshi')], fee=1))
+
+        assert calc_txid(broadcast[0][0]) == txid
+        assert [unspent.txid for unspent in self.key.unspents] == [txid]
+
+    def test_send_does_not_block_loop(self, monkeypatch):
+        threads = []
+        create_transaction = PrivateKeyTestnet.create_transaction
+
+        def creating(key, *args, **kwargs):
+            threads.append(threading.current_thread())
+            return create_transaction(key, *args, **kwargs)
+
+        monkeypatch.setattr(PrivateKeyTestnet, 'create_transaction', creating)
+        monkeypatch.setattr(AsyncNetworkAPI, 'BROADCAST_TX_TEST', [returning(True)])
+        self.key.unspents[:] = self.unspents
+
+        run(AsyncKey(self.key).send([(RETURN_ADDRESS, 10000, 'satoshi')], fee=1))
+
+        assert threads and threads[0] is not threading.current_thread()
@@ -0,0 +1,221 @@
+import pickle
+import time
+from decimal import Decimal
+
+import pytest
+
+import bitcash
+from bitcash.network import NetworkAPI
+from bitcash.network.cache import (
+    LMDBCache, SQLiteCache, dumps, loads, set_mutable_cache_time,
+    set_network_cache, until_confirmed
+)
+from bitcash.network.meta import Unspent
+from bitcash.network.transaction import Transaction, TxPart
+
+TXID = '9bccb8d6adf53ca49cea02118871e29d3b4e5cb157dc3a475dd364e30fb20993'
+
+
+@pytest.fixture(params=['sqlite', 'lmdb'])
+def make_cache(request, tmp_path):
+    if request.param == 'lmdb':
+        pytest.importorskip('lmdb')
+
+    caches = []
+
+    def make(max_size=1024 * 1024):
+        if request.param == 'sqlite':
+            cache = SQLiteCache(str(tmp_path / 'cache.db'), max_size=max_size)
+        else:
+            cache = LMDBCache(str(tmp_path / 'cache'), max_size=max_size)
+        caches.append(cache)
+        return cache
+
+    yield make
+
+    for cache in caches:
+        cache.close()
+
+
+@pytest.fixture
+def network_cache_enabled(make_cache):
+    cache = make_cache()
+    set_network_cache(cache)
+    yield cache
+    set_network_cache(None)
+    set_mutable_cache_time(10)
+
+
+class TestBackends:
+    def test_get_set(self, make_cache):
+        cache = make_cache()
+        assert cache.get('a') is None
+        cache.set('a', b'value')
+        assert cache.get('a') == b'value'
+        cache.set('a', b'other')
+        assert cache.get('a') == b'other'
+        assert len(cache) == 1
+
+    def test_ttl(self, make_cache):
+        cache = make_cache()
+        cache.set('a', b'value', ttl=0.01)
+        cache.set('b', b'value', ttl=60)
+        time.sleep(0.02)
+        assert cache.get('a') is None
+        assert cache.get('b') == b'value'
+
+    def test_delete_clear(self, make_cache):
+        cache = make_cache()
+        cache.set('a', b'1')
+        cache.set('b', b'2')
+        cache.delete('a')
+        assert cache.get('a') is None
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_persistent(self, make_cache):
+        cache = make_cache()
+        cache.set('a', b'value')
+        cache.close()
+        assert make_cache().get('a') == b'value'
+
+    def test_eviction(self, make_cache):
+        cache = make_cache(max_size=256 * 1024)
+        for i in range(100):
+            cache.set(str(i), bytes(8 * 1024))
+
+        assert 0 < len(cache) < 100
+        assert cache.get('99') is not None
+        assert cache.get('0') is None
+
+
+class TestSQLiteSize:
+    def test_replace_tracks_size(self, tmp_path):
+        cache = SQLiteCache(str(tmp_path / 'cache.db'), max_size=1000)
+        try:
+            for _ in range(10):
+                cache.set('a', bytes(400))
+            cache.set('b', bytes(400))
+            assert cache._size == cache._total_size() == 800
+            assert len(cache) == 2
+
+            cache.delete('a')
+            assert cache._size == 400
+        finally:
+            cache.close()
+
+    def test_evicts_oldest_until_under_max_size(self, tmp_path):
+        cache = SQLiteCache(str(tmp_path / 'cache.db'), max_size=1000)
+        try:
+            for i in range(10):
+                cache.set(str(i), bytes(100))
+            cache.set('big', bytes(250))
+
+            # Only the three oldest entries make room.
+            assert [cache.get(str(i)) is None for i in range(4)] == [True, True, True, False]
+            assert cache._size == cache._total_size() == 950
+        finally:
+            cache.close()
+
+
+class TestSerialization:
+    def test_round_trip(self):
+        tx = Transaction(TXID, 500000, Decimal('3.5'), Decimal('2.5'), Decimal(1))
+        tx.add_input(TxPart('bitcoincash:qq', Decimal('3.5')))
+        tx.add_output(TxPart(None, 0, asm='OP_RETURN 68656c6c6f'))
+        unspent = Unspent(1000, 1, '76a914', TXID, 0)
+        raw = {'hex': '00', 'vout': [{'value': Decimal('0.1')}], 'confirmations': 3}
+
+        assert loads(dumps(Decimal('0.00000001'))) == Decimal('0.00000001')
+        assert loads(dumps([unspent])) == [unspent]
+        assert loads(dumps(raw)) == raw
+        assert loads(dumps(5)) == 5
+
+        restored = loads(dumps(tx))
+        assert (restored.txid, restored.block, restored.amount_fee) == (TXID, 500000, Decimal(1))
+        assert restored.inputs[0].address == 'bitcoincash:qq'
+        assert restored.outputs[0].message() == 'hello'
+
+    def test_unsupported(self):
+        with pytest.raises(TypeError):
+            dumps(object())
+
+
+class TestUntilConfirmed:
+    def test_transaction(self):
+        assert until_confirmed(Transaction(TXID, 500000, 2, 1, 1)) is None
+        assert until_confirmed(Transaction(TXID, -1, 2, 1, 1)) == 10
+
+    def test_raw_transaction(self):
+        assert until_confirmed({'confirmations': 3}) is None
+        assert until_confirmed({'hex': '00'}) == 10
+
+
+class TestNetworkCache:
+    def setup_method(self):
+        self.calls = []
+
+    def fake(self, result):
+        def api_call(*args):
+            self.calls.append(args)
+            return result
+        return api_call
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(NetworkAPI, 'GET_TX_AMOUNT_MAIN', [self.fake(Decimal(5))])
+        NetworkAPI.get_tx_amount(TXID, 0)
+        NetworkAPI.get_tx_amount(TXID, 0)
+        assert len(self.calls) == 2
+
+    def test_forever(self, monkeypatch, network_cache_enabled):
+        monkeypatch.setattr(NetworkAPI, 'GET_TX_AMOUNT_MAIN', [self.fake(Decimal(5))])
+        assert NetworkAPI.get_tx_amount(TXID, 0) == Decimal(5)
+        assert NetworkAPI.get_tx_amount(TXID, 0) == Decimal(5)
+        NetworkAPI.get_tx_amount(TXID, 1)
+        assert self.calls == [(TXID, 0), (TXID, 1)]
+
+    def test_confirmed_transaction(self, monkeypatch, network_cache_enabled):
+        set_mutable_cache_time(0)
+        monkeypatch.setattr(NetworkAPI, 'GET_TX_MAIN', [self.fake(Transaction(TXID, 500000, 2, 1, 1))])
+        monkeypatch.setattr(NetworkAPI, 'GET_TX_TEST', [self.fake(Transaction(TXID, -1, 2, 1, 1))])
+
+        assert NetworkAPI.get_transaction(TXID).block == NetworkAPI.get_transaction(TXID).block == 500000
+        NetworkAPI.get_transaction_testnet(TXID)
+        NetworkAPI.get_transaction_testnet(TXID)
+        assert len(self.calls) == 3
+
+    def test_mutable(self, monkeypatch, network_cache_enabled):
+        unspents = [Unspent(1000, 1, '76a914', TXID, 0)]
+        monkeypatch.setattr(NetworkAPI, 'GET_UNSPENT_MAIN', [self.fake(unspents)])
+
+        assert NetworkAPI.get_unspent('address') == unspents
+        assert NetworkAPI.get_unspent('address') == unspents
+        assert len(self.calls) == 1
+
+        set_mutable_cache_time(0.01)
+        network_cache_enabled.clear()
+        NetworkAPI.get_unspent('address')
+        time.sleep(0.02)
+        NetworkAPI.get_unspent('address')
+        assert len(self.calls) == 3
+
+    def test_pickle_not_loaded(self, monkeypatch, network_cache_enabled):
+        class Exploit:
+            def __reduce__(self):
+                return (pytest.fail, ('unpickled', ))
+
+        monkeypatch.setattr(NetworkAPI, 'GET_TX_AMOUNT_MAIN', [self.fake(Decimal(5))])
+        network_cache_enabled.set('get_tx_amount:{}:0'.format(TXID), pickle.dumps(Exploit()))
+
+        assert NetworkAPI.get_tx_amount(TXID, 0) == Decimal(5)
+        assert len(self.calls) == 1
+
+    def test_errors_not_cached(self, monkeypatch, network_cache_enabled):
+        monkeypatch.setattr(NetworkAPI, 'GET_BALANCE_MAIN', [])
+        with pytest.raises(ConnectionError):
+            NetworkAPI.get_balance('address')
+        assert len(network_cache_enabled) == 0
+
+
+def test_set_network_cache_exported():
+    assert bitcash.set_network_cache is set_network_cache
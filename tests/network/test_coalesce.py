@@ -0,0 +1,192 @@
+import threading
+import time
+
+import pytest
+
+from bitcash.network import coalesce as coalesce_module
+from bitcash.network import rates
+from bitcash.network.coalesce import SingleFlight, coalesce, set_single_flight
+from bitcash.network.services import NetworkAPI
+
+
+class Unreachable(Exception):
+    pass
+
+
+class SlowService:
+    def __init__(self, result=None, error=None, delay=0.1):
+        self.result = result
+        self.error = error
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, *args):
+        with self.lock:
+            self.calls.append(args)
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def run_concurrently(f, count=20):
+    results = [None] * count
+    errors = [None] * count
+    barrier = threading.Barrier(count)
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = f()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=run, args=(i, )) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results, errors
+
+
+@pytest.fixture
+def single_flight():
+    single_flight = SingleFlight()
+    set_single_flight(single_flight)
+    yield single_flight
+    set_single_flight(SingleFlight())
+
+
+class TestSingleFlight:
+    def test_shared_result(self):
+        single_flight = SingleFlight()
+        service = SlowService([1, 2])
+
+        results, errors = run_concurrently(lambda: single_flight.do('key', service))
+
+        assert len(service.calls) == 1
+        assert results == [[1, 2]] * 20
+        assert errors == [None] * 20
+        assert single_flight.coalesced == 19
+        assert single_flight.in_flight() == 0
+
+    def test_results_are_copies(self):
+        single_flight = SingleFlight()
+        service = SlowService([1, 2])
+
+        results, _ = run_concurrently(lambda: single_flight.do('key', service), 5)
+        results[0].append(3)
+
+        assert results[1] == [1, 2]
+
+    def test_shared_error(self):
+        single_flight = SingleFlight()
+        service = SlowService(error=Unreachable())
+
+        _, errors = run_concurrently(lambda: single_flight.do('key', service))
+
+        assert len(service.calls) == 1
+        assert all(isinstance(error, Unreachable) for error in errors)
+        assert single_flight.in_flight() == 0
+
+    def test_different_keys(self):
+        single_flight = SingleFlight()
+        service = SlowService(delay=0.01)
+        counter = iter(range(100))
+
+        run_concurrently(lambda: single_flight.do(next(counter) % 4, service))
+
+        assert len(service.calls) >= 4
+
+    def test_sequential_calls_not_shared(self):
+        single_flight = SingleFlight()
+        service = SlowService(1, delay=0)
+
+        single_flight.do('key', service)
+        single_flight.do('key', service)
+
+        assert len(service.calls) == 2
+
+
+class TestCoalesce:
+    def test_list_arguments(self, single_flight):
+        assert coalesce(('op', ['a', 'b']), lambda: 5) == 5
+
+    def test_disabled(self):
+        set_single_flight(None)
+        try:
+            service = SlowService(1, delay=0.05)
+            run_concurrently(lambda: coalesce(('op', ), service), 5)
+            assert len(service.calls) == 5
+        finally:
+            set_single_flight(SingleFlight())
+
+
+class TestNetworkAPI:
+    def test_identical_lookups(self, single_flight, monkeypatch):
+        service = SlowService([])
+        monkeypatch.setattr(NetworkAPI, 'GET_UNSPENT_MAIN', [service])
+
+        run_concurrently(lambda: NetworkAPI.get_unspent('hot'), 50)
+
+        assert service.calls == [('hot', )]
+
+    def test_network_and_key_separate(self, single_flight, monkeypatch):
+        main, test = SlowService(1), SlowService(2)
+        monkeypatch.setattr(NetworkAPI, 'GET_TX_MAIN', [main])
+        monkeypatch.setattr(NetworkAPI, 'GET_TX_TEST', [test])
+        counter = iter(range(100))
+
+        def lookup():
+            i = next(counter)
+            if i % 2:
+                return NetworkAPI.get_transaction('tx{}'.format(i % 4))
+            return NetworkAPI.get_transaction_testnet('tx{}'.format(i % 4))
+
+        results, _ = run_concurrently(lookup)
+
+        assert sorted(main.calls) == [('tx1', ), ('tx3', )]
+        assert sorted(test.calls) == [('tx0', ), ('tx2', )]
+        assert sorted(results) == [1] * 10 + [2] * 10
+
+    def test_shared_connection_error(self, single_flight, monkeypatch):
+        service = SlowService(error=Unreachable())
+        monkeypatch.setattr(NetworkAPI, 'IGNORED_ERRORS', (Unreachable, ))
+        monkeypatch.setattr(NetworkAPI, 'GET_BALANCE_MAIN', [service])
+
+        _, errors = run_concurrently(lambda: NetworkAPI.get_balance('hot'))
+
+        assert len(service.calls) == 1
+        assert all(isinstance(error, ConnectionError) for error in errors)
+
+
+class TestRates:
+    def test_expired_rate_refreshed_once(self, single_flight, monkeypatch):
+        service = SlowService(100)
+        monkeypatch.setitem(rates.EXCHANGE_RATES, 'usd', service)
+        cached = rates.currency_to_satoshi_local_cache(None)
+
+        results, _ = run_concurrently(lambda: cached(2, 'usd'))
+
+        assert len(service.calls) == 1
+        assert results == [200] * 20
+
+    def test_refreshed_rate_not_fetched_again(self, monkeypatch):
+        service = SlowService(100, delay=0)
+        monkeypatch.setitem(rates.EXCHANGE_RATES, 'usd', service)
+
+        def late(key, refresh, *args):
+            # Another thread refreshes the rate before this one arrives.
+            refresh(*args)
+            return refresh(*args)
+
+        monkeypatch.setattr(rates, 'coalesce', late)
+        cached = rates.currency_to_satoshi_local_cache(None)
+
+        assert cached(2, 'usd') == 200
+        assert len(service.calls) == 1
+
+    def test_module_default(self):
+        assert isinstance(coalesce_module.SINGLE_FLIGHT, SingleFlight)
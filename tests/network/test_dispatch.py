@@ -0,0 +1,160 @@
+import time
+
+import pytest
+
+from bitcash.network import dispatch as dispatch_module
+from bitcash.network.dispatch import (
+    HEDGED, RACE, SEQUENTIAL, dispatch, get_request_mode, hedge_delay,
+    request_mode, set_hedge_delay, set_request_mode
+)
+from bitcash.network.services import NetworkAPI
+
+
+class Unreachable(Exception):
+    pass
+
+
+def service(result, delay=0, calls=None):
+    def api_call(*args):
+        if calls is not None:
+            calls.append(result)
+        time.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return api_call
+
+
+@pytest.fixture(autouse=True)
+def restore_settings(monkeypatch):
+    monkeypatch.setattr(dispatch_module, 'DEFAULT_REQUEST_MODE', SEQUENTIAL)
+    monkeypatch.setattr(dispatch_module, 'DEFAULT_HEDGE_DELAY', 1)
+    monkeypatch.setattr(dispatch_module, 'HEDGE_PERCENTILE', None)
+    monkeypatch.setattr(dispatch_module, '_operation_modes', {})
+
+
+class TestModes:
+    def test_default(self):
+        assert get_request_mode('get_balance') == SEQUENTIAL
+
+    def test_per_operation(self):
+        set_request_mode(RACE, 'get_transaction')
+        assert get_request_mode('get_transaction') == RACE
+        assert get_request_mode('get_balance') == SEQUENTIAL
+
+    def test_context(self):
+        set_request_mode(HEDGED)
+        with request_mode(RACE):
+            assert get_request_mode('get_balance') == RACE
+        assert get_request_mode('get_balance') == HEDGED
+
+    def test_unknown(self):
+        with pytest.raises(ValueError):
+            set_request_mode('fastest')
+        with pytest.raises(ValueError):
+            with request_mode('fastest'):
+                pass
+
+
+class TestSequential:
+    def test_failover(self):
+        calls = []
+        api_calls = [service(Unreachable(), calls=calls), service(2, calls=calls), service(3, calls=calls)]
+        assert dispatch('op', api_calls, (), Unreachable) == 2
+        assert len(calls) == 2
+
+    def test_unreachable(self):
+        with pytest.raises(ConnectionError):
+            dispatch('op', [service(Unreachable())], (), Unreachable)
+
+    def test_other_errors_propagate(self):
+        with pytest.raises(KeyError):
+            dispatch('op', [service(KeyError()), service(1)], (), Unreachable)
+
+    def test_rejected(self):
+        assert dispatch('op', [service(False), service(True)], (), Unreachable, accept=bool) is True
+        assert dispatch('op', [service(False), service(Unreachable())], (), Unreachable, accept=bool) is False
+
+
+class TestHedged:
+    def setup_method(self):
+        set_request_mode(HEDGED)
+        set_hedge_delay(0.05)
+
+    def test_primary_fast(self):
+        calls = []
+        assert dispatch('op', [service(1, calls=calls), service(2, calls=calls)], (), Unreachable) == 1
+        assert calls == [1]
+
+    def test_primary_slow(self):
+        calls = []
+        start = time.monotonic()
+        assert dispatch('op', [service(1, 1, calls), service(2, 0, calls)], (), Unreachable) == 2
+        assert time.monotonic() - start < 0.5
+        assert calls == [1, 2]
+
+    def test_primary_fails(self):
+        set_hedge_delay(1)
+        start = time.monotonic()
+        assert dispatch('op', [service(Unreachable()), service(2, 0.01)], (), Unreachable) == 2
+        assert time.monotonic() - start < 0.5
+
+    def test_all_fail(self):
+        with pytest.raises(ConnectionError):
+            dispatch('op', [service(Unreachable()), service(Unreachable(), 0.1)], (), Unreachable)
+
+    def test_other_error_when_no_answer(self):
+        with pytest.raises(KeyError):
+            dispatch('op', [service(KeyError()), service(Unreachable())], (), Unreachable)
+
+    def test_other_error_raised_at_once(self):
+        calls = []
+        with pytest.raises(KeyError):
+            dispatch('op', [service(KeyError()), service(2, calls=calls)], (), Unreachable)
+        assert calls == []
+
+    def test_percentile_delay(self):
+        set_hedge_delay(5, percentile=90)
+        assert hedge_delay('percentile') == 5
+
+        for i in range(20):
+            dispatch('percentile', [service(i, i / 1000)], (), Unreachable)
+
+        assert 0.015 < hedge_delay('percentile') < 0.1
+
+
+class TestRace:
+    def test_fastest_wins(self):
+        set_request_mode(RACE)
+        calls = []
+        start = time.monotonic()
+        assert dispatch('op', [service(1, 1, calls), service(2, 0.01, calls)], (), Unreachable) == 2
+        assert time.monotonic() - start < 0.5
+        assert sorted(calls) == [1, 2]
+
+    def test_other_error_raised_at_once(self):
+        set_request_mode(RACE)
+        start = time.monotonic()
+        with pytest.raises(KeyError):
+            dispatch('op', [service(KeyError()), service(2, 0.5)], (), Unreachable)
+        assert time.monotonic() - start < 0.4
+
+    def test_rejected_then_accepted(self):
+        set_request_mode(RACE)
+        assert dispatch('op', [service(False), service(True, 0.02)], (), Unreachable, accept=bool) is True
+
+
+class TestNetworkAPI:
+    def test_race_broadcast(self, monkeypatch):
+        monkeypatch.setattr(NetworkAPI, 'BROADCAST_TX_MAIN', [service(False), service(False, 0.01)])
+
+        with request_mode(RACE):
+            with pytest.raises(ConnectionError, match='broadcast failed'):
+                NetworkAPI.broadcast_tx('00')
+
+    def test_hedged_lookup(self, monkeypatch):
+        set_hedge_delay(0.01)
+        monkeypatch.setattr(NetworkAPI, 'GET_TX_AMOUNT_MAIN', [service(1, 1), service(2)])
+
+        with request_mode(HEDGED):
+            assert NetworkAPI.get_tx_amount('txid', 0) == 2
@@ -0,0 +1,179 @@
+import time
+
+import pytest
+
+from bitcash.network import health
+from bitcash.network.dispatch import dispatch
+from bitcash.network.health import (
+    CLOSED, HALF_OPEN, OPEN, HealthTracker, get_health_snapshot, set_health_tracker
+)
+
+
+class Unreachable(Exception):
+    pass
+
+
+class Service:
+    def __init__(self, name, fail=False):
+        self.__qualname__ = name
+        self.fail = fail
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        if self.fail:
+            raise Unreachable
+        return self.__qualname__
+
+
+@pytest.fixture
+def tracker():
+    tracker = HealthTracker(failure_threshold=3, reset_timeout=0.05)
+    set_health_tracker(tracker)
+    yield tracker
+    set_health_tracker(HealthTracker())
+
+
+class TestHealthTracker:
+    def test_configured_order_kept(self):
+        tracker = HealthTracker()
+        primary, secondary = Service('primary'), Service('secondary')
+        tracker.record_success(primary, 0.3)
+
+        assert tracker.order([primary, secondary]) == [primary, secondary]
+
+    def test_reorder_by_latency(self):
+        tracker = HealthTracker(smoothing=0.5)
+        primary, secondary = Service('primary'), Service('secondary')
+        for _ in range(5):
+            tracker.record_success(primary, 3)
+            tracker.record_success(secondary, 0.1)
+
+        assert tracker.order([primary, secondary]) == [secondary, primary]
+
+    def test_reorder_by_success_rate(self):
+        tracker = HealthTracker(failure_threshold=100)
+        primary, secondary = Service('primary'), Service('secondary')
+        for _ in range(10):
+            tracker.record_failure(primary, 0.1)
+            tracker.record_success(primary, 0.1)
+            tracker.record_failure(primary, 0.1)
+            tracker.record_success(secondary, 0.2)
+
+        assert tracker.order([primary, secondary]) == [secondary, primary]
+
+    def test_circuit(self):
+        tracker = HealthTracker(failure_threshold=2, reset_timeout=0.05)
+        primary, secondary = Service('primary'), Service('secondary')
+
+        tracker.record_failure(primary, 1)
+        assert tracker.order([primary, secondary])[-1] is primary
+        tracker.record_failure(primary, 1)
+        assert tracker.order([primary, secondary]) == [secondary]
+
+        time.sleep(0.06)
+        assert tracker.order([primary, secondary]) == [primary, secondary]
+        assert tracker.snapshot()['primary']['state'] == HALF_OPEN
+
+        # Only one probe at a time.
+        assert tracker.order([primary, secondary]) == [secondary]
+
+    def test_probe_fails(self):
+        tracker = HealthTracker(failure_threshold=1, reset_timeout=0.05)
+        service = Service('service')
+        tracker.record_failure(service, 1)
+        time.sleep(0.06)
+        tracker.order([service])
+        tracker.record_failure(service, 1)
+
+        assert tracker.snapshot()['service']['state'] == OPEN
+
+    def test_probe_succeeds(self):
+        tracker = HealthTracker(failure_threshold=1, reset_timeout=0.05)
+        service = Service('service')
+        tracker.record_failure(service, 1)
+        time.sleep(0.06)
+        tracker.order([service])
+        tracker.record_success(service, 1)
+
+        assert tracker.snapshot()['service']['state'] == CLOSED
+
+    def test_all_open(self):
+        tracker = HealthTracker(failure_threshold=1)
+        primary, secondary = Service('primary'), Service('secondary')
+        tracker.record_failure(primary, 1)
+        tracker.record_failure(secondary, 1)
+
+        assert tracker.order([primary, secondary]) == [primary, secondary]
+
+    def test_snapshot(self):
+        tracker = HealthTracker(failure_threshold=1, reset_timeout=10)
+        tracker.record_success(Service('up'), 0.5)
+        tracker.record_failure(Service('down'), 2)
+        snapshot = tracker.snapshot()
+
+        assert snapshot['up']['calls'] == 1
+        assert snapshot['up']['success_rate'] == 1
+        assert snapshot['up']['retry_in'] is None
+        assert snapshot['down']['state'] == OPEN
+        assert 9 < snapshot['down']['retry_in'] <= 10
+        assert snapshot['down']['success_rate'] == pytest.approx(0.8)
+
+
+class TestDispatch:
+    def test_failing_service_demoted(self, tracker):
+        primary, secondary = Service('primary', fail=True), Service('secondary')
+
+        for _ in range(5):
+            assert dispatch('op', [primary, secondary], (), Unreachable) == 'secondary'
+
+        assert primary.calls == 1
+
+    def test_demoted_service_retried(self, tracker):
+        primary, secondary = Service('primary', fail=True), Service('secondary')
+        dispatch('op', [primary, secondary], (), Unreachable)
+
+        primary.fail = False
+        time.sleep(0.06)
+
+        assert dispatch('op', [primary, secondary], (), Unreachable) == 'primary'
+        assert dispatch('op', [primary, secondary], (), Unreachable) == 'primary'
+
+    def test_all_open_still_sent(self, tracker):
+        only = Service('only', fail=True)
+
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                dispatch('op', [only], (), Unreachable)
+
+        assert only.calls == 5
+        assert get_health_snapshot()['only']['state'] == OPEN
+
+        only.fail = False
+        assert dispatch('op', [only], (), Unreachable) == 'only'
+        assert get_health_snapshot()['only']['state'] == CLOSED
+
+    def test_open_circuit_skipped_while_others_closed(self, tracker):
+        primary, secondary = Service('primary', fail=True), Service('secondary')
+
+        for _ in range(3):
+            with pytest.raises(ConnectionError):
+                dispatch('op', [primary], (), Unreachable)
+
+        assert dispatch('op', [primary, secondary], (), Unreachable) == 'secondary'
+        assert primary.calls == 3
+
+    def test_disabled(self):
+        set_health_tracker(None)
+        try:
+            primary, secondary = Service('primary', fail=True), Service('secondary')
+            for _ in range(5):
+                dispatch('op', [primary, secondary], (), Unreachable)
+
+            assert primary.calls == 5
+            assert get_health_snapshot() == {}
+        finally:
+            set_health_tracker(HealthTracker())
+
+    def test_default_tracker(self):
+        assert isinstance(health.HEALTH_TRACKER, HealthTracker)
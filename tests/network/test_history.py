@@ -0,0 +1,141 @@
+import threading
+import time
+
+import pytest
+
+from bitcash.network.history import TransactionHistory
+from bitcash.network.services import BitcoinDotComAPI, NetworkAPI
+from bitcash.network.sessions import set_session
+from bitcash.wallet import PrivateKeyTestnet
+
+# Newest first: two unconfirmed, then heights 109 down to 100, 3 per page.
+HISTORY = [('u0', None), ('u1', None)] + [('tx{}'.format(height), height) for height in range(109, 99, -1)]
+PAGE = 3
+
+
+class Pages:
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.requested = []
+
+    def __call__(self, address, page):
+        self.requested.append(page)
+        time.sleep(self.delay)
+        start = page * PAGE
+        next_page = page + 1 if start + PAGE < len(HISTORY) else None
+        return HISTORY[start:start + PAGE], next_page
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    pages = Pages()
+    monkeypatch.setattr(NetworkAPI, 'GET_TRANSACTIONS_PAGE_MAIN', [pages])
+    monkeypatch.setattr(NetworkAPI, 'GET_TRANSACTIONS_PAGE_TEST', [pages])
+    return pages
+
+
+class TestTransactionHistory:
+    def test_all(self, pages):
+        assert list(TransactionHistory('qq')) == [txid for txid, _ in HISTORY]
+        assert pages.requested == [0, 1, 2, 3]
+
+    def test_lazy(self, pages):
+        history = iter(TransactionHistory('qq'))
+        assert next(history) == 'u0'
+
+        # Only the first page and the one after it are fetched.
+        time.sleep(0.05)
+        assert pages.requested == [0, 1]
+
+    def test_page_size(self, pages):
+        assert [len(page) for page in TransactionHistory('qq', page_size=5).pages()] == [5, 5, 2]
+
+    def test_since_height(self, pages):
+        assert list(TransactionHistory('qq', since_height=107)) == ['u0', 'u1', 'tx109', 'tx108', 'tx107']
+        time.sleep(0.05)
+        assert pages.requested == [0, 1, 2]
+
+    def test_until_height(self, pages):
+        assert list(TransactionHistory('qq', until_height=101)) == ['tx101', 'tx100']
+
+    def test_height_range(self, pages):
+        assert list(TransactionHistory('qq', since_height=104, until_height=105)) == ['tx105', 'tx104']
+
+    def test_prefetch(self, monkeypatch):
+        pages = Pages(delay=0.05)
+        monkeypatch.setattr(NetworkAPI, 'GET_TRANSACTIONS_PAGE_MAIN', [pages])
+
+        start = time.monotonic()
+        for page in TransactionHistory('qq', page_size=PAGE).pages():
+            time.sleep(0.05)
+
+        # Fetching and consuming overlap, instead of taking 8 delays.
+        assert time.monotonic() - start < 0.35
+
+    def test_hydrate(self, pages, monkeypatch):
+        in_flight = []
+        most = []
+        lock = threading.Lock()
+
+        def get_transaction(txid):
+            with lock:
+                in_flight.append(txid)
+                most.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(txid)
+            return txid.upper()
+
+        monkeypatch.setattr(NetworkAPI, 'GET_TX_MAIN', [get_transaction])
+
+        history = TransactionHistory('qq', page_size=6, hydrate=True, workers=2)
+
+        assert list(history) == [txid.upper() for txid, _ in HISTORY]
+        assert max(most) <= 2
+
+    def test_invalid_page_size(self):
+        with pytest.raises(ValueError):
+            TransactionHistory('qq', page_size=0)
+
+    def test_wallet(self, pages):
+        key = PrivateKeyTestnet()
+        history = key.iter_transactions(since_height=109)
+
+        assert history.testnet is True
+        assert list(history) == ['u0', 'u1', 'tx109']
+        assert key.transactions == []
+
+
+class FakeSession:
+    def __init__(self, body):
+        self.body = body
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        body = self.body
+
+        class Response:
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return body
+
+        return Response()
+
+
+def test_bitcoin_dot_com_page():
+    session = FakeSession({
+        'txs': [{'txid': 'a', 'blockheight': -1}, {'txid': 'b', 'blockheight': 500}],
+        'pagesTotal': 2,
+        'currentPage': 0,
+    })
+    set_session(session, 'BitcoinDotComAPI')
+
+    try:
+        assert BitcoinDotComAPI.get_transactions_page('qq', 0) == ([('a', None), ('b', 500)], 1)
+        assert BitcoinDotComAPI.get_transactions_page('qq', 1)[1] is None
+        assert session.urls[1].endswith('address/transactions/qq?page=1')
+    finally:
+        set_session(None, 'BitcoinDotComAPI')
@@ -0,0 +1,165 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import pytest
+
+from bitcash.network import health, metrics
+from bitcash.network.dispatch import RACE, dispatch, request_mode
+from bitcash.network.metrics import (
+    MetricsAggregator, MetricsHook, add_metrics_hook, provider_name, remove_metrics_hook
+)
+from bitcash.network.services import BitcoreAPI
+from bitcash.network.sessions import make_session
+
+
+class Unreachable(Exception):
+    pass
+
+
+class Primary:
+    @staticmethod
+    def fails():
+        raise Unreachable
+
+    @staticmethod
+    def rejects():
+        return False
+
+
+class Secondary:
+    @staticmethod
+    def answers():
+        return True
+
+
+@pytest.fixture
+def aggregator():
+    aggregator = MetricsAggregator(buckets=(0.1, 1))
+    add_metrics_hook(aggregator)
+    yield aggregator
+    remove_metrics_hook(aggregator)
+
+
+class TestRegistry:
+    def test_no_hooks_by_default(self):
+        assert metrics.HOOKS == ()
+
+    def test_add_remove(self):
+        hook = MetricsHook()
+        add_metrics_hook(hook)
+        assert metrics.HOOKS == (hook, )
+        remove_metrics_hook(hook)
+        assert metrics.HOOKS == ()
+
+    def test_provider_name(self):
+        assert provider_name(BitcoreAPI.get_balance) == 'BitcoreAPI'
+        assert provider_name(Secondary.answers) == 'Secondary'
+
+
+class TestDispatch:
+    @pytest.fixture(autouse=True)
+    def configured_order(self, monkeypatch):
+        monkeypatch.setattr(health, 'HEALTH_TRACKER', None)
+
+    def test_success_and_fallback(self, aggregator):
+        assert dispatch('op', [Primary.fails, Secondary.answers], (), Unreachable)
+
+        snapshot = aggregator.snapshot()
+        assert snapshot['requests'][('op', 'Primary')]['failures'] == 1
+        assert snapshot['requests'][('op', 'Secondary')]['successes'] == 1
+        assert snapshot['requests'][('op', 'Secondary')]['buckets'][float('inf')] == 1
+        assert snapshot['fallbacks'] == {('op', 'Primary'): 1}
+
+    def test_rejected_is_fallback(self, aggregator):
+        dispatch('op', [Primary.rejects, Secondary.answers], (), Unreachable, accept=bool)
+        assert aggregator.snapshot()['fallbacks'] == {('op', 'Primary'): 1}
+
+    def test_last_failure_no_fallback(self, aggregator):
+        with pytest.raises(ConnectionError):
+            dispatch('op', [Primary.fails], (), Unreachable)
+        assert aggregator.snapshot()['fallbacks'] == {}
+
+    def test_race(self, aggregator):
+        with request_mode(RACE):
+            dispatch('op', [Primary.fails, Secondary.answers], (), Unreachable)
+
+        snapshot = aggregator.snapshot()
+        assert snapshot['requests'][('op', 'Secondary')]['successes'] == 1
+
+
+class TestAggregator:
+    def test_buckets(self):
+        aggregator = MetricsAggregator(buckets=(0.1, 1))
+        for seconds in (0.05, 0.1, 0.5, 5):
+            aggregator.request('op', 'P', seconds, True)
+
+        stats = aggregator.snapshot()['requests'][('op', 'P')]
+        assert stats['buckets'] == {0.1: 2, 1: 3, float('inf'): 4}
+        assert stats['count'] == 4
+        assert stats['seconds'] == pytest.approx(5.65)
+
+    def test_prometheus(self):
+        aggregator = MetricsAggregator(buckets=(0.1, 1))
+        aggregator.request('get_balance', 'BitcoreAPI', 0.5, True)
+        aggregator.request('get_balance', 'BitcoreAPI', 2, False)
+        aggregator.fallback('get_balance', 'BitcoreAPI')
+        aggregator.transferred('BitcoreAPI', 10, 300)
+
+        text = aggregator.to_prometheus()
+
+        assert '# TYPE bitcash_request_duration_seconds histogram' in text
+        assert 'bitcash_request_duration_seconds_bucket{operation="get_balance",provider="BitcoreAPI",le="1.0"} 1' in text
+        assert 'bitcash_request_duration_seconds_bucket{operation="get_balance",provider="BitcoreAPI",le="+Inf"} 2' in text
+        assert 'bitcash_request_duration_seconds_count{operation="get_balance",provider="BitcoreAPI"} 2' in text
+        assert 'bitcash_requests_total{operation="get_balance",provider="BitcoreAPI",outcome="failure"} 1' in text
+        assert 'bitcash_fallbacks_total{operation="get_balance",provider="BitcoreAPI"} 1' in text
+        assert 'bitcash_bytes_received_total{provider="BitcoreAPI"} 300' in text
+        assert text.endswith('\n')
+
+    def test_label_escaping(self):
+        aggregator = MetricsAggregator()
+        aggregator.fallback('op"', 'P')
+        assert 'operation="op\\""' in aggregator.to_prometheus()
+
+    def test_reset(self):
+        aggregator = MetricsAggregator()
+        aggregator.request('op', 'P', 1, True)
+        aggregator.reset()
+        assert aggregator.snapshot()['requests'] == {}
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def test_bytes_transferred(aggregator):
+    body = json.dumps({'balance': 5}).encode('utf-8')
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers['Content-Length']))
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, args=(0.01, ), daemon=True).start()
+
+    try:
+        url = 'http://127.0.0.1:{}/'.format(server.server_address[1])
+        make_session(provider='Stand-in').post(url, data=b'x' * 7)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    snapshot = aggregator.snapshot()
+    assert snapshot['bytes_sent'] == {'Stand-in': 7}
+    assert snapshot['bytes_received'] == {'Stand-in': len(body)}
@@ -0,0 +1,247 @@
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import pytest
+
+from bitcash.network import ratelimit
+from bitcash.network.dispatch import HEDGED, dispatch, request_mode
+from bitcash.network.ratelimit import (
+    BULK, INTERACTIVE, NORMAL, RateLimited, RateLimiter, get_priority,
+    get_rate_limiter, parse_retry_after, priority, set_rate_limit
+)
+from bitcash.network.sessions import make_session
+
+
+class TestRateLimiter:
+    def test_burst_then_paced(self):
+        limiter = RateLimiter(rate=50, burst=2)
+        start = time.monotonic()
+
+        for _ in range(2):
+            limiter.acquire()
+        assert time.monotonic() - start < 0.015
+
+        for _ in range(3):
+            limiter.acquire()
+        assert time.monotonic() - start >= 0.05
+
+    def test_priority(self):
+        limiter = RateLimiter(rate=20, burst=1)
+        limiter.acquire()
+        order = []
+
+        def acquire(level):
+            limiter.acquire(level)
+            order.append(level)
+
+        threads = []
+        for level in (BULK, NORMAL, INTERACTIVE):
+            threads.append(threading.Thread(target=acquire, args=(level, )))
+            threads[-1].start()
+            time.sleep(0.005)
+        for thread in threads:
+            thread.join()
+
+        assert order == [INTERACTIVE, NORMAL, BULK]
+        assert limiter.waiting() == 0
+
+    def test_pause(self):
+        limiter = RateLimiter(rate=1000, burst=10)
+        limiter.pause(0.05)
+        start = time.monotonic()
+        limiter.acquire()
+        assert time.monotonic() - start >= 0.04
+
+    def test_max_wait(self):
+        limiter = RateLimiter(rate=1000, burst=10, max_wait=0.1)
+        limiter.pause(10)
+        start = time.monotonic()
+
+        with pytest.raises(RateLimited):
+            limiter.acquire()
+
+        # Gives up at once instead of waiting for nothing.
+        assert time.monotonic() - start < 0.05
+        assert limiter.waiting() == 0
+
+
+class TestSettings:
+    def test_defaults(self):
+        assert isinstance(get_rate_limiter('BitcoinDotComAPI'), RateLimiter)
+        assert get_rate_limiter('BitpayRates') is None
+
+    def test_set_rate_limit(self):
+        try:
+            set_rate_limit('Custom', 5, burst=3)
+            assert get_rate_limiter('Custom').burst == 3
+            set_rate_limit('Custom', None)
+            assert get_rate_limiter('Custom') is None
+        finally:
+            ratelimit._RATE_LIMITERS.pop('Custom', None)
+
+    def test_priorities(self):
+        assert get_priority('broadcast_tx') == INTERACTIVE
+        assert get_priority('get_unspent_bulk') == BULK
+        assert get_priority('get_transaction') == NORMAL
+
+        with priority(BULK):
+            assert get_priority('get_unspent') == BULK
+        assert get_priority('get_unspent') == INTERACTIVE
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after('3') == 3
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('soon') is None
+        assert 8 < parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+        assert parse_retry_after(formatdate(time.time() - 10, usegmt=True)) == 0
+
+
+class TestDispatch:
+    def test_operation_priority(self):
+        seen = []
+
+        def api_call():
+            seen.append(get_priority())
+
+        dispatch('get_unspent_bulk', [api_call], (), RateLimited)
+        dispatch('broadcast_tx', [api_call], (), RateLimited)
+        with priority(NORMAL):
+            dispatch('broadcast_tx', [api_call], (), RateLimited)
+
+        assert seen == [BULK, INTERACTIVE, NORMAL]
+
+    def test_priority_in_hedged_threads(self):
+        seen = []
+
+        def api_call():
+            seen.append(get_priority())
+
+        with request_mode(HEDGED):
+            dispatch('get_unspent_bulk', [api_call, api_call], (), RateLimited)
+
+        assert seen == [BULK]
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class Server:
+    """A local server answering with ``status`` as long as ``limited`` is
+    set.
+    """
+
+    def __init__(self, retry_after, status=429, limited=1):
+        self.limited = limited
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server.requests += 1
+                if server.limited:
+                    server.limited -= 1
+                    self.send_response(status)
+                    self.send_header('Retry-After', retry_after)
+                else:
+                    self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}/'.format(self.server.server_address[1])
+        threading.Thread(target=self.server.serve_forever, args=(0.01, ), daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def limited():
+    set_rate_limit('Local', 1000, burst=10, max_wait=2)
+    yield
+    ratelimit._RATE_LIMITERS.pop('Local', None)
+
+
+class TestAdapter:
+    def test_retry_after_honoured(self, limited):
+        server = Server('1')
+        try:
+            start = time.monotonic()
+            response = make_session(provider='Local').get(server.url)
+
+            assert response.status_code == 200
+            assert server.requests == 2
+            assert time.monotonic() - start >= 1
+            assert get_rate_limiter('Local').waiting() == 0
+        finally:
+            server.close()
+
+    def test_retry_after_too_long(self, limited):
+        server = Server('60')
+        try:
+            response = make_session(provider='Local').get(server.url)
+
+            assert response.status_code == 429
+            assert server.requests == 1
+
+            # The provider stays paused, so the next service is asked at once.
+            with pytest.raises(RateLimited):
+                make_session(provider='Local').get(server.url)
+            assert server.requests == 1
+        finally:
+            server.close()
+
+    def test_retries_acquire(self, limited, monkeypatch):
+        limiter = get_rate_limiter('Local')
+        acquired = []
+        acquire = limiter.acquire
+
+        def counted(level=NORMAL):
+            acquired.append(level)
+            return acquire(level)
+
+        monkeypatch.setattr(limiter, 'acquire', counted)
+        server = Server('0', status=503, limited=2)
+        try:
+            response = make_session(provider='Local').get(server.url)
+
+            assert response.status_code == 200
+            assert server.requests == 3
+            assert len(acquired) == 3
+        finally:
+            server.close()
+
+    def test_retries_exhausted(self, limited):
+        server = Server('0', status=503, limited=5)
+        try:
+            assert make_session(provider='Local').get(server.url).status_code == 503
+            assert server.requests == 3
+        finally:
+            server.close()
+
+    def test_unlimited_provider_retried(self):
+        server = Server('0', status=503, limited=2)
+        try:
+            assert make_session(provider='Unlimited').get(server.url).status_code == 200
+            assert server.requests == 3
+        finally:
+            server.close()
+            ratelimit._RATE_LIMITERS.pop('Unlimited', None)
+
+    def test_unlimited_provider(self):
+        server = Server('60')
+        try:
+            assert make_session(provider='Unlimited').get(server.url).status_code == 429
+        finally:
+            server.close()
+            ratelimit._RATE_LIMITERS.pop('Unlimited', None)
@@ -0,0 +1,139 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+
+from bitcash.network import sessions
+from bitcash.network.rates import BitpayRates
+from bitcash.network.services import BitcoinDotComAPI, BitcoreAPI
+from bitcash.network.sessions import get_session, make_session, reset_sessions, set_session
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StandIn:
+    """A local server answering every GET with the next queued response."""
+
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+        self.connections = set()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                stand_in.requests.append((self.path, dict(self.headers)))
+                stand_in.connections.add(self.client_address)
+                status, body = stand_in.responses.pop(0) if stand_in.responses else (200, {})
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+        threading.Thread(target=self.server.serve_forever, args=(0.01, ), daemon=True).start()
+
+    def session(self):
+        url = self.url
+
+        class LocalSession(requests.Session):
+            def request(self, method, target, *args, **kwargs):
+                parts = urlsplit(target)
+                return super().request(method, url + parts.path + ('?' + parts.query if parts.query else ''),
+                                       *args, **kwargs)
+
+        session = LocalSession()
+        session.mount('http://', make_session(max_retries=2).get_adapter('http://'))
+        return session
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    server = StandIn()
+    yield server
+    set_session(None)
+    set_session(None, 'BitcoinDotComAPI')
+    server.close()
+
+
+class TestGetSession:
+    def test_shared_per_provider(self):
+        assert get_session('BitcoinDotComAPI') is get_session('BitcoinDotComAPI')
+        assert get_session('BitcoinDotComAPI') is not get_session('BitcoreAPI')
+
+    def test_thread_safe_creation(self):
+        reset_sessions()
+        created = []
+        threads = [threading.Thread(target=lambda: created.append(get_session('BitcoreAPI')))
+                   for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(session) for session in created}) == 1
+
+    def test_reset(self):
+        session = get_session('BitcoinDotComAPI')
+        reset_sessions()
+        assert get_session('BitcoinDotComAPI') is not session
+
+    def test_pool_and_retries(self, monkeypatch):
+        monkeypatch.setattr(sessions, 'DEFAULT_POOL_SIZE', 3)
+        monkeypatch.setattr(sessions, 'DEFAULT_MAX_RETRIES', 5)
+        adapter = make_session().get_adapter('https://rest.bitcoin.com')
+
+        assert adapter._pool_maxsize == 3
+        assert adapter.max_retries.total == 5
+        assert 503 in adapter.max_retries.status_forcelist
+
+
+class TestStandIn:
+    def test_provider_session(self, stand_in):
+        stand_in.responses.append((200, {'balanceSat': 5, 'unconfirmedBalanceSat': 2}))
+        set_session(stand_in.session(), 'BitcoinDotComAPI')
+
+        assert BitcoinDotComAPI.get_balance('bitcoincash:qq') == 7
+        assert stand_in.requests[0][0] == '/v2/address/details/bitcoincash:qq'
+
+    def test_default_session(self, stand_in):
+        stand_in.responses.append((200, {'balance': 9}))
+        stand_in.responses.append((200, {'data': {'rate': '500'}}))
+        set_session(stand_in.session())
+
+        assert BitcoreAPI.get_balance('qq') == 9
+        assert BitpayRates.currency_to_satoshi('usd') == 200000
+
+    def test_keep_alive_and_gzip(self, stand_in):
+        set_session(stand_in.session())
+        for _ in range(5):
+            stand_in.responses.append((200, {'transactions': []}))
+            BitcoinDotComAPI.get_transactions('qq')
+
+        assert len(stand_in.connections) == 1
+        assert 'gzip' in stand_in.requests[0][1]['Accept-Encoding']
+
+    def test_retry(self, stand_in):
+        stand_in.responses.extend([(503, {}), (200, {'transactions': ['a']})])
+        set_session(stand_in.session())
+
+        assert BitcoinDotComAPI.get_transactions('qq') == ['a']
+        assert len(stand_in.requests) == 2
@@ -0,0 +1,221 @@
+import io
+import json
+import sys
+from decimal import Decimal
+
+import pytest
+import requests
+
+from bitcash.coinselect import LARGEST_FIRST, select_coins
+from bitcash.network.health import OPEN, HealthTracker, set_health_tracker
+from bitcash.network.metrics import MetricsAggregator, add_metrics_hook, remove_metrics_hook
+from bitcash.network.services import BitcoinDotComAPI, BitcoreAPI, NetworkAPI
+from bitcash.network.sessions import set_session
+from bitcash.network.stream import JSONStream, iter_json_array
+from tests.samples import BITCOIN_CASHADDRESS, BITCOIN_CASHADDRESS_PAY2SH
+
+BITCOIN_CASHADDRESS_SCRIPT = '76a914' + '92461bde6283b461ece7ddf4dbf1e0a48bd113d8' + '88ac'
+
+
+def chunked(data, size):
+    data = data.encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class FakeSession:
+    def __init__(self, body, status=200):
+        self.body = body
+        self.status = status
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        response = requests.Response()
+        response.status_code = self.status
+        response.raw = io.BytesIO(json.dumps(self.body).encode('utf-8'))
+        return response
+
+
+@pytest.fixture
+def session():
+    yield
+    set_session(None, 'BitcoinDotComAPI')
+    set_session(None, 'BitcoreAPI')
+
+
+class TestJSONStream:
+    def test_top_level_array(self):
+        data = json.dumps([{'a': 1}, {'b': [2, 3]}, 'four', 5.5, None])
+        for size in (1, 2, 7, 1000):
+            assert list(iter_json_array(chunked(data, size))) == json.loads(data)
+
+    def test_key(self):
+        data = json.dumps({'other': {'x': [1, 2]}, 'utxos': [1, 2, 3], 'after': 'ignored'})
+        for size in (1, 3, 1000):
+            assert list(iter_json_array(chunked(data, size), 'utxos')) == [1, 2, 3]
+
+    def test_numbers_split_across_chunks(self):
+        assert list(iter_json_array([b'[12', b'34, 5', b'6]'])) == [1234, 56]
+        assert list(iter_json_array([b'[5', b'.5e', b'1]'])) == [55.0]
+
+    def test_multibyte_split(self):
+        data = json.dumps(['₿' * 10], ensure_ascii=False)
+        assert list(iter_json_array(chunked(data, 1))) == ['₿' * 10]
+
+    def test_empty(self):
+        assert list(iter_json_array([b' [ ] '])) == []
+        assert list(iter_json_array([b'{}'], 'utxos')) == []
+        assert list(iter_json_array([b'{"a": 1}'], 'utxos')) == []
+
+    def test_parse_float(self):
+        assert list(iter_json_array([b'[0.1]'], parse_float=Decimal)) == [Decimal('0.1')]
+
+    def test_lazy(self):
+        def chunks():
+            yield b'[1, '
+            raise AssertionError('Read too far.')
+
+        items = JSONStream(chunks()).items()
+        assert next(items) == 1
+
+    def test_malformed(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array([b'[1, 2']))
+        with pytest.raises(ValueError):
+            list(iter_json_array([b'[1 2]']))
+        with pytest.raises(ValueError):
+            list(iter_json_array([b'{"utxos": 5}'], 'utxos'))
+
+
+class TestServices:
+    def test_bitcoin_dot_com(self, session):
+        body = {
+            'utxos': [
+                {'txid': 'ab' * 32, 'vout': i, 'amount': 0.0001, 'satoshis': 10000, 'confirmations': 3}
+                for i in range(50)
+            ],
+            'scriptPubKey': BITCOIN_CASHADDRESS_SCRIPT,
+        }
+        set_session(FakeSession(body), 'BitcoinDotComAPI')
+
+        unspents = list(BitcoinDotComAPI.iter_unspent(BITCOIN_CASHADDRESS))
+
+        assert len(unspents) == 50
+        assert unspents[7].amount == 10000
+        assert unspents[7].txindex == 7
+        assert unspents[7].script == BITCOIN_CASHADDRESS_SCRIPT
+        assert all(unspent.script is unspents[0].script for unspent in unspents)
+
+    def test_pay2sh_script(self, session):
+        set_session(FakeSession({'utxos': [{'txid': 'ab', 'vout': 0, 'amount': 1, 'confirmations': 0}]}),
+                    'BitcoinDotComAPI')
+
+        unspent, = BitcoinDotComAPI.iter_unspent(BITCOIN_CASHADDRESS_PAY2SH)
+
+        assert unspent.script.startswith('a914') and unspent.script.endswith('87')
+
+    def test_bitcore_interned(self, session):
+        body = [
+            {'value': 5, 'confirmations': 1, 'script': ''.join(['76a914', 'cd' * 20, '88ac']),
+             'mintTxid': 'ef' * 32, 'mintIndex': i}
+            for i in range(10)
+        ]
+        set_session(FakeSession(body), 'BitcoreAPI')
+
+        unspents = list(BitcoreAPI.iter_unspent('bitcoincash:qq'))
+
+        assert sum(unspent.amount for unspent in unspents) == 50
+        assert all(unspent.script is sys.intern(body[0]['script']) for unspent in unspents)
+
+    def test_bitcore_testnet_missing_script(self, session):
+        body = [{'value': 5, 'confirmations': 1, 'mintTxid': 'ef', 'mintIndex': 0}]
+        set_session(FakeSession(body), 'BitcoreAPI')
+
+        assert list(BitcoreAPI.iter_unspent_testnet('bchtest:qq')) == []
+
+
+def streamed(*items):
+    def api_call(address):
+        yield from items
+    return api_call
+
+
+def unreachable(address):
+    raise requests.exceptions.ConnectionError
+    yield
+
+
+def fails_midway(address):
+    yield 1
+    raise requests.exceptions.ConnectionError
+
+
+class Down:
+    calls = None
+
+    @classmethod
+    def iter_unspent(cls, address):
+        cls.calls.append(address)
+        return unreachable(address)
+
+
+class Up:
+    @staticmethod
+    def iter_unspent(address):
+        yield from (1, 2)
+
+
+class TestNetworkAPI:
+    def test_failover_before_data(self, monkeypatch):
+        monkeypatch.setattr(NetworkAPI, 'ITER_UNSPENT_MAIN', [unreachable, streamed(1, 2)])
+        assert list(NetworkAPI.iter_unspent('qq')) == [1, 2]
+
+    def test_no_failover_after_data(self, monkeypatch):
+        monkeypatch.setattr(NetworkAPI, 'ITER_UNSPENT_MAIN', [fails_midway, streamed(1, 2)])
+        with pytest.raises(requests.exceptions.ConnectionError):
+            list(NetworkAPI.iter_unspent('qq'))
+
+    def test_empty(self, monkeypatch):
+        monkeypatch.setattr(NetworkAPI, 'ITER_UNSPENT_TEST', [streamed(), streamed(1)])
+        assert list(NetworkAPI.iter_unspent_testnet('qq')) == []
+
+    def test_unreachable(self, monkeypatch):
+        monkeypatch.setattr(NetworkAPI, 'ITER_UNSPENT_MAIN', [unreachable])
+        with pytest.raises(ConnectionError):
+            list(NetworkAPI.iter_unspent('qq'))
+
+    def test_health_and_metrics(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(Down, 'calls', calls)
+
+        tracker = HealthTracker(failure_threshold=1)
+        aggregator = MetricsAggregator()
+        set_health_tracker(tracker)
+        add_metrics_hook(aggregator)
+        try:
+            monkeypatch.setattr(NetworkAPI, 'ITER_UNSPENT_MAIN', [Down.iter_unspent, Up.iter_unspent])
+            assert list(NetworkAPI.iter_unspent('qq')) == [1, 2]
+            # The open circuit skips the failing service.
+            assert list(NetworkAPI.iter_unspent('qq')) == [1, 2]
+        finally:
+            remove_metrics_hook(aggregator)
+            set_health_tracker(HealthTracker())
+
+        assert calls == ['qq']
+        assert tracker.snapshot()['Down.iter_unspent']['state'] == OPEN
+        snapshot = aggregator.snapshot()
+        assert snapshot['requests'][('iter_unspent', 'Down')]['failures'] == 1
+        assert snapshot['requests'][('iter_unspent', 'Up')]['successes'] == 2
+        assert snapshot['fallbacks'] == {('iter_unspent', 'Down'): 1}
+
+    def test_coin_selection(self, session):
+        body = [
+            {'value': value, 'confirmations': 1, 'script': 'ab', 'mintTxid': 'ef', 'mintIndex': value}
+            for value in (100, 5000, 300)
+        ]
+        set_session(FakeSession(body), 'BitcoreAPI')
+
+        selected, change = select_coins(BitcoreAPI.iter_unspent('qq'), 4000, lambda n_in, change: 0,
+                                        LARGEST_FIRST)
+
+        assert [unspent.amount for unspent in selected] == [5000]
@@ -1,6 +1,8 @@
 import pytest
 
-from bitcash.base58 import b58decode, b58decode_check, b58encode, b58encode_check
+from bitcash.base58 import (
+    b58decode, b58decode_check, b58decode_many, b58encode, b58encode_check, b58encode_many
+)
 from bitcash.format import MAIN_PUBKEY_HASH
 from .samples import BINARY_ADDRESS, BITCOIN_ADDRESS, PUBKEY_HASH
 
@@ -8,6 +10,25 @@ from .samples import BINARY_ADDRESS, BITCOIN_ADDRESS, PUBKEY_HASH
 def test_b58encode():
     assert b58encode(BINARY_ADDRESS) == BITCOIN_ADDRESS
     assert b58encode(BINARY_ADDRESS[:1]) == BITCOIN_ADDRESS[:1]
+    assert b58encode(b'') == ''
+    assert b58encode(b'\x00\x00\x01') == '112'
+
+
+def test_round_trip_long():
+    # Spans several chunks, with a most significant chunk that is not full.
+    payload = b'\x00\x00' + bytes(range(1, 256)) * 4
+    encoded = b58encode(payload)
+    assert encoded.startswith('11') and not encoded.startswith('111')
+    assert b58decode(encoded) == payload
+    assert b58encode(bytearray(payload)) == encoded
+
+
+def test_chunk_boundary():
+    # 58 ** 10 - 1 and 58 ** 10 are the largest one chunk and smallest two
+    # chunk numbers.
+    assert b58encode((58 ** 10 - 1).to_bytes(8, 'big')) == 'z' * 10
+    assert b58encode((58 ** 10).to_bytes(8, 'big')) == '2' + '1' * 10
+    assert b58decode('2' + '1' * 10) == (58 ** 10).to_bytes(8, 'big')
 
 
 def test_b58encode_check():
@@ -23,6 +44,14 @@ class TestB58Decode:
         with pytest.raises(ValueError):
             b58decode('l')
 
+    def test_b58decode_failure_in_chunk(self):
+        with pytest.raises(ValueError, match='"0"'):
+            b58decode('1' * 15 + '0')
+
+    def test_b58decode_failure_non_ascii(self):
+        with pytest.raises(ValueError, match='"é"'):
+            b58decode('abcé')
+
 
 class TestB58DecodeCheck:
     def test_b58decode_check_success(self):
@@ -31,3 +60,20 @@ class TestB58DecodeCheck:
     def test_b58decode_check_failure(self):
         with pytest.raises(ValueError):
             b58decode_check(BITCOIN_ADDRESS[:-1])
+
+    def test_b58decode_check_not_cached(self):
+        assert not hasattr(b58decode_check, 'cache_info')
+
+
+class TestBatch:
+    def test_b58encode_many(self):
+        assert b58encode_many([BINARY_ADDRESS, b'\x00']) == [BITCOIN_ADDRESS, '1']
+        assert b58encode_many([MAIN_PUBKEY_HASH + PUBKEY_HASH], check=True) == [BITCOIN_ADDRESS]
+
+    def test_b58decode_many(self):
+        assert b58decode_many([BITCOIN_ADDRESS]) == [BINARY_ADDRESS]
+        assert b58decode_many([BITCOIN_ADDRESS], check=True) == [MAIN_PUBKEY_HASH + PUBKEY_HASH]
+
+    def test_b58decode_many_failure(self):
+        with pytest.raises(ValueError):
+            b58decode_many([BITCOIN_ADDRESS, BITCOIN_ADDRESS[:-1]], check=True)
@@ -0,0 +1,120 @@
+import random
+from functools import partial
+
+import pytest
+
+from bitcash.coinselect import (
+    branch_and_bound, largest_first, select_coins, single_random_draw,
+    smallest_first
+)
+from bitcash.exceptions import InsufficientFunds
+from bitcash.network.meta import Unspent
+from bitcash.transaction import estimate_tx_fee
+
+AMOUNTS = [1000, 5000, 20000, 7000, 300]
+
+
+def make_unspents(amounts):
+    return [Unspent(amount, 0, '', '', i) for i, amount in enumerate(amounts)]
+
+
+def fee_for(n_in, change, fee=1):
+    return estimate_tx_fee(n_in, 2 if change else 1, fee, True)
+
+
+def total(unspents):
+    return sum(unspent.amount for unspent in unspents)
+
+
+class TestSmallestFirst:
+    def test_order(self):
+        selected, change = smallest_first(make_unspents(AMOUNTS), 1000, fee_for)
+        assert [unspent.amount for unspent in selected] == [300, 1000, 5000]
+        assert change is True
+
+    def test_insufficient_funds(self):
+        with pytest.raises(InsufficientFunds):
+            smallest_first(make_unspents(AMOUNTS), 40000, fee_for)
+
+
+class TestLargestFirst:
+    def test_order(self):
+        selected, change = largest_first(make_unspents(AMOUNTS), 1000, fee_for)
+        assert [unspent.amount for unspent in selected] == [20000]
+        assert change is True
+
+    def test_insufficient_funds(self):
+        with pytest.raises(InsufficientFunds):
+            largest_first(make_unspents(AMOUNTS), 40000, fee_for)
+
+
+class TestBranchAndBound:
+    def test_exact_match(self):
+        unspents = make_unspents(AMOUNTS)
+        target = 7000 + 1000 - fee_for(2, False)
+        selected, change = branch_and_bound(unspents, target, fee_for)
+        assert sorted(unspent.amount for unspent in selected) == [1000, 7000]
+        assert change is False
+        assert total(selected) == target + fee_for(2, False)
+
+    def test_excess_below_change_cost(self):
+        unspents = make_unspents(AMOUNTS)
+        target = 5000 - fee_for(1, False) - 10
+        selected, change = branch_and_bound(unspents, target, fee_for)
+        assert [unspent.amount for unspent in selected] == [5000]
+        assert change is False
+
+    def test_fallback(self):
+        unspents = make_unspents([100000])
+        selected, change = branch_and_bound(unspents, 1000, fee_for)
+        assert selected == unspents
+        assert change is True
+
+    def test_insufficient_funds(self):
+        with pytest.raises(InsufficientFunds):
+            branch_and_bound(make_unspents(AMOUNTS), 40000, fee_for)
+
+    def test_fallback_generator(self):
+        unspents = make_unspents([100000])
+        selected, change = branch_and_bound(iter(unspents), 1000, fee_for)
+        assert selected == unspents
+        assert change is True
+
+
+class TestSingleRandomDraw:
+    def test_covers_target(self):
+        unspents = make_unspents(AMOUNTS * 20)
+        selected, change = single_random_draw(unspents, 30000, fee_for, rng=random.Random(3))
+        assert total(selected) >= 30000 + fee_for(len(selected), True)
+        assert change is True
+
+    def test_seeded(self):
+        unspents = make_unspents(AMOUNTS * 20)
+        first = single_random_draw(unspents, 30000, fee_for, rng=random.Random(3))
+        second = single_random_draw(unspents, 30000, fee_for, rng=random.Random(3))
+        assert first == second
+
+
+class TestSelectCoins:
+    def test_by_name(self):
+        unspents = make_unspents(AMOUNTS)
+        assert select_coins(unspents, 1000, fee_for, 'largest') == largest_first(unspents, 1000, fee_for)
+        assert select_coins(unspents, 1000, fee_for) == smallest_first(unspents, 1000, fee_for)
+
+    def test_custom(self):
+        unspents = make_unspents(AMOUNTS)
+        strategy = partial(single_random_draw, rng=random.Random(1))
+        selected, _ = select_coins(unspents, 1000, fee_for, strategy)
+        assert total(selected) >= 1000
+
+    def test_unknown(self):
+        with pytest.raises(ValueError):
+            select_coins(make_unspents(AMOUNTS), 1000, fee_for, 'knapsack')
+
+    def test_generator(self):
+        for strategy in ('smallest', 'largest', 'bnb', 'random'):
+            # The fallback of branch and bound is taken for this target.
+            for target in (1000, 7000 + 1000 - fee_for(2, False)):
+                unspents = (unspent for unspent in make_unspents(AMOUNTS))
+                selected, change = select_coins(unspents, target, fee_for, strategy)
+                assert total(selected) >= target + fee_for(len(selected), change)
@@ -0,0 +1,71 @@
+import pytest
+
+from bitcash.deserialize import deserialize_transaction, iter_transactions, read_varint
+from bitcash.transaction import calc_txid
+from bitcash.utils import hex_to_bytes
+from .samples import BITCOIN_CASHADDRESS_TEST
+from .test_transaction import FINAL_TX_1, OUTPUT_BLOCK_MESSAGES
+
+TX_MESSAGES = '01000000' '00' '04' + OUTPUT_BLOCK_MESSAGES + '00000000'
+
+
+def test_read_varint():
+    assert read_varint(b'\x05', 0) == (5, 1)
+    assert read_varint(b'\x00\xfd\x2c\x01', 1) == (300, 4)
+    assert read_varint(b'\xfe\x01\x00\x00\x00', 0) == (1, 5)
+
+    with pytest.raises(ValueError):
+        read_varint(b'\xfd\x2c', 0)
+
+
+class TestDeserializeTransaction:
+    def test_fields(self):
+        tx = deserialize_transaction(FINAL_TX_1)
+
+        assert tx.version == 1
+        assert tx.lock_time == 0
+        assert tx.size == len(FINAL_TX_1) // 2
+        assert tx.txid == calc_txid(FINAL_TX_1)
+        assert tx.raw == hex_to_bytes(FINAL_TX_1)
+
+        assert len(tx.inputs) == 1
+        txin = tx.inputs[0]
+        assert txin.txid == 'f3ad23dac2a3546167b27a43ac3e370236caf93f75bfcf27c625ec839d397888'
+        assert txin.txindex == 1
+        assert len(txin.script) == 0x8a
+        assert txin.sequence == 0xffffffff
+
+        assert [txout.amount for txout in tx.outputs] == [50000, 83658760]
+        assert tx.outputs[1].public_key_hash == hex_to_bytes('92461bde6283b461ece7ddf4dbf1e0a48bd113d8')
+        assert tx.outputs[1].address(version='test') == BITCOIN_CASHADDRESS_TEST
+        assert tx.outputs[1].op_return is None
+
+    def test_op_return(self):
+        tx = deserialize_transaction(hex_to_bytes(TX_MESSAGES))
+        assert tx.outputs[2].op_return == b'\x05hello'
+        assert tx.outputs[2].public_key_hash is None
+        assert tx.outputs[2].address() is None
+
+    def test_zero_copy(self):
+        raw = bytearray(hex_to_bytes(FINAL_TX_1))
+        tx = deserialize_transaction(raw)
+        assert tx.outputs[0].amount == 50000
+        raw[42 + 0x8a + 4 + 1] = 0x51
+        assert tx.outputs[0].amount == 50001
+
+    def test_truncated(self):
+        with pytest.raises(ValueError):
+            deserialize_transaction(FINAL_TX_1[:-10])
+
+    def test_trailing_bytes(self):
+        with pytest.raises(ValueError):
+            deserialize_transaction(FINAL_TX_1 + '00')
+
+
+def test_iter_transactions():
+    data = hex_to_bytes(FINAL_TX_1 + TX_MESSAGES + FINAL_TX_1)
+    txids = [tx.txid for tx in iter_transactions(data)]
+    assert txids == [calc_txid(FINAL_TX_1), calc_txid(TX_MESSAGES), calc_txid(FINAL_TX_1)]
+
+    with pytest.raises(ValueError):
+        list(iter_transactions(data[:-1]))
@@ -3,8 +3,9 @@ from cashaddress.convert import InvalidAddress
 
 from bitcash.format import (
     address_to_public_key_hash, bytes_to_wif, coords_to_public_key,
-    get_version, point_to_public_key, public_key_to_coords,
-    public_key_to_address, public_key_to_address, verify_sig,
+    decode_address, decode_many, encode_address, encode_many, get_version,
+    point_to_public_key, public_key_to_coords, public_key_to_address,
+    public_key_to_address, to_cash_address, validate_addresses, verify_sig,
     wif_checksum_check, wif_to_bytes
 )
 from .samples import (
@@ -172,3 +173,145 @@ def test_address_to_public_key_hash():
         address_to_public_key_hash(BITCOIN_CASHADDRESS_PAY2SH)
     with pytest.raises(ValueError):
         address_to_public_key_hash(BITCOIN_CASHADDRESS_TEST_PAY2SH)
+
+
+class TestDecodeAddress:
+    def test_cash_address(self):
+        decoded = decode_address(BITCOIN_CASHADDRESS)
+        assert decoded == ('main', 'P2PKH', PUBKEY_HASH)
+        assert decoded.hash == PUBKEY_HASH
+
+    def test_cash_address_test(self):
+        assert decode_address(BITCOIN_CASHADDRESS_TEST) == ('test', 'P2PKH', PUBKEY_HASH)
+
+    def test_cash_address_pay2sh(self):
+        assert decode_address(BITCOIN_CASHADDRESS_PAY2SH).type == 'P2SH'
+        assert decode_address(BITCOIN_CASHADDRESS_TEST_PAY2SH).version == 'test'
+
+    def test_cash_address_without_prefix(self):
+        decoded = decode_address(BITCOIN_CASHADDRESS)
+        assert decode_address(BITCOIN_CASHADDRESS.split(':')[1]) == decoded
+
+    def test_cash_address_uppercase(self):
+        assert decode_address(BITCOIN_CASHADDRESS.upper()) == decode_address(BITCOIN_CASHADDRESS)
+
+    def test_legacy_address(self):
+        assert decode_address(BITCOIN_ADDRESS) == ('main', 'P2PKH', PUBKEY_HASH)
+        assert decode_address(BITCOIN_ADDRESS_TEST) == ('test', 'P2PKH', PUBKEY_HASH)
+
+    def test_invalid_checksum(self):
+        address = BITCOIN_CASHADDRESS[:-1] + ('q' if BITCOIN_CASHADDRESS[-1] != 'q' else 'p')
+        with pytest.raises(InvalidAddress):
+            decode_address(address)
+
+    def test_mixed_case(self):
+        with pytest.raises(InvalidAddress):
+            decode_address(BITCOIN_CASHADDRESS[:12] + BITCOIN_CASHADDRESS[12:].upper())
+
+    def test_invalid_legacy_checksum(self):
+        with pytest.raises(InvalidAddress):
+            decode_address(BITCOIN_ADDRESS[:-1] + ('h' if BITCOIN_ADDRESS[-1] != 'h' else 'i'))
+
+    def test_cached(self):
+        assert decode_address(BITCOIN_CASHADDRESS) is decode_address(BITCOIN_CASHADDRESS)
+
+
+class TestEncodeAddress:
+    def test_main(self):
+        assert encode_address(PUBKEY_HASH) == BITCOIN_CASHADDRESS
+
+    def test_test(self):
+        assert encode_address(PUBKEY_HASH, version='test') == BITCOIN_CASHADDRESS_TEST
+
+    def test_pay2sh(self):
+        decoded = decode_address(BITCOIN_CASHADDRESS_PAY2SH)
+        assert encode_address(decoded.hash, address_type='P2SH') == BITCOIN_CASHADDRESS_PAY2SH
+
+    def test_invalid_version(self):
+        with pytest.raises(ValueError):
+            encode_address(PUBKEY_HASH, version='dev')
+
+
+def test_decode_many():
+    assert decode_many([BITCOIN_CASHADDRESS, BITCOIN_ADDRESS_TEST]) == [
+        ('main', 'P2PKH', PUBKEY_HASH), ('test', 'P2PKH', PUBKEY_HASH)
+    ]
+
+
+def test_encode_many():
+    assert encode_many([PUBKEY_HASH, PUBKEY_HASH_COMPRESSED]) == [
+        BITCOIN_CASHADDRESS, BITCOIN_CASHADDRESS_COMPRESSED
+    ]
+
+
+def test_to_cash_address():
+    assert to_cash_address(BITCOIN_ADDRESS) == BITCOIN_CASHADDRESS
+    assert to_cash_address(BITCOIN_ADDRESS_TEST_COMPRESSED) == BITCOIN_CASHADDRESS_TEST_COMPRESSED
+    assert to_cash_address(BITCOIN_CASHADDRESS.split(':')[1]) == BITCOIN_CASHADDRESS
+    assert to_cash_address(BITCOIN_CASHADDRESS_PAY2SH) == BITCOIN_CASHADDRESS_PAY2SH
+    with pytest.raises(InvalidAddress):
+        to_cash_address('bitcoincash:xyz')
+
+
+class TestValidateAddresses:
+    def setup_method(self):
+        pytest.importorskip('numpy')
+
+    def test_valid(self):
+        addresses = [
+            BITCOIN_CASHADDRESS, BITCOIN_CASHADDRESS_TEST_COMPRESSED,
+            BITCOIN_ADDRESS, BITCOIN_ADDRESS_TEST_COMPRESSED,
+            BITCOIN_CASHADDRESS.upper(), BITCOIN_CASHADDRESS.split(':')[1]
+        ]
+        mask, hashes = validate_addresses(addresses)
+        assert mask.tolist() == [True] * 6
+        assert [row.tobytes() for row in hashes] == [
+            PUBKEY_HASH, PUBKEY_HASH_COMPRESSED, PUBKEY_HASH,
+            PUBKEY_HASH_COMPRESSED, PUBKEY_HASH, PUBKEY_HASH
+        ]
+
+    def test_invalid(self):
+        addresses = [
+            '', 'bitcoincash:', BITCOIN_CASHADDRESS_PAY2SH,
+            BITCOIN_CASHADDRESS[:-1] + 'q',
+            BITCOIN_CASHADDRESS[:12] + BITCOIN_CASHADDRESS[12:].upper(),
+            'bchtest:' + BITCOIN_CASHADDRESS.split(':')[1], BITCOIN_CASHADDRESS + 'q',
+            BITCOIN_ADDRESS[:-1] + 'h', '1' + BITCOIN_ADDRESS, BITCOIN_ADDRESS.replace('1', 'l', 1),
+            BITCOIN_CASHADDRESS[:-1] + '\xe9'
+        ]
+        mask, hashes = validate_addresses(addresses)
+        assert not mask.any()
+        assert not hashes.any()
+
+    def test_version(self):
+        addresses = [BITCOIN_CASHADDRESS, BITCOIN_CASHADDRESS_TEST,
+                     BITCOIN_ADDRESS, BITCOIN_ADDRESS_TEST]
+        mask, _ = validate_addresses(addresses, version='main')
+        assert mask.tolist() == [True, False, True, False]
+        mask, hashes = validate_addresses(addresses, version='test')
+        assert mask.tolist() == [False, True, False, True]
+        assert not hashes[0].any()
+
+    def test_invalid_version(self):
+        with pytest.raises(ValueError):
+            validate_addresses([BITCOIN_CASHADDRESS], version='dev')
+
+    def test_empty(self):
+        mask, hashes = validate_addresses([])
+        assert mask.shape == (0, )
+        assert hashes.shape == (0, 20)
+
+    def test_matches_scalar(self):
+        hashes = [bytes([i]) * 20 for i in range(50)]
+        addresses = encode_many(hashes) + encode_many(hashes, version='test')
+        addresses += [address[:-2] + address[-1] + address[-2] for address in addresses]
+        mask, decoded = validate_addresses(addresses)
+
+        for address, valid, hash160 in zip(addresses, mask, decoded):
+            try:
+                expected = address_to_public_key_hash(address)
+            except (InvalidAddress, ValueError):
+                expected = None
+            assert valid == (expected is not None)
+            if valid:
+                assert hash160.tobytes() == expected
@@ -0,0 +1,161 @@
+import pytest
+
+from bitcash.deserialize import deserialize_transaction
+from bitcash.format import verify_sig
+from bitcash.group import WalletGroup
+from bitcash.network import NetworkAPI
+from bitcash.network.meta import Unspent
+from bitcash.transaction import (
+    SighashContext, TxIn, calc_txid, construct_output_block,
+    create_p2pkh_transaction, create_p2pkh_transaction_from_keys
+)
+from bitcash.utils import bytes_to_hex, hex_to_bytes
+from bitcash.wallet import PrivateKey, PrivateKeyTestnet
+from .samples import (
+    WALLET_FORMAT_COMPRESSED_MAIN, WALLET_FORMAT_COMPRESSED_TEST,
+    WALLET_FORMAT_MAIN, WALLET_FORMAT_TEST
+)
+
+RETURN_ADDRESS = 'n2eMqTT929pb1RDNuqEnxdaLau1rxy3efi'
+TXID = 'f3ad23dac2a3546167b27a43ac3e370236caf93f75bfcf27c625ec839d397888'
+
+
+def unspents_of(key, amounts, txid=TXID):
+    return [Unspent(amount, 10, bytes_to_hex(key.scriptcode), txid, i) for i, amount in enumerate(amounts)]
+
+
+def verify_inputs(tx_hex, keys, unspents, outputs):
+    tx = deserialize_transaction(tx_hex)
+    inputs = [
+        TxIn(b'', b'\x00', hex_to_bytes(unspent.txid)[::-1],
+             unspent.txindex.to_bytes(4, byteorder='little'),
+             unspent.amount.to_bytes(8, byteorder='little'))
+        for unspent in unspents
+    ]
+    sighash = SighashContext(inputs, construct_output_block(outputs), b'')
+
+    for i, (txin, key) in enumerate(zip(tx.inputs, keys)):
+        script = txin.script.tobytes()
+        signature = script[1:script[0]]
+        public_key = script[script[0] + 2:]
+
+        assert public_key == key.public_key
+        assert verify_sig(signature, sighash.digest(i, key.scriptcode), key.public_key)
+
+
+class TestCreateP2PKHTransactionFromKeys:
+    def test_signs_each_input_with_its_key(self):
+        keys = [PrivateKey(WALLET_FORMAT_MAIN), PrivateKey(WALLET_FORMAT_COMPRESSED_MAIN)]
+        unspents = unspents_of(keys[0], [5000]) + unspents_of(keys[1], [6000, 7000])
+        owners = [keys[0], keys[1], keys[1]]
+        outputs = [(keys[0].address, 15000)]
+
+        tx_hex = create_p2pkh_transaction_from_keys(owners, unspents, outputs)
+
+        verify_inputs(tx_hex, owners, unspents, outputs)
+
+    def test_single_key_matches(self):
+        key = PrivateKey(WALLET_FORMAT_MAIN)
+        unspents = unspents_of(key, [5000, 6000])
+        outputs = [(key.address, 10000)]
+
+        assert (create_p2pkh_transaction_from_keys([key, key], unspents, outputs) ==
+                create_p2pkh_transaction(key, unspents, outputs))
+
+    def test_key_count_mismatch(self):
+        key = PrivateKey(WALLET_FORMAT_MAIN)
+        with pytest.raises(ValueError):
+            create_p2pkh_transaction_from_keys([key], unspents_of(key, [5000, 6000]), [])
+
+
+class TestWalletGroup:
+    def setup_method(self):
+        self.keys = [PrivateKeyTestnet(WALLET_FORMAT_TEST), PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)]
+        self.fetched = {
+            self.keys[0].address: unspents_of(self.keys[0], [5000, 6000]),
+            self.keys[1].address: unspents_of(self.keys[1], [70000], txid='00' * 32),
+        }
+
+    def test_mixed_networks(self):
+        with pytest.raises(ValueError):
+            WalletGroup([PrivateKey(WALLET_FORMAT_MAIN), PrivateKeyTestnet(WALLET_FORMAT_TEST)])
+
+    def test_get_unspents_bulk(self, monkeypatch):
+        requests = []
+
+        def bulk(addresses):
+            requests.append(addresses)
+            return {address: self.fetched[address] for address in addresses}
+
+        monkeypatch.setattr(NetworkAPI, 'GET_UNSPENT_BULK_TEST', [bulk])
+        group = WalletGroup(self.keys)
+
+        assert group.get_balance() == '81000'
+        assert requests == [[key.address for key in self.keys]]
+        assert self.keys[0].balance == 11000
+        assert self.keys[1].unspents == self.fetched[self.keys[1].address]
+        assert len(group.unspents) == 3
+
+    def test_get_unspents_chunked(self, monkeypatch):
+        requests = []
+
+        def bulk(addresses):
+            requests.append(addresses)
+            return {address: [] for address in addresses}
+
+        monkeypatch.setattr(NetworkAPI, 'GET_UNSPENT_BULK_TEST', [bulk])
+        group = WalletGroup([PrivateKeyTestnet() for _ in range(45)], workers=3)
+        group.get_unspents()
+
+        assert sorted(len(addresses) for addresses in requests) == [5, 20, 20]
+
+        # Chunks follow the limit of the services.
+        requests.clear()
+        monkeypatch.setattr(NetworkAPI, 'BULK_LIMIT', 10)
+        group.get_unspents()
+
+        assert sorted(len(addresses) for addresses in requests) == [5, 10, 10, 10, 10]
+
+    def test_get_unspents_fallback(self, monkeypatch):
+        monkeypatch.setattr(NetworkAPI, 'GET_UNSPENT_BULK_TEST', [])
+        monkeypatch.setattr(NetworkAPI, 'GET_UNSPENT_TEST', [lambda address: self.fetched[address]])
+
+        assert WalletGroup(self.keys).get_unspents() == (
+            self.fetched[self.keys[0].address] + self.fetched[self.keys[1].address]
+        )
+
+    def test_create_transaction(self):
+        for key in self.keys:
+            key.unspents[:] = self.fetched[key.address]
+        group = WalletGroup(self.keys)
+
+        tx_hex = group.create_transaction([(RETURN_ADDRESS, 75000, 'satoshi')], fee=1)
+        tx = deserialize_transaction(tx_hex)
+
+        assert len(tx.inputs) == 3
+        assert tx.outputs[1].address('test') == self.keys[0].address
+        owners = [self.keys[0], self.keys[0], self.keys[1]]
+        outputs = [(RETURN_ADDRESS, 75000), (self.keys[0].address, tx.outputs[1].amount)]
+        verify_inputs(tx_hex, owners, group.unspents, outputs)
+
+    def test_foreign_unspent(self):
+        group = WalletGroup(self.keys)
+        foreign = unspents_of(PrivateKeyTestnet(), [100000])
+
+        with pytest.raises(ValueError):
+            group.create_transaction([(RETURN_ADDRESS, 1000, 'satoshi')], fee=1, unspents=foreign)
+
+    def test_send(self, monkeypatch):
+        broadcast = []
+        monkeypatch.setattr(NetworkAPI, 'broadcast_tx_testnet', broadcast.append)
+        for key in self.keys:
+            key.unspents[:] = self.fetched[key.address]
+        group = WalletGroup(self.keys)
+
+        txid = group.send([(RETURN_ADDRESS, 75000, 'satoshi')], fee=1)
+
+        assert calc_txid(broadcast[0]) == txid
+        assert self.keys[1].unspents == []
+        assert [unspent.txid for unspent in self.keys[0].unspents] == [txid]
+        change = deserialize_transaction(broadcast[0]).outputs[1].amount
+        assert group.balance == self.keys[0].balance == change
@@ -0,0 +1,134 @@
+from contextlib import contextmanager
+
+import pytest
+
+from bitcash import tracing
+from bitcash.network import NetworkAPI
+from bitcash.network.meta import Unspent
+from bitcash.tracing import PhaseTimer, set_tracer, span
+from bitcash.wallet import PrivateKey
+from .samples import WALLET_FORMAT_MAIN
+
+UNSPENTS = [
+    Unspent(83727960,
+            15,
+            '76a91492461bde6283b461ece7ddf4dbf1e0a48bd113d888ac',
+            'f3ad23dac2a3546167b27a43ac3e370236caf93f75bfcf27c625ec839d397888',
+            1)
+]
+OUTPUTS = [('n2eMqTT929pb1RDNuqEnxdaLau1rxy3efi', 50000, 'satoshi')]
+
+
+class OpenTelemetryLike:
+    """Records spans the way an OpenTelemetry tracer is called."""
+
+    def __init__(self):
+        self.started = []
+        self.ended = []
+
+    @contextmanager
+    def start_as_current_span(self, name, context=None, attributes=None, **kwargs):
+        self.started.append((name, attributes))
+        try:
+            yield object()
+        finally:
+            self.ended.append(name)
+
+
+@pytest.fixture
+def timer():
+    timer = PhaseTimer()
+    set_tracer(timer)
+    yield timer
+    set_tracer(None)
+
+
+class TestSpan:
+    def test_no_tracer_by_default(self):
+        assert tracing.TRACER is None
+        with span('phase', size=1) as current:
+            assert current is None
+
+    def test_open_telemetry_compatible(self):
+        tracer = OpenTelemetryLike()
+        set_tracer(tracer)
+        try:
+            with span('outer', size=3):
+                with span('inner'):
+                    pass
+        finally:
+            set_tracer(None)
+
+        assert tracer.started == [('outer', {'size': 3}), ('inner', {})]
+        assert tracer.ended == ['inner', 'outer']
+
+    def test_error_propagates(self, timer):
+        with pytest.raises(ValueError):
+            with span('failing'):
+                raise ValueError
+
+        assert timer.spans[0][0] == 'failing'
+
+
+class TestPhaseTimer:
+    def test_breakdown(self, timer):
+        with span('a'):
+            pass
+        with span('a'):
+            pass
+        with span('b', size=2):
+            pass
+
+        breakdown = timer.breakdown()
+        assert set(breakdown) == {'a', 'b'}
+        assert timer.counts() == {'a': 2, 'b': 1}
+        assert timer.spans[-1][2] == {'size': 2}
+
+        timer.reset()
+        assert timer.breakdown() == {}
+        assert timer.counts() == {}
+
+    def test_bounded(self):
+        timer = PhaseTimer(max_spans=2)
+        set_tracer(timer)
+        try:
+            for _ in range(5):
+                with span('a'):
+                    pass
+        finally:
+            set_tracer(None)
+
+        assert len(timer.spans) == 2
+        assert timer.counts() == {'a': 5}
+
+    def test_create_transaction(self, timer):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        private_key.create_transaction(OUTPUTS, fee=1, unspents=UNSPENTS)
+
+        assert [name for name, _, _ in timer.spans] == [
+            tracing.DECODE_ADDRESSES,
+            tracing.CONVERT_CURRENCY,
+            tracing.SELECT_UNSPENTS,
+            tracing.SANITIZE,
+            tracing.BUILD_OUTPUTS,
+            tracing.SIGN,
+            tracing.SERIALIZE,
+            tracing.ENCODE_HEX,
+            tracing.CREATE,
+        ]
+        assert dict((name, attributes) for name, _, attributes in timer.spans)[tracing.SIGN] == {'inputs': 1}
+
+    def test_send(self, timer, monkeypatch):
+        broadcast = []
+        monkeypatch.setattr(NetworkAPI, 'broadcast_tx', broadcast.append)
+
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        private_key.unspents[:] = UNSPENTS
+        private_key.send(OUTPUTS, fee=1)
+
+        names = [name for name, _, _ in timer.spans]
+        assert names[-2:] == [tracing.BROADCAST, tracing.SEND]
+
+        breakdown = timer.breakdown()
+        assert breakdown[tracing.SEND] >= breakdown[tracing.CREATE] + breakdown[tracing.BROADCAST]
+        assert len(broadcast) == 1
@@ -1,10 +1,20 @@
+import io
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
 import pytest
 
+from bitcash import transaction
+from bitcash.crypto import double_sha256, sha256
+from bitcash.deserialize import deserialize_transaction
 from bitcash.exceptions import InsufficientFunds
 from bitcash.network.meta import Unspent
+from bitcash.network.rates import currency_to_satoshi
 from bitcash.transaction import (
-    TxIn, calc_txid, create_p2pkh_transaction, construct_input_block,
-    construct_output_block, estimate_tx_fee, sanitize_tx_data
+    SighashContext, TxIn, TxWriter, calc_txid, create_p2pkh_transaction,
+    create_p2pkh_transaction_bytes, create_p2pkh_transactions, construct_input_block,
+    construct_output_block, create_op_return_transactions, estimate_tx_fee, sanitize_tx_data,
+    sign_digests, write_output_block
 )
 from bitcash.utils import hex_to_bytes
 from bitcash.wallet import PrivateKey
@@ -235,6 +245,20 @@ class TestSanitizeTxData:
         assert outputs_single[1][0] == RETURN_ADDRESS
         assert outputs[1][1] == outputs_single[1][1]
 
+    def test_no_combine_branch_and_bound(self):
+        unspents_original = [Unspent(7000, 0, '', '', 0),
+                             Unspent(3000, 0, '', '', 0),
+                             Unspent(2000, 0, '', '', 0)]
+        outputs_original = [(BITCOIN_CASHADDRESS_TEST_COMPRESSED, 5000, 'satoshi')]
+
+        unspents, outputs = sanitize_tx_data(
+            unspents_original, outputs_original, fee=0, leftover=RETURN_ADDRESS,
+            combine=False, message=None, strategy='bnb'
+        )
+
+        assert sorted(unspent.amount for unspent in unspents) == [2000, 3000]
+        assert len(outputs) == 1
+
     def test_no_combine_insufficient_funds(self):
         unspents_original = [Unspent(1000, 0, '', '', 0),
                              Unspent(1000, 0, '', '', 0)]
@@ -246,6 +270,35 @@ class TestSanitizeTxData:
                 combine=False, message=None
             )
 
+    def test_generator(self):
+        unspents_original = [Unspent(7000, 0, '', '', 0),
+                             Unspent(3000, 0, '', '', 0),
+                             Unspent(2000, 0, '', '', 0)]
+        outputs_original = [(BITCOIN_CASHADDRESS_TEST_COMPRESSED, 1000, 'satoshi')]
+
+        for strategy in ('smallest', 'largest', 'bnb', 'random'):
+            for combine in (True, False):
+                unspents, outputs = sanitize_tx_data(
+                    (unspent for unspent in unspents_original), outputs_original, fee=1,
+                    leftover=RETURN_ADDRESS, combine=combine, message=None, strategy=strategy
+                )
+
+                assert unspents
+                assert all(unspent in unspents_original for unspent in unspents)
+                assert outputs[0] == (BITCOIN_CASHADDRESS_TEST_COMPRESSED, 1000)
+                if combine:
+                    assert unspents == unspents_original
+
+    def test_empty_generator(self):
+        outputs_original = [(BITCOIN_CASHADDRESS_TEST_COMPRESSED, 1000, 'satoshi')]
+
+        for combine in (True, False):
+            with pytest.raises(ValueError):
+                sanitize_tx_data(
+                    iter([]), outputs_original, fee=1, leftover=RETURN_ADDRESS,
+                    combine=combine, message=None
+                )
+
 
 class TestCreateSignedTransaction:
     def test_matching(self):
@@ -255,6 +308,320 @@ class TestCreateSignedTransaction:
         assert tx[-288:] == FINAL_TX_1[-288:]
 
 
+class TestCreateSignedTransactionBytes:
+    def test_matching_hex(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        tx = create_p2pkh_transaction_bytes(private_key, UNSPENTS, OUTPUTS)
+        assert tx.hex() == create_p2pkh_transaction(private_key, UNSPENTS, OUTPUTS)
+
+    def test_sink(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        tx = create_p2pkh_transaction_bytes(private_key, UNSPENTS, OUTPUTS)
+        sink = io.BytesIO()
+        assert create_p2pkh_transaction_bytes(private_key, UNSPENTS, OUTPUTS, sink=sink) == len(tx)
+        assert sink.getvalue() == tx
+
+    def test_many_outputs_varint_count(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        outputs = [OUTPUTS[0]] * 300
+        tx = create_p2pkh_transaction_bytes(private_key, UNSPENTS, outputs)
+        output_block = construct_output_block(outputs)
+        assert tx[-len(output_block) - 7:-len(output_block) - 4] == b'\xfd\x2c\x01'
+        assert calc_txid(tx) == calc_txid(tx.hex())
+
+
+class TestCreateSignedTransactions:
+    def test_matches_single(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        unspents = [Unspent(100000 + i, 0, UNSPENTS[0].script, UNSPENTS[0].txid, i)
+                    for i in range(10)]
+        output_sets = [[(BITCOIN_CASHADDRESS_TEST_COMPRESSED, 150000, 'satoshi')],
+                       [(RETURN_ADDRESS, 50000, 'satoshi')]]
+
+        txs = create_p2pkh_transactions(private_key, output_sets, unspents, 1, compressed=False)
+
+        selected, outputs = sanitize_tx_data(unspents, output_sets[0], 1, private_key.address,
+                                             combine=False, compressed=False)
+        assert len(txs) == 2
+        assert txs[0] == create_p2pkh_transaction(private_key, selected, outputs)
+
+        remaining = [unspent for unspent in unspents if unspent not in selected]
+        selected, outputs = sanitize_tx_data(remaining, output_sets[1], 1, private_key.address,
+                                             combine=False, compressed=False)
+        assert txs[1] == create_p2pkh_transaction(private_key, selected, outputs)
+
+    def test_rates_looked_up_once(self, monkeypatch):
+        calls = []
+
+        def fake_rate(amount, currency):
+            calls.append(currency)
+            return 2 * amount
+
+        monkeypatch.setattr('bitcash.transaction.currency_to_satoshi_cached', fake_rate)
+
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        unspents = [Unspent(100000, 0, UNSPENTS[0].script, UNSPENTS[0].txid, i)
+                    for i in range(5)]
+        output_sets = [[(RETURN_ADDRESS, 1000, 'usd')]] * 5
+
+        txs = create_p2pkh_transactions(private_key, output_sets, unspents, 1)
+        assert len(set(txs)) == 5
+        assert calls == ['usd']
+
+    def test_amounts_match_single_transactions(self, monkeypatch):
+        monkeypatch.setattr('bitcash.network.rates.EXCHANGE_RATES', {'usd': lambda: Decimal('1234.56789')})
+        monkeypatch.setattr('bitcash.transaction.currency_to_satoshi_cached', currency_to_satoshi)
+
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        unspents = [Unspent(100000, 0, UNSPENTS[0].script, UNSPENTS[0].txid, 0)]
+        output_sets = [[(RETURN_ADDRESS, '3.3', 'usd')]]
+
+        txs = create_p2pkh_transactions(private_key, output_sets, unspents, 1)
+        _, outputs = sanitize_tx_data(unspents, output_sets[0], 1, private_key.address,
+                                      combine=False)
+        assert outputs[0][1] == currency_to_satoshi('3.3', 'usd')
+        assert txs[0] == create_p2pkh_transaction(private_key, unspents, outputs)
+
+    def test_insufficient_funds(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        unspents = [Unspent(100000, 0, UNSPENTS[0].script, UNSPENTS[0].txid, 0)]
+        output_sets = [[(RETURN_ADDRESS, 1000, 'satoshi')]] * 2
+
+        with pytest.raises(InsufficientFunds):
+            create_p2pkh_transactions(private_key, output_sets, unspents, 1)
+
+
+class TestCreateOpReturnTransactions:
+    def setup_method(self):
+        self.private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        self.unspents = [Unspent(100000 + i, 0, UNSPENTS[0].script, UNSPENTS[0].txid, i)
+                         for i in range(3)]
+
+    def test_chain(self):
+        data = bytes(range(256)) * 4
+        txs = list(create_op_return_transactions(self.private_key, io.BytesIO(data),
+                                                 self.unspents, 1, compressed=False))
+        assert len(txs) == 5
+
+        views = [deserialize_transaction(tx) for tx in txs]
+        assert len(views[0].inputs) == 3
+        assert b''.join(view.outputs[1].op_return[2:] for view in views) == data
+
+        for previous, view in zip(views, views[1:]):
+            assert len(view.inputs) == 1
+            assert view.inputs[0].txid == previous.txid
+            assert view.inputs[0].txindex == 0
+            assert view.outputs[0].address() == self.private_key.address
+            assert view.outputs[0].amount < previous.outputs[0].amount
+
+    def test_pays_fee(self):
+        txs = list(create_op_return_transactions(self.private_key, b'x' * 300,
+                                                 self.unspents, 2, compressed=False))
+        first, second = (deserialize_transaction(tx) for tx in txs)
+        assert first.outputs[0].amount == sum(u.amount for u in self.unspents) - estimate_tx_fee(
+            3, 1, 2, False, 232)
+        assert second.outputs[1].op_return == b'\x4c\x50' + b'x' * 80
+
+    def test_pushes_per_transaction(self):
+        txs = list(create_op_return_transactions(self.private_key, b'x' * 1000, self.unspents, 1,
+                                                 pushes_per_transaction=2))
+        assert [len(deserialize_transaction(tx).outputs) for tx in txs] == [3, 3, 2]
+
+    def test_pushes_per_transaction_too_large(self):
+        with pytest.raises(ValueError):
+            create_op_return_transactions(self.private_key, b'x', self.unspents, 1,
+                                          pushes_per_transaction=1000)
+
+    def test_iterable_of_str(self):
+        txs = create_op_return_transactions(self.private_key, iter(['a' * 200, 'b' * 200]),
+                                            self.unspents, 1)
+        data = b''.join(deserialize_transaction(tx).outputs[1].op_return[2:] for tx in txs)
+        assert data == b'a' * 200 + b'b' * 200
+
+    def test_reads_bounded(self):
+        reads = []
+
+        def chunks():
+            for i in range(1000):
+                reads.append(i)
+                yield b'x' * 220
+
+        with pytest.raises(ValueError):
+            create_op_return_transactions(self.private_key, chunks(), self.unspents, 1)
+        # One unconfirmed unspent shortens the chain to 24.
+        assert len(reads) == 25
+
+    def test_chain_limit(self):
+        confirmed = [Unspent(10 ** 8, 1, UNSPENTS[0].script, UNSPENTS[0].txid, 0)]
+        txs = create_op_return_transactions(self.private_key, b'x' * 220 * 25, confirmed, 1)
+        assert len(list(txs)) == 25
+
+        with pytest.raises(ValueError):
+            create_op_return_transactions(self.private_key, b'x' * 220 * 25, self.unspents, 1)
+        with pytest.raises(ValueError):
+            create_op_return_transactions(self.private_key, b'x' * 220 * 51, confirmed, 1,
+                                          max_chain=50)
+
+    def test_in_parts(self):
+        data = bytes(range(220)) * 30
+        confirmed = [Unspent(10 ** 8, 1, UNSPENTS[0].script, UNSPENTS[0].txid, 0)]
+        stream = io.BytesIO(data)
+
+        first = create_op_return_transactions(self.private_key, stream, confirmed, 1,
+                                              allow_partial=True)
+        assert not first.complete
+        txs = list(first)
+        assert len(txs) == 25
+        assert first.consumed == 220 * 25
+        assert first.change.txid == calc_txid(txs[-1])
+        assert first.change.amount == deserialize_transaction(txs[-1]).outputs[0].amount
+
+        # The same stream is seeked back to the offset.
+        second = create_op_return_transactions(self.private_key, stream, [first.change], 1,
+                                               offset=first.consumed, allow_partial=True)
+        assert second.complete
+        txs.extend(second)
+        assert second.consumed == len(data)
+
+        stored = b''.join(deserialize_transaction(tx).outputs[-1].op_return[2:] for tx in txs)
+        assert stored == data
+
+        # Data that cannot seek is read past the offset.
+        pieces = (data[i:i + 1000] for i in range(0, len(data), 1000))
+        again = create_op_return_transactions(self.private_key, pieces, [first.change], 1,
+                                              offset=first.consumed)
+        assert list(again) == txs[25:]
+
+    def test_in_parts_keeps_change(self):
+        confirmed = [Unspent(estimate_tx_fee(1, 1, 1, True, 222) + 545, 1,
+                             UNSPENTS[0].script, UNSPENTS[0].txid, 0)]
+        chain = create_op_return_transactions(self.private_key, b'x' * 440, confirmed, 1,
+                                              max_chain=1, allow_partial=True)
+        with pytest.raises(InsufficientFunds):
+            next(chain)
+
+    def test_lazy_signing(self, monkeypatch):
+        signed = []
+        sign = transaction._sign_inputs
+
+        def sign_inputs(*args, **kwargs):
+            signed.append(True)
+            return sign(*args, **kwargs)
+
+        monkeypatch.setattr(transaction, '_sign_inputs', sign_inputs)
+        txs = create_op_return_transactions(self.private_key, b'x' * 1000, self.unspents, 1)
+        assert signed == []
+        next(txs)
+        assert signed == [True]
+
+    def test_empty(self):
+        assert list(create_op_return_transactions(self.private_key, b'', self.unspents, 1)) == []
+
+    def test_insufficient_funds(self):
+        unspents = [Unspent(1000, 0, UNSPENTS[0].script, UNSPENTS[0].txid, 0)]
+        txs = create_op_return_transactions(self.private_key, b'x' * 1000, unspents, 1)
+        assert next(txs)
+        with pytest.raises(InsufficientFunds):
+            list(txs)
+
+    def test_dust_change(self):
+        fee = estimate_tx_fee(1, 1, 1, True, 222)
+        unspents = [Unspent(fee + 545, 0, UNSPENTS[0].script, UNSPENTS[0].txid, 0)]
+
+        # Too little change to fund the next transaction.
+        txs = create_op_return_transactions(self.private_key, b'x' * 440, unspents, 1)
+        with pytest.raises(InsufficientFunds):
+            next(txs)
+
+        # The last transaction leaves its dust change to miners.
+        tx, = create_op_return_transactions(self.private_key, b'x' * 220, unspents, 1)
+        outputs = deserialize_transaction(tx).outputs
+        assert len(outputs) == 1
+        assert outputs[0].amount == 0
+
+
+class TestParallelSigning:
+    def test_sign_digests(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        digests = [sha256(bytes([i])) for i in range(50)]
+        serial = sign_digests(private_key, digests)
+        assert sign_digests(private_key, digests, workers=4) == serial
+        assert sign_digests(private_key, digests, workers=100) == serial
+        assert sign_digests(private_key, [], workers=4) == []
+
+    def test_process_pool(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        digests = [sha256(bytes([i])) for i in range(10)]
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            parallel = sign_digests(private_key, digests, workers=2, executor=executor)
+        assert parallel == sign_digests(private_key, digests)
+
+    def test_identical_transaction(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        unspents = [Unspent(1000 + i, 0, UNSPENTS[0].script, UNSPENTS[0].txid, i)
+                    for i in range(20)]
+        serial = create_p2pkh_transaction(private_key, unspents, OUTPUTS)
+        assert create_p2pkh_transaction(private_key, unspents, OUTPUTS, workers=3) == serial
+
+
+class TestTxWriter:
+    def test_bytearray(self):
+        writer = TxWriter()
+        write_output_block(writer, OUTPUTS)
+        assert writer.getvalue() == hex_to_bytes(OUTPUT_BLOCK)
+        assert writer.offset == len(hex_to_bytes(OUTPUT_BLOCK))
+
+    def test_memoryview(self):
+        buffer = bytearray(len(hex_to_bytes(OUTPUT_BLOCK)) + 10)
+        writer = TxWriter(memoryview(buffer))
+        write_output_block(writer, OUTPUTS)
+        assert writer.getvalue() == hex_to_bytes(OUTPUT_BLOCK)
+        assert buffer[:writer.offset] == hex_to_bytes(OUTPUT_BLOCK)
+
+    def test_file(self):
+        sink = io.BytesIO()
+        writer = TxWriter(sink)
+        write_output_block(writer, OUTPUTS)
+        assert sink.getvalue() == hex_to_bytes(OUTPUT_BLOCK)
+
+        with pytest.raises(TypeError):
+            writer.getvalue()
+
+
+class TestSighashContext:
+    def test_digest(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        txin = TxIn(b'', b'\x00', hex_to_bytes(UNSPENTS[0].txid)[::-1],
+                    b'\x01\x00\x00\x00', UNSPENTS[0].amount.to_bytes(8, byteorder='little'))
+        sighash = SighashContext([txin], hex_to_bytes(OUTPUT_BLOCK), private_key.scriptcode)
+
+        preimage = (
+            b'\x01\x00\x00\x00' +
+            double_sha256(txin.txid + txin.txindex) +
+            double_sha256(b'\xff\xff\xff\xff') +
+            txin.txid +
+            txin.txindex +
+            b'\x19' + private_key.scriptcode +
+            txin.amount +
+            b'\xff\xff\xff\xff' +
+            double_sha256(hex_to_bytes(OUTPUT_BLOCK)) +
+            b'\x00\x00\x00\x00' +
+            b'\x41\x00\x00\x00'
+        )
+
+        assert sighash.digest(0) == sha256(preimage)
+        assert list(sighash.digests()) == [sha256(preimage)]
+
+    def test_verify(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        txin = TxIn(b'', b'\x00', hex_to_bytes(UNSPENTS[0].txid)[::-1],
+                    b'\x01\x00\x00\x00', UNSPENTS[0].amount.to_bytes(8, byteorder='little'))
+        sighash = SighashContext([txin], hex_to_bytes(OUTPUT_BLOCK), private_key.scriptcode)
+        signature = private_key.sign(sighash.digest(0))
+        assert sighash.verify(0, signature, private_key.public_key)
+        assert not sighash.verify(0, signature, PrivateKey().public_key)
+
+
 class TestEstimateTxFee:
     def test_accurate_compressed(self):
         assert estimate_tx_fee(1, 2, 70, True) == 15820
@@ -0,0 +1,108 @@
+import time
+
+from bitcash.deserialize import deserialize_transaction
+from bitcash.network.meta import Unspent
+from bitcash.transaction import calc_txid, create_p2pkh_transaction
+from bitcash.unspents import UnspentTracker
+from bitcash.wallet import PrivateKey, PrivateKeyTestnet
+from .samples import WALLET_FORMAT_MAIN, WALLET_FORMAT_TEST
+
+RETURN_ADDRESS = 'n2eMqTT929pb1RDNuqEnxdaLau1rxy3efi'
+SCRIPT = '76a91492461bde6283b461ece7ddf4dbf1e0a48bd113d888ac'
+TXID = 'f3ad23dac2a3546167b27a43ac3e370236caf93f75bfcf27c625ec839d397888'
+
+
+def make_unspents(count):
+    return [Unspent(100000, 10, SCRIPT, TXID, i) for i in range(count)]
+
+
+def outpoints(unspents):
+    return [(unspent.txid, unspent.txindex) for unspent in unspents]
+
+
+class TestUnspentTracker:
+    def setup_method(self):
+        self.private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        self.tracker = UnspentTracker(self.private_key.scriptcode)
+        self.unspents = make_unspents(3)
+
+    def send(self, unspents, amount=50000):
+        tx = create_p2pkh_transaction(self.private_key, unspents, [
+            (RETURN_ADDRESS, amount), (self.private_key.address, sum(u.amount for u in unspents) - amount - 500)
+        ])
+        self.tracker.apply(tx)
+        return tx
+
+    def test_apply(self):
+        tx = self.send(self.unspents[:2])
+        reconciled = self.tracker.reconcile(self.unspents)
+
+        assert outpoints(reconciled) == [(TXID, 2), (calc_txid(tx), 1)]
+        assert reconciled[1].amount == 149500
+        assert reconciled[1].confirmations == 0
+        assert reconciled[1].script == SCRIPT
+
+    def test_apply_view(self):
+        tx = create_p2pkh_transaction(self.private_key, self.unspents, [(self.private_key.address, 1000)])
+        self.tracker.apply(deserialize_transaction(tx))
+        assert outpoints(self.tracker.reconcile(self.unspents)) == [(calc_txid(tx), 0)]
+
+    def test_chained(self):
+        self.send(self.unspents)
+        first = self.tracker.reconcile(self.unspents)
+        tx = self.send(first)
+        second = self.tracker.reconcile(self.unspents)
+
+        assert outpoints(second) == [(calc_txid(tx), 1)]
+        assert self.tracker.reconcile(second) == second
+
+    def test_reported_by_service(self):
+        tx = self.send(self.unspents[:1])
+        change = self.tracker.reconcile(self.unspents)[-1]
+
+        confirmed = Unspent(change.amount, 1, SCRIPT, change.txid, change.txindex)
+        reconciled = self.tracker.reconcile(self.unspents[1:] + [confirmed])
+
+        assert outpoints(reconciled) == [(TXID, 1), (TXID, 2), (calc_txid(tx), 1)]
+        assert reconciled[-1].confirmations == 1
+        assert len(self.tracker) == 1
+
+    def test_expire(self):
+        self.tracker.grace_period = 0
+        self.send(self.unspents[:1])
+        time.sleep(0.01)
+        assert self.tracker.reconcile(self.unspents) == self.unspents
+        assert len(self.tracker) == 0
+
+    def test_clear(self):
+        self.send(self.unspents[:1])
+        self.tracker.clear()
+        assert self.tracker.reconcile(self.unspents) == self.unspents
+
+    def test_other_outputs_ignored(self):
+        tx = create_p2pkh_transaction(self.private_key, self.unspents[:1], [(RETURN_ADDRESS, 50000)])
+        self.tracker.apply(tx)
+        assert outpoints(self.tracker.reconcile(self.unspents)) == [(TXID, 1), (TXID, 2)]
+
+
+class TestKeySend:
+    def test_back_to_back(self, monkeypatch):
+        broadcast = []
+        monkeypatch.setattr('bitcash.wallet.NetworkAPI.broadcast_tx_testnet', broadcast.append)
+
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_TEST)
+        unspents = make_unspents(1)
+        for unspent in unspents:
+            unspent.script = private_key.scriptcode.hex()
+        private_key.unspents[:] = unspents
+
+        txids = [private_key.send([(RETURN_ADDRESS, 10000, 'satoshi')], fee=1) for _ in range(3)]
+
+        assert len(broadcast) == 3
+        assert len(private_key.unspents) == 1
+        assert private_key.unspents[0].txid == txids[-1]
+        assert private_key.balance == private_key.unspents[0].amount
+
+        # A service that has not seen the transactions yet.
+        monkeypatch.setattr('bitcash.wallet.NetworkAPI.get_unspent_testnet', lambda address: unspents)
+        assert private_key.get_unspents()[0].txid == txids[-1]
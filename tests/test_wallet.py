@@ -14,7 +14,8 @@ from .samples import (
     PUBLIC_KEY_COMPRESSED, PUBLIC_KEY_UNCOMPRESSED, PUBLIC_KEY_X,
     PUBLIC_KEY_Y, WALLET_FORMAT_COMPRESSED_MAIN, WALLET_FORMAT_COMPRESSED_TEST,
     WALLET_FORMAT_MAIN, WALLET_FORMAT_TEST,
-    BITCOIN_CASHADDRESS, BITCOIN_CASHADDRESS_TEST
+    BITCOIN_CASHADDRESS, BITCOIN_CASHADDRESS_TEST, PUBKEY_HASH,
+    PUBKEY_HASH_COMPRESSED
 )
 
 TRAVIS = 'TRAVIS' in os.environ
@@ -71,6 +72,14 @@ class TestBaseKey:
         assert base_key.public_point == Point(PUBLIC_KEY_X, PUBLIC_KEY_Y)
         assert base_key.public_point == Point(PUBLIC_KEY_X, PUBLIC_KEY_Y)
 
+    def test_public_key_hash(self):
+        assert BaseKey(WALLET_FORMAT_MAIN).public_key_hash == PUBKEY_HASH
+        assert BaseKey(WALLET_FORMAT_COMPRESSED_MAIN).public_key_hash == PUBKEY_HASH_COMPRESSED
+
+    def test_slots(self):
+        with pytest.raises(AttributeError):
+            BaseKey().__dict__
+
     def test_sign(self):
         base_key = BaseKey()
         data = os.urandom(200)
@@ -133,6 +142,19 @@ class TestPrivateKey:
         private_key = PrivateKey(WALLET_FORMAT_MAIN)
         assert private_key.address == BITCOIN_CASHADDRESS
 
+    def test_scriptcode(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        scriptcode = private_key.scriptcode
+        assert scriptcode == b'\x76\xa9\x14' + PUBKEY_HASH + b'\x88\xac'
+        assert private_key.scriptcode is scriptcode
+
+    def test_slots(self):
+        private_key = PrivateKey()
+        with pytest.raises(AttributeError):
+            private_key.__dict__
+        with pytest.raises(AttributeError):
+            private_key.label = 'hot wallet'
+
     def test_to_wif(self):
         private_key = PrivateKey(WALLET_FORMAT_MAIN)
         assert private_key.to_wif() == WALLET_FORMAT_MAIN
@@ -192,6 +214,16 @@ class TestPrivateKeyTestnet:
         private_key = PrivateKeyTestnet(WALLET_FORMAT_TEST)
         assert private_key.address == BITCOIN_CASHADDRESS_TEST
 
+    def test_scriptcode(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_TEST)
+        scriptcode = private_key.scriptcode
+        assert scriptcode == b'\x76\xa9\x14' + PUBKEY_HASH + b'\x88\xac'
+        assert private_key.scriptcode is scriptcode
+
+    def test_slots(self):
+        with pytest.raises(AttributeError):
+            PrivateKeyTestnet().__dict__
+
     def test_to_wif(self):
         private_key = PrivateKeyTestnet(WALLET_FORMAT_TEST)
         assert private_key.to_wif() == WALLET_FORMAT_TEST